@@ -219,6 +219,11 @@ MATHESAR_MANIFEST_LOCATION = os.path.join(MATHESAR_UI_BUILD_LOCATION, 'manifest.
 MATHESAR_CLIENT_DEV_URL = 'http://localhost:3000'
 MATHESAR_UI_SOURCE_LOCATION = os.path.join(BASE_DIR, 'mathesar_ui/')
 MATHESAR_CAPTURE_UNHANDLED_EXCEPTION = decouple_config('CAPTURE_UNHANDLED_EXCEPTION', default=False)
+# Seconds between background checks of which databases can be connected to.
+MATHESAR_DB_HEALTH_CHECK_INTERVAL = decouple_config('DB_HEALTH_CHECK_INTERVAL', default=5 * 60, cast=int)
+# Rows per batch when large tables are altered online, e.g. split. 0 alters them in a single
+# transaction instead.
+MATHESAR_ONLINE_ALTER_BATCH_SIZE = decouple_config('ONLINE_ALTER_BATCH_SIZE', default=0, cast=int)
 
 # UI source files have to be served by Django in order for static assets to be included during dev mode
 # https://vitejs.dev/guide/assets.html
@@ -0,0 +1,116 @@
+"""
+Loads a snapshot of the parts of a database's catalog that Mathesar reflects: its schemas, their
+tables, the tables' columns and constraints. Everything is fetched with a single query, as one
+row of JSON arrays, and kept in plain named tuples.
+"""
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import bindparam, text
+
+from db.schemas.operations.select import EXCLUDED_SCHEMATA
+from db.utils import execute_statement
+
+SchemaInfo = namedtuple('SchemaInfo', ['oid', 'name'])
+TableInfo = namedtuple('TableInfo', ['oid', 'name', 'schema_oid'])
+ColumnInfo = namedtuple('ColumnInfo', ['table_oid', 'attnum', 'name', 'type', 'default', 'nullable'])
+ConstraintInfo = namedtuple(
+    'ConstraintInfo',
+    ['oid', 'name', 'table_oid', 'type', 'columns', 'referent_table_oid', 'referent_columns']
+)
+
+# Schema and table filters match get_mathesar_schemas_with_oids and get_table_oids_from_schemas.
+CATALOG_SNAPSHOT_SQL = """
+WITH schemas AS (
+  SELECT oid, nspname
+  FROM pg_catalog.pg_namespace
+  WHERE nspname NOT IN :excluded_schemata AND nspname NOT LIKE 'pg_%'
+), tables AS (
+  SELECT c.oid, c.relname, c.relnamespace
+  FROM pg_catalog.pg_class c JOIN schemas s ON s.oid = c.relnamespace
+  WHERE c.relkind = 'r'
+)
+SELECT
+  (
+    SELECT coalesce(json_agg(json_build_array(oid, nspname)), '[]')
+    FROM schemas
+  ) AS schemas,
+  (
+    SELECT coalesce(json_agg(json_build_array(oid, relname, relnamespace)), '[]')
+    FROM tables
+  ) AS tables,
+  (
+    SELECT coalesce(
+      json_agg(
+        json_build_array(
+          a.attrelid, a.attnum, a.attname, format_type(a.atttypid, a.atttypmod),
+          pg_get_expr(d.adbin, d.adrelid), NOT a.attnotnull
+        )
+        ORDER BY a.attrelid, a.attnum
+      ),
+      '[]'
+    )
+    FROM pg_catalog.pg_attribute a
+      JOIN tables t ON t.oid = a.attrelid
+      LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attnum > 0 AND NOT a.attisdropped
+  ) AS columns,
+  (
+    SELECT coalesce(
+      json_agg(
+        json_build_array(
+          con.oid, con.conname, con.conrelid, con.contype, con.conkey, con.confrelid, con.confkey
+        )
+      ),
+      '[]'
+    )
+    FROM pg_catalog.pg_constraint con JOIN tables t ON t.oid = con.conrelid
+  ) AS constraints
+"""
+
+
+class CatalogSnapshot:
+    """
+    Schemas, tables, columns and constraints of a database, as of when the snapshot was loaded.
+    Columns are keyed by (table oid, attnum) and ordered by table and attnum; everything else is
+    keyed by oid.
+    """
+    def __init__(self, schemas, tables, columns, constraints):
+        self.schemas = {schema.oid: schema for schema in schemas}
+        self.tables = {table.oid: table for table in tables}
+        self.columns = {(column.table_oid, column.attnum): column for column in columns}
+        self.constraints = {constraint.oid: constraint for constraint in constraints}
+        self._tables_by_schema = defaultdict(list)
+        for table in tables:
+            self._tables_by_schema[table.schema_oid].append(table)
+        self._columns_by_table = defaultdict(list)
+        for column in columns:
+            self._columns_by_table[column.table_oid].append(column)
+
+    def get_tables(self, schema_oids):
+        return [table for schema_oid in schema_oids for table in self._tables_by_schema.get(schema_oid, [])]
+
+    def get_columns(self, table_oids):
+        return [column for table_oid in table_oids for column in self._columns_by_table.get(table_oid, [])]
+
+    def get_column_name(self, table_oid, attnum):
+        column = self.columns.get((table_oid, attnum))
+        return column.name if column else None
+
+
+def get_catalog_snapshot(engine, connection_to_use=None):
+    sel = text(CATALOG_SNAPSHOT_SQL).bindparams(
+        bindparam('excluded_schemata', value=EXCLUDED_SCHEMATA, expanding=True)
+    )
+    result = execute_statement(engine, sel, connection_to_use).fetchone()
+    return CatalogSnapshot(
+        schemas=[SchemaInfo(*schema) for schema in result.schemas],
+        tables=[TableInfo(*table) for table in result.tables],
+        columns=[ColumnInfo(*column) for column in result.columns],
+        constraints=[
+            ConstraintInfo(
+                oid, name, table_oid, type_, columns or [], referent_table_oid or None, referent_columns or []
+            )
+            for oid, name, table_oid, type_, columns, referent_table_oid, referent_columns
+            in result.constraints
+        ],
+    )
@@ -1,3 +1,5 @@
+import json
+
 from alembic.migration import MigrationContext
 from alembic.operations import Operations
 from sqlalchemy import DefaultClause, text, DDL, select
@@ -8,12 +10,13 @@ from db.columns.defaults import NAME, NULLABLE
 from db.columns.exceptions import InvalidDefaultError, InvalidTypeError, InvalidTypeOptionError
 from db.columns.operations.select import (
     get_column_attnum_from_name, get_column_default, get_column_name_from_attnum,
+    get_map_of_attnum_to_column_name,
 )
 from db.columns.utils import to_mathesar_column_with_engine, get_type_options
 from db.tables.operations.select import reflect_table_from_oid
 from db.types.operations.convert import get_db_type_enum_from_class, get_db_type_enum_from_id
 from db.types.operations.cast import get_cast_function_name
-from db.utils import execute_statement
+from db.utils import execute_ddl, execute_statement, quote_identifier, quote_table
 from db.metadata import get_empty_metadata
 
 
@@ -68,6 +71,175 @@ def alter_column(engine, table_oid, column_attnum, column_data):
     return reflected_column
 
 
+def alter_columns_in_bulk(engine, table_oid, column_data_list, connection_to_use=None):
+    """
+    Alters many columns of a table at once. Each element of column_data_list has the 'attnum' of
+    a column and any of the changes alter_column takes: 'type', 'type_options', 'nullable',
+    'column_default_dict' and 'name'.
+
+    The table is reflected once, and the type and nullability changes of all the columns, along
+    with dropping defaults, are made by a single ALTER TABLE statement, so that the table is
+    rewritten at most once. New defaults are set, and columns renamed, afterwards in the same
+    transaction, since Postgres doesn't allow renaming in a statement making other changes.
+
+    Returns the (former) names of the columns that were retyped, if any, in which case the table
+    was rewritten.
+    """
+    if connection_to_use is None:
+        with engine.begin() as conn:
+            return _alter_columns_in_bulk(engine, table_oid, column_data_list, conn)
+    return _alter_columns_in_bulk(engine, table_oid, column_data_list, connection_to_use)
+
+
+def _alter_columns_in_bulk(engine, table_oid, column_data_list, connection):
+    metadata = get_empty_metadata()
+    table = reflect_table_from_oid(table_oid, engine, metadata=metadata, connection_to_use=connection)
+    column_names = get_map_of_attnum_to_column_name(
+        table_oid,
+        [column_data['attnum'] for column_data in column_data_list],
+        engine,
+        metadata=metadata,
+        connection_to_use=connection,
+    )
+    subcommands = []
+    retyped_columns = []
+    new_defaults = []
+    renames = []
+    for column_data in column_data_list:
+        column = table.columns[column_names[column_data['attnum']]]
+        quoted_column = quote_identifier(column.name, engine)
+        column_subcommands, new_type, new_default = _get_column_alter_subcommands(
+            column, column_data, engine, connection
+        )
+        subcommands.extend(f'ALTER COLUMN {quoted_column} {subcommand}' for subcommand in column_subcommands)
+        if new_type is not None:
+            retyped_columns.append((column.name, new_type))
+        if new_default is not None:
+            new_defaults.append((column.name, new_default))
+        if NAME in column_data and column_data[NAME] != column.name:
+            renames.append((quoted_column, quote_identifier(column_data[NAME], engine)))
+    quoted_table = quote_table(table, engine)
+    if subcommands:
+        try:
+            execute_ddl(connection, f'ALTER TABLE {quoted_table} {", ".join(subcommands)}')
+        except DataError as e:
+            if isinstance(e.orig, InvalidParameterValue):
+                raise InvalidTypeOptionError
+            elif isinstance(e.orig, InvalidTextRepresentation):
+                if not retyped_columns:
+                    raise InvalidDefaultError
+                raise _get_bulk_invalid_type_error(retyped_columns)
+            else:
+                raise e.orig
+        except InternalError as e:
+            if isinstance(e.orig, RaiseException):
+                raise _get_bulk_invalid_type_error(retyped_columns)
+            else:
+                raise e.orig
+        except ProgrammingError as e:
+            if isinstance(e.orig, SyntaxError):
+                raise InvalidTypeOptionError
+            else:
+                raise e.orig
+    if new_defaults:
+        _set_column_defaults(table, new_defaults, connection)
+    for quoted_column, quoted_new_name in renames:
+        execute_ddl(connection, f'ALTER TABLE {quoted_table} RENAME COLUMN {quoted_column} TO {quoted_new_name}')
+    return [column_name for column_name, _ in retyped_columns]
+
+
+def _get_column_alter_subcommands(column, column_data, engine, connection):
+    """
+    Returns the ALTER COLUMN subcommands making the changes of column_data to the column, the
+    column's new type if it's retyped, and its new default if one is set. Changes that leave the
+    column as it is are skipped.
+    """
+    subcommands = []
+    has_default = column.server_default is not None
+    set_default = 'column_default_dict' in column_data
+    if set_default:
+        default_dict = column_data['column_default_dict']
+        default = default_dict['value'] if default_dict is not None else None
+    new_type, type_options = _get_new_type(column, column_data)
+    if new_type is not None:
+        cast_function_name = get_cast_function_name(new_type)
+        if has_default:
+            # As in alter_column_type, the default is cast to the new type along with the column.
+            subcommands.append('DROP DEFAULT')
+            has_default = False
+            if not set_default:
+                cast_stmt = select(text(f'{cast_function_name}({column.server_default.arg.text})'))
+                default = execute_statement(engine, cast_stmt, connection).scalar()
+                set_default = True
+        prepared_type_name = new_type.get_sa_instance_compiled(engine=engine, type_options=type_options)
+        subcommands.append(
+            f'TYPE {prepared_type_name} USING {cast_function_name}({quote_identifier(column.name, engine)})'
+        )
+    if NULLABLE in column_data and column_data[NULLABLE] != column.nullable:
+        subcommands.append('DROP NOT NULL' if column_data[NULLABLE] else 'SET NOT NULL')
+    if set_default and default is None and has_default:
+        subcommands.append('DROP DEFAULT')
+    new_default = default if set_default and default is not None else None
+    return subcommands, new_type, new_default
+
+
+def _set_column_defaults(table, new_defaults, connection):
+    """
+    Sets the defaults as set_column_default does, rendered by the dialect from a DefaultClause.
+    Setting a default doesn't rewrite the table, so these are separate statements.
+    """
+    op = Operations(MigrationContext.configure(connection))
+    for column_name, default in new_defaults:
+        try:
+            op.alter_column(
+                table.name, column_name, schema=table.schema, server_default=_get_default_clause(default)
+            )
+        except DataError as e:
+            if isinstance(e.orig, InvalidTextRepresentation):
+                raise InvalidDefaultError
+            else:
+                raise e
+
+
+def _get_default_clause(default):
+    # Postgres casts the string literal to the column's type; JSON values are given as JSON.
+    if isinstance(default, (dict, list)):
+        default = json.dumps(default)
+    return DefaultClause(str(default))
+
+
+def _get_new_type(column, column_data):
+    """
+    Returns the type and type options column_data gives the column, or None as the type if they
+    are the column's current ones, following alter_column.
+    """
+    if 'type' in column_data:
+        new_type = get_db_type_enum_from_id(column_data['type'])
+        type_options = column_data.get('type_options', {})
+    elif 'type_options' in column_data:
+        new_type = None
+        type_options = column_data['type_options']
+    else:
+        return None, None
+    type_options = type_options if type_options is not None else {}
+    column_db_type = get_db_type_enum_from_class(column.type.__class__)
+    new_type = new_type if new_type is not None else column_db_type
+    if (
+        new_type == column_db_type
+        and _check_type_option_equivalence(type_options, get_type_options(column))
+    ):
+        return None, None
+    return new_type, type_options
+
+
+def _get_bulk_invalid_type_error(retyped_columns):
+    # Which column failed to be cast can only be told if only one was retyped.
+    if len(retyped_columns) == 1:
+        column_name, new_type = retyped_columns[0]
+        return InvalidTypeError(column_name, new_type)
+    return InvalidTypeError()
+
+
 def retype_column(
     table_oid, column_attnum, engine, connection, new_type=None, type_options=None,
 ):
@@ -194,7 +366,7 @@ def set_column_default(table_oid, column_attnum, engine, connection, default, me
     )
     # TODO reuse metadata
     column_name = get_column_name_from_attnum(table_oid, column_attnum, engine, metadata=metadata)
-    default_clause = DefaultClause(str(default)) if default is not None else default
+    default_clause = _get_default_clause(default) if default is not None else default
     try:
         ctx = MigrationContext.configure(connection)
         op = Operations(ctx)
@@ -231,8 +403,8 @@ def _check_type_option_equivalence(type_options_1, type_options_2):
     return False
 
 
-def _validate_columns_for_batch_update(table, column_data):
-    ALLOWED_KEYS = ['attnum', 'name', 'type', 'type_options', 'delete']
+def _validate_columns_for_batch_update(column_data):
+    ALLOWED_KEYS = ['attnum', 'name', 'type', 'type_options', NULLABLE, 'column_default_dict', 'delete']
     for single_column_data in column_data:
         if 'attnum' not in single_column_data.keys():
             raise ValueError('Key "attnum" is required')
@@ -242,44 +414,6 @@ def _validate_columns_for_batch_update(table, column_data):
                 raise ValueError(f'Key "{key}" found in columns. Keys allowed are: {allowed_key_list}')
 
 
-def _batch_update_column_types(table_oid, column_data_list, connection, engine):
-    for column_data in column_data_list:
-        column_attnum = column_data.get('attnum')
-        if 'type' in column_data and column_attnum is not None:
-            new_type = get_db_type_enum_from_id(column_data['type'])
-            type_options = column_data.get('type_options', {})
-            if type_options is None:
-                type_options = {}
-            retype_column(table_oid, column_attnum, engine, connection, new_type, type_options)
-
-
-def _batch_alter_table_rename_columns(table_oid, column_data_list, connection, engine):
-    table = reflect_table_from_oid(
-        table_oid,
-        engine,
-        connection_to_use=connection,
-        # TODO reuse metadata
-        metadata=get_empty_metadata(),
-    )
-    ctx = MigrationContext.configure(connection)
-    op = Operations(ctx)
-    with op.batch_alter_table(table.name, schema=table.schema) as batch_op:
-        for column_data in column_data_list:
-            column_attnum = column_data.get('attnum', None)
-            if column_attnum is not None:
-                # TODO reuse metadata
-                name = get_column_name_from_attnum(table_oid, column_attnum, engine=engine, metadata=get_empty_metadata(), connection_to_use=connection)
-            # TODO seems like name can be unbound below; improve logic/structure
-            #   Brent's explanation (copy-pasted from GH review):
-            #   I think there's a problem here, but it would only happen if this function is called
-            #   without an attnum for some passed column data blob, which should never happen.
-            if 'name' in column_data and name != column_data['name']:
-                batch_op.alter_column(
-                    name,
-                    new_column_name=column_data['name']
-                )
-
-
 def batch_alter_table_drop_columns(table_oid, column_data_list, connection, engine):
     table = reflect_table_from_oid(
         table_oid,
@@ -299,14 +433,12 @@ def batch_alter_table_drop_columns(table_oid, column_data_list, connection, engi
 
 
 def batch_update_columns(table_oid, engine, column_data_list):
-    table = reflect_table_from_oid(
-        table_oid,
-        engine,
-        # TODO reuse metadata
-        metadata=get_empty_metadata(),
-    )
-    _validate_columns_for_batch_update(table, column_data_list)
+    _validate_columns_for_batch_update(column_data_list)
     with engine.begin() as conn:
-        _batch_update_column_types(table_oid, column_data_list, conn, engine)
-        _batch_alter_table_rename_columns(table_oid, column_data_list, conn, engine)
+        alter_columns_in_bulk(
+            engine,
+            table_oid,
+            [column_data for column_data in column_data_list if column_data.get('delete') is None],
+            connection_to_use=conn,
+        )
         batch_alter_table_drop_columns(table_oid, column_data_list, conn, engine)
@@ -1,26 +1,24 @@
 from alembic.migration import MigrationContext
 from alembic.operations import Operations
-from sqlalchemy.ext import compiler
+from sqlalchemy import Column, DefaultClause, UniqueConstraint, text
 from sqlalchemy.exc import DataError
-from sqlalchemy.schema import DDLElement
 from psycopg2.errors import InvalidTextRepresentation, InvalidParameterValue
 
 from db.columns.base import MathesarColumn
 from db.columns.defaults import DEFAULT, NAME, NULLABLE, TYPE
 from db.columns.exceptions import InvalidDefaultError, InvalidTypeError, InvalidTypeOptionError
-from db.columns.operations.alter import set_column_default, change_column_nullable
-from db.columns.operations.select import (
-    get_column_attnum_from_name, get_column_default, get_column_name_from_attnum,
-)
+from db.columns.operations.select import get_column_name_from_attnum
 from db.columns.utils import to_mathesar_column_with_engine
-from db.constraints.operations.create import copy_constraint
-from db.constraints.operations.select import get_column_constraints
-from db.constraints import utils as constraint_utils
+from db.constraints.operations.create import create_unique_constraint
+from db.tables.operations.online import (
+    ONLINE_PREFIX, create_row_trigger, drop_row_trigger, lock_table, run_in_batches,
+)
 from db.tables.operations.select import reflect_table_from_oid
 from db.types.base import PostgresType
-from db.types.operations.convert import get_db_type_enum_from_id, get_db_type_enum_from_class
+from db.types.operations.convert import get_db_type_enum_from_id
 from db import constants
 from db.metadata import get_empty_metadata
+from db.utils import execute_ddl, quote_identifier, quote_table
 
 
 def create_column(engine, table_oid, column_data):
@@ -90,6 +88,32 @@ def bulk_create_mathesar_column(engine, table_oid, columns, schema):
             op.add_column(table.name, column, schema=schema)
 
 
+def add_primary_key_column(engine, table_oid):
+    """
+    Adds a serial primary key column to a table without a primary key, which gives its records a
+    cheap deterministic default ordering. The column is named `id`, unless that name is taken.
+    """
+    # TODO reuse metadata
+    table = reflect_table_from_oid(table_oid, engine, metadata=get_empty_metadata())
+    column_name = constants.ID
+    if column_name in table.c:
+        column_name = _gen_col_name(table, column_name)
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f'ALTER TABLE {preparer.format_table(table)}'
+                f' ADD COLUMN {preparer.quote(column_name)} SERIAL PRIMARY KEY'
+            )
+        )
+    # TODO reuse metadata
+    reflected_table = reflect_table_from_oid(table_oid, engine, metadata=get_empty_metadata())
+    return MathesarColumn.from_column(
+        reflected_table.columns[column_name],
+        engine=engine
+    )
+
+
 def gen_col_name(table):
     base_name = constants.COLUMN_NAME_TEMPLATE
     col_num = len(table.c)
@@ -106,103 +130,142 @@ def _gen_col_name(table, column_name):
     return new_column_name
 
 
-class CopyColumn(DDLElement):
-    def __init__(self, schema, table, to_column, from_column):
-        self.schema = schema
-        self.table = table
-        self.to_column = to_column
-        self.from_column = from_column
-
-
-@compiler.compiles(CopyColumn, "postgresql")
-def compile_copy_column(element, compiler, **_):
-    return 'UPDATE "%s"."%s" SET "%s" = "%s"' % (
-        element.schema,
-        element.table,
-        element.to_column,
-        element.from_column
-    )
-
+def duplicate_column(
+        table_oid,
+        copy_from_attnum,
+        engine,
+        new_column_name=None,
+        copy_data=True,
+        copy_constraints=True,
+        batch_size=None,
+        on_progress=None,
+):
+    """
+    Adds a copy of a column to its table, reflecting the table once and altering it in a single
+    transaction. The column's data and default are copied if copy_data is set, and its unique
+    constraints (not its primary key) if copy_constraints is set. Its nullability is copied only
+    if both are, since the new column would be empty otherwise.
 
-def _duplicate_column_data(table_oid, from_column_attnum, to_column_attnum, engine):
-    # TODO reuse metadata
+    If batch_size is given and the table has a single column primary key, the data is copied in
+    batches of that many rows, each in its own transaction, rather than by one UPDATE rewriting
+    the whole table, while a trigger copies values written meanwhile. Constraints are copied
+    after the last batch. The new column is dropped if any of that fails. `on_progress` is passed
+    to run_in_batches.
+    """
     metadata = get_empty_metadata()
-    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
-    from_column_name = get_column_name_from_attnum(table_oid, from_column_attnum, engine, metadata=metadata)
-    to_column_name = get_column_name_from_attnum(table_oid, to_column_attnum, engine, metadata=metadata)
-    copy = CopyColumn(
-        table.schema,
-        table.name,
-        to_column_name,
-        from_column_name,
-    )
     with engine.begin() as conn:
-        conn.execute(copy)
-    # TODO reuse metadata
-    from_default = get_column_default(table_oid, from_column_attnum, engine, metadata=get_empty_metadata())
-    if from_default is not None:
-        with engine.begin() as conn:
-            set_column_default(table_oid, to_column_attnum, engine, conn, from_default)
+        table = reflect_table_from_oid(table_oid, engine, metadata=metadata, connection_to_use=conn)
+        from_column_name = get_column_name_from_attnum(
+            table_oid, copy_from_attnum, engine, metadata=metadata, connection_to_use=conn
+        )
+        from_column = table.c[from_column_name]
+        if new_column_name is None:
+            new_column_name = _gen_col_name(table, from_column_name)
+        copy_in_batches = (
+            copy_data and batch_size is not None and len(table.primary_key.columns) == 1
+        )
+        new_column = _add_column_copy(table, from_column, new_column_name, copy_data, conn)
+        if copy_in_batches:
+            create_row_trigger(
+                conn,
+                engine,
+                table,
+                _get_duplicate_trigger_name(table_oid),
+                'BEFORE INSERT OR UPDATE',
+                f'NEW.{quote_identifier(new_column.name, engine)}'
+                f' := NEW.{quote_identifier(from_column.name, engine)};'
+            )
+        else:
+            if copy_data:
+                conn.execute(_create_copy_column_data_stmt(table, from_column, new_column))
+            if copy_constraints:
+                _copy_column_constraints(table, from_column, new_column, engine, conn, copy_data)
+    if copy_in_batches:
+        _copy_column_data_in_batches(
+            table_oid, table, from_column, new_column, engine, copy_constraints, batch_size, on_progress
+        )
+    return to_mathesar_column_with_engine(new_column, engine)
 
 
-def _duplicate_column_constraints(table_oid, from_column_attnum, to_column_attnum, engine, copy_nullable=True):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
-    from_column_name = get_column_name_from_attnum(table_oid, from_column_attnum, engine, metadata=metadata)
-    if copy_nullable:
-        with engine.begin() as conn:
-            change_column_nullable(table_oid, to_column_attnum, engine, conn, table.c[from_column_name].nullable)
-    constraints = get_column_constraints(from_column_attnum, table_oid, engine)
-    for constraint in constraints:
-        constraint_type = constraint_utils.get_constraint_type_from_char(constraint.contype)
-        if constraint_type != constraint_utils.ConstraintType.UNIQUE.value:
-            # Don't allow duplication of primary keys
-            continue
-        copy_constraint(
-            table_oid, engine, constraint, from_column_attnum, to_column_attnum
-        )
+def _add_column_copy(table, from_column, new_column_name, copy_default, connection):
+    """
+    Adds an empty, nullable column of the same type as `from_column` to the table, and to the
+    reflected table object, so that it can be used in statements without reflecting again.
+    """
+    ctx = MigrationContext.configure(connection)
+    op = Operations(ctx)
+    op.add_column(table.name, MathesarColumn(new_column_name, from_column.type), schema=table.schema)
+    server_default = None
+    # The default is set after adding the column, so that existing rows aren't filled with it;
+    # a volatile default would rewrite the table.
+    if copy_default and from_column.server_default is not None:
+        server_default = DefaultClause(from_column.server_default.arg)
+        op.alter_column(table.name, new_column_name, schema=table.schema, server_default=server_default)
+    new_column = Column(new_column_name, from_column.type, server_default=server_default)
+    table.append_column(new_column)
+    return new_column
 
 
-def duplicate_column(table_oid, copy_from_attnum, engine, new_column_name=None, copy_data=True, copy_constraints=True):
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
-    copy_from_name = get_column_name_from_attnum(table_oid, copy_from_attnum, engine, metadata=metadata)
-    from_column = MathesarColumn.from_column(table.c[copy_from_name])
-    from_column_db_type = get_db_type_enum_from_class(
-        from_column.type.__class__
+def _create_copy_column_data_stmt(table, from_column, to_column, condition=None):
+    stmt = table.update().values({to_column: from_column})
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return stmt
+
+
+def _copy_column_constraints(table, from_column, to_column, engine, connection, copy_nullable):
+    if copy_nullable and not from_column.nullable:
+        ctx = MigrationContext.configure(connection)
+        op = Operations(ctx)
+        op.alter_column(table.name, to_column.name, nullable=False, schema=table.schema)
+        to_column.nullable = False
+    # Primary keys aren't copied, only unique constraints.
+    unique_constraints = sorted(
+        (
+            constraint for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and from_column.name in constraint.columns
+        ),
+        key=lambda constraint: constraint.name,
     )
-    if new_column_name is None:
-        new_column_name = _gen_col_name(table, from_column.name)
-
-    column_data = {
-        NAME: new_column_name,
-        "type": from_column_db_type.id,
-        NULLABLE: True,
-    }
-    new_column = create_column(engine, table_oid, column_data)
-    # TODO reuse metadata
-    new_column_attnum = get_column_attnum_from_name(table_oid, new_column.name, engine, metadata=get_empty_metadata())
-    if copy_data:
-        _duplicate_column_data(
-            table_oid,
-            copy_from_attnum,
-            new_column_attnum,
-            engine
+    for constraint in unique_constraints:
+        column_names = [
+            to_column.name if column.name == from_column.name else column.name
+            for column in constraint.columns
+        ]
+        create_unique_constraint(
+            table.name, table.schema, engine, column_names, connection_to_use=connection
         )
 
-    if copy_constraints:
-        _duplicate_column_constraints(
-            table_oid,
-            copy_from_attnum,
-            new_column_attnum,
+
+def _copy_column_data_in_batches(
+        table_oid, table, from_column, to_column, engine, copy_constraints, batch_size, on_progress
+):
+    trigger_name = _get_duplicate_trigger_name(table_oid)
+    try:
+        run_in_batches(
+            table,
+            lambda conn, condition: conn.execute(
+                _create_copy_column_data_stmt(table, from_column, to_column, condition)
+            ),
+            batch_size,
             engine,
-            copy_nullable=copy_data
+            on_progress=on_progress,
         )
+        with engine.begin() as conn:
+            lock_table(conn, engine, table)
+            drop_row_trigger(conn, engine, table, trigger_name)
+            if copy_constraints:
+                _copy_column_constraints(table, from_column, to_column, engine, conn, True)
+    except Exception:
+        with engine.begin() as conn:
+            drop_row_trigger(conn, engine, table, trigger_name)
+            execute_ddl(
+                conn,
+                f'ALTER TABLE {quote_table(table, engine)}'
+                f' DROP COLUMN IF EXISTS {quote_identifier(to_column.name, engine)}'
+            )
+        raise
 
-    # TODO reuse metadata
-    metadata = get_empty_metadata()
-    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
-    column_name = get_column_name_from_attnum(table_oid, new_column_attnum, engine, metadata=metadata)
-    return to_mathesar_column_with_engine(table.c[column_name], engine)
+
+def _get_duplicate_trigger_name(table_oid):
+    return f'{ONLINE_PREFIX}duplicate_{table_oid}'
@@ -8,15 +8,22 @@ from db.tables.operations.select import reflect_table_from_oid
 from db.metadata import get_empty_metadata
 
 
-def create_unique_constraint(table_name, schema, engine, columns, constraint_name=None):
-    with engine.begin() as conn:
-        metadata = MetaData(bind=engine, schema=schema, naming_convention=naming_convention)
-        opts = {
-            'target_metadata': metadata
-        }
-        ctx = MigrationContext.configure(conn, opts=opts)
-        op = Operations(ctx)
-        op.create_unique_constraint(constraint_name, table_name, columns, schema)
+def create_unique_constraint(table_name, schema, engine, columns, constraint_name=None, connection_to_use=None):
+    if connection_to_use is None:
+        with engine.begin() as conn:
+            _create_unique_constraint(table_name, schema, engine, columns, constraint_name, conn)
+    else:
+        _create_unique_constraint(table_name, schema, engine, columns, constraint_name, connection_to_use)
+
+
+def _create_unique_constraint(table_name, schema, engine, columns, constraint_name, connection):
+    metadata = MetaData(bind=engine, schema=schema, naming_convention=naming_convention)
+    opts = {
+        'target_metadata': metadata
+    }
+    ctx = MigrationContext.configure(connection, opts=opts)
+    op = Operations(ctx)
+    op.create_unique_constraint(constraint_name, table_name, columns, schema)
 
 
 def create_constraint(schema, engine, constraint_obj):
@@ -12,61 +12,153 @@ DEFAULT_NON_COLUMN_OBJSUBID = 0
 PG_CLASS_CATALOGUE_NAME = '\'pg_class\''
 START_LEVEL = 1
 MAX_LEVEL = 10
+# Catalogs whose changes can affect the dependency graph or the names of objects in it.
+DEPENDENCY_GRAPH_CATALOGS = [
+    'pg_depend', 'pg_class', 'pg_namespace', 'pg_attribute', 'pg_constraint', 'pg_trigger', 'pg_proc',
+]
 
 
 def get_dependents_graph(referenced_object_id, engine, exclude_types, attnum=None):
-    dependency_pairs = _get_typed_dependency_pairs_stmt(engine, exclude_types)
-    dependency_pairs_cte = dependency_pairs.cte(recursive=True, name='dependency_pairs_cte')
-
-    pg_identify_refobject = _get_pg_identify_object_lateral_stmt(
-        dependency_pairs_cte.c.refclassid,
-        dependency_pairs_cte.c.refobjid,
-        (DEFAULT_NON_COLUMN_OBJSUBID if attnum is None else attnum)
-    )
-
-    # anchor member which includes all dependents of a requested object
-    anchor = (
-        select(
-            dependency_pairs_cte,
-            pg_identify_refobject.c.name.label('refobjname'),
-            pg_identify_refobject.c.type.label('refobjtype'),
-            literal(START_LEVEL).label('level'),
-            array([dependency_pairs_cte.c.refobjid]).label('dependency_chain')
+    """
+    Returns the dependents of the given object (or of one of its columns, if an attnum is given)
+    up to MAX_LEVEL levels deep, as a flat list of dependency pairs.
+
+    The graph is answered from an in-memory DependencyGraph of the whole database, which is only
+    rebuilt when the database's catalogs change.
+    """
+    return get_dependency_graph(engine).get_dependents(referenced_object_id, exclude_types, attnum)
+
+
+def get_dependency_graph(engine):
+    catalog_version = _get_dependency_catalog_version(engine)
+    cache_key = str(engine.url)
+    cached = _dependency_graph_cache.get(cache_key)
+    if cached is not None and cached[0] == catalog_version:
+        return cached[1]
+    dependency_graph = DependencyGraph.from_database(engine)
+    _dependency_graph_cache[cache_key] = (catalog_version, dependency_graph)
+    return dependency_graph
+
+
+def clear_dependency_graph_cache():
+    _dependency_graph_cache.clear()
+
+
+class DependencyGraph:
+    """
+    Adjacency structure of all typed dependency pairs on a database, along with the identities of
+    all referenced objects, so that the dependents of any object can be found without querying.
+    """
+    def __init__(self, dependency_pairs, referenced_object_identities):
+        # Maps referenced object oids to the pairs of their direct dependents.
+        self._dependency_pairs_by_refobjid = {}
+        for dependency_pair in dependency_pairs:
+            self._dependency_pairs_by_refobjid.setdefault(dependency_pair.refobjid, []).append(dependency_pair)
+        # Maps (refclassid, refobjid, refobjsubid) to (name, type).
+        self._referenced_object_identities = referenced_object_identities
+
+    @classmethod
+    def from_database(cls, engine):
+        pairs_stmt = _get_typed_dependency_pairs_stmt(engine, [])
+        identities_stmt = text(
+            "SELECT r.refclassid, r.refobjid, r.refobjsubid, i.name, i.type"
+            " FROM ("
+            "   SELECT refclassid, refobjid, refobjsubid FROM pg_catalog.pg_depend"
+            "   WHERE deptype::text = ANY(:deptypes) AND objid >= :min_oid"
+            "   UNION"
+            "   SELECT refclassid, refobjid, :non_column_objsubid FROM pg_catalog.pg_depend"
+            "   WHERE deptype::text = ANY(:deptypes) AND objid >= :min_oid"
+            " ) r, LATERAL pg_catalog.pg_identify_object(r.refclassid, r.refobjid, r.refobjsubid) i"
+        ).bindparams(
+            deptypes=PG_DEPENDENT_TYPES,
+            min_oid=USER_DEFINED_OBJECTS_MIN_OID,
+            non_column_objsubid=DEFAULT_NON_COLUMN_OBJSUBID,
         )
-        .join(pg_identify_refobject, true())
-        .where(dependency_pairs_cte.c.refobjid == referenced_object_id)
-        .where(dependency_pairs_cte.c.objid != referenced_object_id)
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="SELECT statement has a cartesian product")
+            with engine.connect() as conn:
+                dependency_pairs = conn.execute(pairs_stmt).fetchall()
+                referenced_object_identities = {
+                    (row.refclassid, row.refobjid, row.refobjsubid): (row.name, row.type)
+                    for row in conn.execute(identities_stmt)
+                }
+        return cls(dependency_pairs, referenced_object_identities)
+
+    def get_dependents(self, referenced_object_id, exclude_types, attnum=None):
+        """
+        Walks the graph breadth first from the given object. An object isn't listed as a
+        dependent of objects that are already in its dependency chain, so that circular
+        references don't repeat.
+        """
+        exclude_types = set(exclude_types)
+        refobjsubid = DEFAULT_NON_COLUMN_OBJSUBID if attnum is None else attnum
+        level_rows = []
+        for dependency_pair in self._get_direct_dependency_pairs(referenced_object_id, exclude_types):
+            if dependency_pair.objid == referenced_object_id:
+                continue
+            if attnum is not None and dependency_pair.refobjsubid != attnum:
+                continue
+            refobjname, refobjtype = self._referenced_object_identities.get(
+                (dependency_pair.refclassid, referenced_object_id, refobjsubid), (None, None)
+            )
+            level_rows.append(
+                (dependency_pair, refobjname, refobjtype, START_LEVEL, (referenced_object_id,))
+            )
+        result = []
+        seen_rows = set()
+        while level_rows:
+            next_level_rows = []
+            for row in level_rows:
+                if row in seen_rows:
+                    continue
+                seen_rows.add(row)
+                result.append(_get_structured_dependency_pair(*row[:4]))
+                dependency_pair, _, _, level, dependency_chain = row
+                if level >= MAX_LEVEL:
+                    continue
+                for dependent_pair in self._get_direct_dependency_pairs(dependency_pair.objid, exclude_types):
+                    if (
+                        dependent_pair.objid in dependency_chain
+                        or dependent_pair.objid == dependent_pair.refobjid
+                    ):
+                        continue
+                    next_level_rows.append(
+                        (
+                            dependent_pair,
+                            dependency_pair.objname,
+                            dependency_pair.objtype,
+                            level + 1,
+                            dependency_chain + (dependency_pair.objid,),
+                        )
+                    )
+            level_rows = next_level_rows
+        return result
+
+    def _get_direct_dependency_pairs(self, referenced_object_id, exclude_types):
+        return [
+            dependency_pair
+            for dependency_pair in self._dependency_pairs_by_refobjid.get(referenced_object_id, [])
+            if dependency_pair.dependent_type not in exclude_types
+        ]
+
+
+def _get_dependency_catalog_version(engine):
+    """
+    Returns a value that changes whenever a dependency or the name of a possible dependent
+    changes: dropping objects lowers the number of pg_depend rows, while creating, altering or
+    renaming them writes catalog rows with a new, higher xmin.
+    """
+    max_xmin_selects = ', '.join(
+        f'(SELECT max(xmin::text::bigint) FROM pg_catalog.{catalog})'
+        for catalog in DEPENDENCY_GRAPH_CATALOGS
     )
-
-    if (attnum is not None):
-        anchor = anchor.where(dependency_pairs_cte.c.refobjsubid == attnum)
-
-    anchor = anchor.cte('cte')
-
-    # recursive member which includes dependents for each object of the previous level
-    recursive = (
-        select(
-            dependency_pairs_cte,
-            anchor.c.objname.label('refobjname'),
-            anchor.c.objtype.label('refobjtype'),
-            (anchor.c.level + 1),
-            anchor.c.dependency_chain + array([anchor.c.objid])
-        )
-        .where(anchor.c.level < MAX_LEVEL)
-        .where(dependency_pairs_cte.c.objid != any_(anchor.c.dependency_chain))
-        .where(dependency_pairs_cte.c.objid != dependency_pairs_cte.c.refobjid)
+    sel = text(
+        f"SELECT (SELECT count(*) FROM pg_catalog.pg_depend) AS num_dependencies,"
+        f" greatest({max_xmin_selects}) AS max_xmin"
     )
-
-    recursive = recursive.join(anchor, dependency_pairs_cte.c.refobjid == anchor.c.objid)
-
-    stmt = select(anchor.union(recursive))
-
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="SELECT statement has a cartesian product")
-        with engine.connect() as conn:
-            result = conn.execute(stmt)
-
-    return _get_structured_result(result)
+    with engine.connect() as conn:
+        row = conn.execute(sel).first()
+    return row.num_dependencies, row.max_xmin
 
 
 def _get_constraint_dependents(pg_identify_object, dependency_pairs):
@@ -237,17 +329,18 @@ def _get_typed_dependency_pairs_stmt(engine, exclude_types):
     type_dependents['index'] = index_dependents
 
     trigger_dependents = _get_trigger_dependents(pg_depend, pg_identify_object, pg_trigger).cte('trigger_dependents')
-    type_dependents['trigger'] = [trigger_dependents]
+    type_dependents['trigger'] = trigger_dependents
 
     sequence_dependents = _get_sequence_dependents(pg_identify_object, dependency_pairs).cte('sequence_dependents')
-    type_dependents['sequence'] = [sequence_dependents]
+    type_dependents['sequence'] = sequence_dependents
 
     # only schemas' function dependents
     function_dependents = _get_function_dependents(pg_depend, pg_identify_object, pg_proc).cte('function_dependents')
-    type_dependents['function'] = [function_dependents]
+    type_dependents['function'] = function_dependents
 
+    # dependent_type is the key under which the pair can be excluded
     dependent_selects = [
-        select(dependent)
+        select(dependent, literal(type).label('dependent_type'))
         for type, dependent in type_dependents.items()
         if type not in exclude_types]
 
@@ -281,22 +374,56 @@ def has_dependents(referenced_object_id, engine, attnum=None):
     return result
 
 
-def _get_structured_result(dependency_graph_result):
-    result = []
-    for dependency_pair in dependency_graph_result:
-        d = {}
-        d['level'] = dependency_pair.level
-        d['obj'] = {
+def get_objects_with_dependents(referenced_objects, engine, metadata=None):
+    """
+    Bulk version of has_dependents. Takes (oid, attnum) pairs, where an attnum of None refers to
+    the whole object rather than one of its columns, and returns the set of those pairs that have
+    dependents. A single grouped pg_depend query answers for all of them.
+    """
+    referenced_objects = set(referenced_objects)
+    if not referenced_objects:
+        return set()
+    if metadata is None:
+        metadata = MetaData()
+    pg_depend = _get_pg_depend_table(engine, metadata)
+    referenced_oids = {oid for oid, _ in referenced_objects}
+    stmt = (
+        select(pg_depend.c.refobjid, pg_depend.c.refobjsubid)
+        .where(
+            and_(
+                pg_depend.c.refobjid.in_(referenced_oids),
+                pg_depend.c.deptype == any_(array(PG_DEPENDENT_TYPES)),
+                pg_depend.c.objid >= USER_DEFINED_OBJECTS_MIN_OID
+            )
+        )
+        .group_by(pg_depend.c.refobjid, pg_depend.c.refobjsubid)
+    )
+    with engine.connect() as conn:
+        referenced_pairs = {(row.refobjid, row.refobjsubid) for row in conn.execute(stmt)}
+    # Dependents of a column are also dependents of the object it belongs to.
+    oids_with_dependents = {oid for oid, _ in referenced_pairs}
+    return {
+        (oid, attnum) for oid, attnum in referenced_objects
+        if (oid in oids_with_dependents if attnum is None else (oid, attnum) in referenced_pairs)
+    }
+
+
+def _get_structured_dependency_pair(dependency_pair, refobjname, refobjtype, level):
+    return {
+        'level': level,
+        'obj': {
             'objid': dependency_pair.objid,
             'type': dependency_pair.objtype,
             'name': dependency_pair.objname
-        }
-        d['parent_obj'] = {
+        },
+        'parent_obj': {
             'objid': dependency_pair.refobjid,
-            'type': dependency_pair.refobjtype,
+            'type': refobjtype,
             'objsubid': (dependency_pair.refobjsubid if dependency_pair.refobjsubid != 0 else None),
-            'name': dependency_pair.refobjname
+            'name': refobjname
         }
-        result.append(d)
+    }
 
-    return result
+
+# Maps database URLs to (catalog version, DependencyGraph) tuples.
+_dependency_graph_cache = {}
@@ -58,11 +58,17 @@ def add_custom_types_to_ischema_names(engine):
 def get_dummy_engine():
     """
     In some cases we only need an engine to access the Postgres dialect. E.g. when examining the
-    ischema_names dict. In those cases, following is enough:
+    ischema_names dict. In those cases, an engine that never connects is enough.
+
+    The engine is created once per process, since creating it copies ischema_names; it must not
+    be modified.
     """
-    engine = create_engine("postgresql://", future=True)
-    add_custom_types_to_ischema_names(engine)
-    return engine
+    global _dummy_engine
+    if _dummy_engine is None:
+        engine = create_engine("postgresql://", future=True)
+        add_custom_types_to_ischema_names(engine)
+        _dummy_engine = engine
+    return _dummy_engine
 
 
 def _make_ischema_names_unique(engine):
@@ -73,3 +79,6 @@ def _make_ischema_names_unique(engine):
     ischema_names = engine.dialect.ischema_names
     ischema_names_copy = copy.deepcopy(ischema_names)
     setattr(engine.dialect, "ischema_names", ischema_names_copy)
+
+
+_dummy_engine = None
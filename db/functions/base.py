@@ -15,7 +15,7 @@ access hints on what composition of functions and parameters should be valid.
 from abc import ABC, abstractmethod
 import warnings
 
-from sqlalchemy import column, not_, and_, or_, func, literal, cast
+from sqlalchemy import column, not_, and_, or_, literal, cast
 from sqlalchemy.dialects.postgresql import array_agg, TEXT, array
 from sqlalchemy.sql import quoted_name
 from sqlalchemy.sql.functions import GenericFunction, concat
@@ -38,23 +38,32 @@ def sa_call_sql_function(function_name, *parameters, return_type=None):
     function_name: string giving a namespaced SQL function
     *parameters:   these will be passed directly to the generated function.
     return_type:   an SQLAlchemy type class
+
+    The GenericFunction subclass for each function name and return type is
+    only created once per process, since filters call this for every
+    expression they build.
     """
-    engine = get_dummy_engine()
     if return_type is None:
         warnings.warn(
             "sa_call_sql_function should be called with the return_type kwarg set"
         )
         # We can't use PostgresType since we don't want an engine here
         return_type = PostgresType.TEXT
+    sql_function = _sql_function_registry.get((function_name, return_type))
+    if sql_function is None:
+        sql_function = _register_sql_function(function_name, return_type)
+    return sql_function(*parameters)
+
 
+def _register_sql_function(function_name, return_type):
+    engine = get_dummy_engine()
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", message="The GenericFunction")
         # Creating this type registers the function (more importantly,
         # its return type) with SQLAlchemy. **magic!!**
-        # Note that it's not necessary to assign the type to a variable,
-        # since it gets picked up whenever the type is defined for the
-        # interpreter, which happens when the function `type` is called.
-        type(
+        # We keep the type, so that it can be called directly, even if
+        # the same function is later registered with another return type.
+        sql_function = type(
             function_name,
             (GenericFunction,),
             {
@@ -63,7 +72,13 @@ def sa_call_sql_function(function_name, *parameters, return_type=None):
                 "identifier": function_name,
             }
         )
-    return getattr(func, function_name)(*parameters)
+    _sql_function_registry[(function_name, return_type)] = sql_function
+    return sql_function
+
+
+# Maps (function name, return type) pairs to the GenericFunction subclasses
+# created for them by sa_call_sql_function.
+_sql_function_registry = {}
 
 
 # NOTE: this class is abstract.
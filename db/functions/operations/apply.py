@@ -1,12 +1,24 @@
+import json
+import threading
+from collections import OrderedDict
+
 from db.functions.base import DBFunction
 from db.functions.exceptions import ReferencedColumnsDontExist
 from db.functions.packed import DBFunctionPacked
 from db.functions.operations.deserialize import get_db_function_from_ma_function_spec
 
+FILTER_CACHE_SIZE = 512
+
 
 def apply_db_function_spec_as_filter(relation, ma_function_spec):
-    db_function = get_db_function_from_ma_function_spec(ma_function_spec)
-    return apply_db_function_as_filter(relation, db_function)
+    """
+    Like apply_db_function_as_filter, but takes a DB function spec. Specs are deserialized and
+    turned into SQLAlchemy expressions once, and kept in a bounded LRU cache, since the same
+    filters tend to be sent over and over.
+    """
+    db_function, sa_expression = _get_compiled_db_function_spec(ma_function_spec)
+    _assert_that_all_referenced_columns_exist(relation, db_function)
+    return relation.filter(sa_expression)
 
 
 def apply_db_function_as_filter(relation, db_function):
@@ -21,6 +33,52 @@ def get_sa_expression_from_db_function_spec(ma_function_spec):
     return _db_function_to_sa_expression(db_function)
 
 
+def get_filter_cache_stats():
+    with _filter_cache_lock:
+        return {
+            'hits': _filter_cache_stats['hits'],
+            'misses': _filter_cache_stats['misses'],
+            'size': len(_filter_cache),
+            'max_size': FILTER_CACHE_SIZE,
+        }
+
+
+def clear_filter_cache():
+    with _filter_cache_lock:
+        _filter_cache.clear()
+        _filter_cache_stats['hits'] = 0
+        _filter_cache_stats['misses'] = 0
+
+
+def _get_compiled_db_function_spec(ma_function_spec):
+    """
+    Returns the DBFunction and SQLAlchemy expression for the spec. The expression references
+    columns by name only, so it doesn't depend on the relation it's applied to, and the spec alone
+    is a sufficient cache key; referenced columns are still checked against each relation.
+    """
+    try:
+        cache_key = json.dumps(ma_function_spec, sort_keys=True)
+    except TypeError:
+        # Only JSON-like specs can be cached.
+        cache_key = None
+    if cache_key is not None:
+        with _filter_cache_lock:
+            compiled = _filter_cache.get(cache_key)
+            if compiled is not None:
+                _filter_cache.move_to_end(cache_key)
+                _filter_cache_stats['hits'] += 1
+                return compiled
+            _filter_cache_stats['misses'] += 1
+    db_function = get_db_function_from_ma_function_spec(ma_function_spec)
+    compiled = (db_function, _db_function_to_sa_expression(db_function))
+    if cache_key is not None:
+        with _filter_cache_lock:
+            _filter_cache[cache_key] = compiled
+            if len(_filter_cache) > FILTER_CACHE_SIZE:
+                _filter_cache.popitem(last=False)
+    return compiled
+
+
 def _assert_that_all_referenced_columns_exist(relation, db_function):
     columns_that_exist = _get_columns_that_exist(relation)
     referenced_columns = db_function.referenced_columns
@@ -60,3 +118,10 @@ def _db_function_to_sa_expression(db_function_or_literal):
     else:
         literal = db_function_or_literal
         return literal
+
+
+_filter_cache_lock = threading.Lock()
+# Maps normalized (JSON-serialized) DB function specs to (DBFunction, SQLAlchemy expression)
+# tuples, least recently used first.
+_filter_cache = OrderedDict()
+_filter_cache_stats = {'hits': 0, 'misses': 0}
@@ -1,13 +1,26 @@
 from enum import Enum
 
-from sqlalchemy import select, MetaData, join, literal
+from sqlalchemy import text
 
 from db.functions.known_db_functions import known_db_functions
-from db.utils import get_pg_catalog_table
+from db.utils import execute_statement
 
 
 def get_supported_db_functions(engine):
-    functions_on_database = _get_functions_defined_on_database(engine)
+    """
+    Returns the known DB functions whose SQL function dependencies are defined on the database.
+
+    The result is cached per database, and recomputed only when the database's function catalog
+    changes, which is checked via a single-row query.
+    """
+    catalog_version = _get_functions_catalog_version(engine)
+    cache_key = str(engine.url)
+    cached = _supported_db_functions_cache.get(cache_key)
+    if cached is not None and cached[0] == catalog_version:
+        return cached[1]
+    functions_on_database = _get_functions_defined_on_database(
+        engine, _get_dependency_function_names()
+    )
     supported_db_functions = tuple(
         db_function
         for db_function in known_db_functions
@@ -16,30 +29,52 @@ def get_supported_db_functions(engine):
             functions_on_database
         )
     )
+    _supported_db_functions_cache[cache_key] = (catalog_version, supported_db_functions)
     return supported_db_functions
 
 
-# TODO consider caching
-def _get_functions_defined_on_database(engine):
+def clear_supported_db_functions_cache():
+    _supported_db_functions_cache.clear()
+
+
+def _get_functions_catalog_version(engine):
     """
-    Constructs and executes a query that returns the set of schema-
-    qualified function names on the database. E.g.
-    `{'mathesar_types.uri_scheme', ..., ...}`.
+    Returns a value that changes whenever functions are created or dropped on the database:
+    creating a function gives it a new, higher oid, and dropping one lowers the count.
     """
-    metadata = MetaData()
-    pg_proc = get_pg_catalog_table('pg_proc', engine, metadata=metadata)
-    pg_namespace = get_pg_catalog_table('pg_namespace', engine, metadata=metadata)
-    join_statement = join(pg_proc, pg_namespace, pg_proc.c.pronamespace == pg_namespace.c.oid)
-    select_statement = (
-        select(pg_namespace.c.nspname + literal('.') + pg_proc.c.proname)
-        .select_from(join_statement)
+    sel = text(
+        "SELECT count(*) AS num_functions, coalesce(max(oid::bigint), 0) AS max_oid"
+        " FROM pg_catalog.pg_proc"
+    )
+    row = execute_statement(engine, sel).first()
+    return row['num_functions'], row['max_oid']
+
+
+def _get_dependency_function_names():
+    return frozenset(
+        _get_function_name(dependency_function)
+        for db_function in known_db_functions
+        for dependency_function in db_function.depends_on or ()
+    )
+
+
+def _get_functions_defined_on_database(engine, qualified_function_names):
+    """
+    Constructs and executes a query that returns the set of the given schema-qualified function
+    names that are defined on the database. E.g. `{'mathesar_types.uri_scheme', ..., ...}`.
+    """
+    if not qualified_function_names:
+        return frozenset()
+    sel = text(
+        "SELECT DISTINCT n.nspname || '.' || p.proname AS qualified_function_name"
+        " FROM pg_catalog.pg_proc p"
+        "   JOIN pg_catalog.pg_namespace n ON p.pronamespace = n.oid"
+        " WHERE n.nspname || '.' || p.proname IN :qualified_function_names"
+    ).bindparams(qualified_function_names=tuple(qualified_function_names))
+    return frozenset(
+        row['qualified_function_name']
+        for row in execute_statement(engine, sel).fetchall()
     )
-    with engine.connect() as connection:
-        return frozenset(
-            qualified_function_name
-            for qualified_function_name,
-            in connection.execute(select_statement)
-        )
 
 
 def _are_db_function_dependencies_satisfied(db_function, functions_on_database):
@@ -54,6 +89,10 @@ def _are_db_function_dependencies_satisfied(db_function, functions_on_database):
 
 
 def _is_dependency_function_in(dependency_function, functions_on_database):
+    return _get_function_name(dependency_function) in functions_on_database
+
+
+def _get_function_name(dependency_function):
     """
     A dependency function may be specified as a string or as an enum instance, whose .value
     attribute is the string name of the function.
@@ -61,9 +100,11 @@ def _is_dependency_function_in(dependency_function, functions_on_database):
     An enum instance is accepted since some SQL function names are stored in enums (e.g. URI
     functions).
     """
-    def _get_function_name(dependency_function):
-        if isinstance(dependency_function, Enum):
-            return dependency_function.value
-        else:
-            return dependency_function
-    return _get_function_name(dependency_function) in functions_on_database
+    if isinstance(dependency_function, Enum):
+        return dependency_function.value
+    else:
+        return dependency_function
+
+
+# Maps database URLs to (catalog version, supported DB functions) tuples.
+_supported_db_functions_cache = {}
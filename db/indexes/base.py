@@ -0,0 +1,132 @@
+import json
+from enum import Enum
+
+from db.functions.operations.deserialize import get_raw_spec_components
+from db.records.operations.relevance import is_string_like_column
+
+# Filters that a B-tree index over the compared column (or expression) can answer.
+BTREE_FILTER_FUNCTION_IDS = {
+    'equal', 'greater', 'lesser', 'greater_or_equal', 'lesser_or_equal', 'in', 'null', 'not_null',
+}
+# Filters that a trigram index over the column can answer.
+TRIGRAM_FILTER_FUNCTION_IDS = {
+    'contains', 'contains_case_insensitive', 'starts_with', 'starts_with_case_insensitive',
+}
+BOOLEAN_FILTER_FUNCTION_IDS = {'and', 'or', 'not'}
+
+
+class IndexMethod(Enum):
+    # A B-tree index over one or more columns.
+    BTREE = 'btree'
+    # A GIN index using pg_trgm's operator class over a string-like column.
+    TRIGRAM = 'trigram'
+    # A B-tree index over an expression of columns, given as a DB function spec.
+    EXPRESSION = 'expression'
+
+
+class IndexCandidate:
+    """
+    Describes an index that would let Postgres answer part of a records query without a full
+    scan. Candidates are compared by their key, so the same index suggested by different queries
+    is only counted once.
+    """
+    def __init__(self, method, columns, expression=None):
+        self.method = method
+        self.columns = tuple(columns)
+        self.expression = expression
+
+    @property
+    def key(self):
+        key_parts = [self.method, ','.join(self.columns)]
+        if self.expression is not None:
+            key_parts.append(json.dumps(self.expression, sort_keys=True))
+        return ':'.join(key_parts)
+
+    def __eq__(self, other):
+        return isinstance(other, IndexCandidate) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f'IndexCandidate({self.key})'
+
+
+def get_index_candidates(table, filter=None, order_by=None, group_by_columns=None, search=None):
+    """
+    Returns a dict mapping the usage kind ('filter', 'sort', 'group' or 'search') to the list of
+    IndexCandidates that would help answer that part of a records query on the given SQLAlchemy
+    table. The parameters are in the format accepted by get_records, with column names.
+    """
+    candidates = {
+        'filter': _get_filter_index_candidates(table, filter) if filter else [],
+        'sort': [],
+        'group': [],
+        'search': [],
+    }
+    sort_column_names = [
+        sort_spec['field'] for sort_spec in order_by or []
+        if sort_spec.get('field') in table.columns
+    ]
+    if sort_column_names:
+        candidates['sort'].append(IndexCandidate(IndexMethod.BTREE.value, sort_column_names))
+    group_column_names = [
+        column_name for column_name in group_by_columns or [] if column_name in table.columns
+    ]
+    if group_column_names:
+        candidates['group'].append(IndexCandidate(IndexMethod.BTREE.value, group_column_names))
+    for search_spec in search or []:
+        column_name = search_spec['column']
+        if column_name not in table.columns:
+            continue
+        # Non-string columns are searched by equality.
+        if is_string_like_column(table.columns[column_name]):
+            method = IndexMethod.TRIGRAM.value
+        else:
+            method = IndexMethod.BTREE.value
+        candidates['search'].append(IndexCandidate(method, [column_name]))
+    return candidates
+
+
+def _get_filter_index_candidates(table, spec):
+    db_function_id, parameters = get_raw_spec_components(spec)
+    if db_function_id in BOOLEAN_FILTER_FUNCTION_IDS:
+        return [
+            candidate
+            for parameter in parameters if isinstance(parameter, dict)
+            for candidate in _get_filter_index_candidates(table, parameter)
+        ]
+    candidates = []
+    for parameter in parameters:
+        if not isinstance(parameter, dict):
+            continue
+        parameter_id, parameter_parameters = get_raw_spec_components(parameter)
+        if parameter_id == 'column_name':
+            column_name = parameter_parameters[0]
+            if column_name not in table.columns:
+                continue
+            if db_function_id in BTREE_FILTER_FUNCTION_IDS:
+                candidates.append(IndexCandidate(IndexMethod.BTREE.value, [column_name]))
+            elif (
+                db_function_id in TRIGRAM_FILTER_FUNCTION_IDS
+                and is_string_like_column(table.columns[column_name])
+            ):
+                candidates.append(IndexCandidate(IndexMethod.TRIGRAM.value, [column_name]))
+        elif parameter_id != 'literal' and db_function_id in BTREE_FILTER_FUNCTION_IDS:
+            column_names = _get_referenced_column_names(parameter)
+            if column_names and column_names.issubset(table.columns.keys()):
+                candidates.append(
+                    IndexCandidate(IndexMethod.EXPRESSION.value, sorted(column_names), parameter)
+                )
+    return candidates
+
+
+def _get_referenced_column_names(spec):
+    db_function_id, parameters = get_raw_spec_components(spec)
+    if db_function_id == 'column_name':
+        return {parameters[0]}
+    column_names = set()
+    for parameter in parameters:
+        if isinstance(parameter, dict):
+            column_names.update(_get_referenced_column_names(parameter))
+    return column_names
@@ -0,0 +1,140 @@
+import hashlib
+import json
+
+from sqlalchemy import Index, text
+
+from db.columns.operations.select import get_column_names_from_attnums
+from db.functions.operations.apply import get_sa_expression_from_db_function_spec
+from db.functions.operations.deserialize import get_db_function_from_ma_function_spec
+from db.indexes.operations.select import TRIGRAM_EXTENSION
+from db.records.operations.relevance import SearchBackend, get_tsvector_expr
+from db.tables.operations.select import reflect_table_from_oid
+from db.metadata import get_empty_metadata
+
+# Postgres truncates longer identifiers, so longer names get shortened with a hash suffix.
+MAX_INDEX_NAME_LENGTH = 63
+
+
+def create_search_indexes(
+        table_oid, column_attnums, engine, backend=SearchBackend.TRIGRAM.value, concurrently=False
+):
+    """
+    Creates GIN indexes that let the given search backend answer searches on the given columns
+    via index scans. Creating trigram indexes also installs the pg_trgm extension if needed, which
+    requires the corresponding privileges.
+
+    Returns the names of the created indexes; columns that already have an index with the same
+    name are skipped.
+    """
+    if backend not in (SearchBackend.TRIGRAM.value, SearchBackend.FULL_TEXT.value):
+        raise ValueError(f'Search backend "{backend}" does not use indexes.')
+    # TODO reuse metadata
+    metadata = get_empty_metadata()
+    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
+    column_names = get_column_names_from_attnums(table_oid, column_attnums, engine, metadata=metadata)
+    indexes = [
+        _get_search_index(table, table.columns[column_name], backend, concurrently)
+        for column_name in column_names
+    ]
+    if backend == SearchBackend.TRIGRAM.value:
+        with engine.begin() as conn:
+            conn.execute(text(f'CREATE EXTENSION IF NOT EXISTS {TRIGRAM_EXTENSION}'))
+    _create_indexes(engine, indexes, concurrently)
+    return [index.name for index in indexes]
+
+
+def create_btree_index(table_oid, column_attnums, engine, concurrently=False):
+    """
+    Creates a B-tree index over the given columns, in the given order, unless an index with the
+    same name already exists. Returns the name of the index.
+    """
+    # TODO reuse metadata
+    metadata = get_empty_metadata()
+    table = reflect_table_from_oid(table_oid, engine, metadata=metadata)
+    column_names = get_column_names_from_attnums(table_oid, column_attnums, engine, metadata=metadata)
+    index = Index(
+        get_index_name(table.name, column_names, 'idx'),
+        *[table.columns[column_name] for column_name in column_names],
+        postgresql_concurrently=concurrently,
+    )
+    _create_indexes(engine, [index], concurrently)
+    return index.name
+
+
+def create_expression_index(table_oid, db_function_spec, engine, concurrently=False):
+    """
+    Creates a B-tree index over the expression described by the given DB function spec, so that
+    filters comparing that expression (e.g. a lowercased column) to literals can use it. Postgres
+    only allows immutable functions in index expressions. Returns the name of the index.
+    """
+    table = reflect_table_from_oid(table_oid, engine, metadata=get_empty_metadata())
+    index_name = get_expression_index_name(table.name, db_function_spec)
+    sa_expression = get_sa_expression_from_db_function_spec(db_function_spec)
+    compiled_expression = sa_expression.compile(
+        dialect=engine.dialect, compile_kwargs={'literal_binds': True}
+    )
+    preparer = engine.dialect.identifier_preparer
+    concurrently_clause = 'CONCURRENTLY ' if concurrently else ''
+    create_index_sql = (
+        f'CREATE INDEX {concurrently_clause}IF NOT EXISTS {preparer.quote(index_name)}'
+        f' ON {preparer.format_table(table)} (({compiled_expression}))'
+    )
+    with _get_index_connection(engine, concurrently) as conn:
+        # Executed without parameters, so literals in the expression are left alone.
+        conn.exec_driver_sql(create_index_sql)
+        if not concurrently:
+            conn.commit()
+    return index_name
+
+
+def get_expression_index_name(table_name, db_function_spec):
+    db_function = get_db_function_from_ma_function_spec(db_function_spec)
+    # Different expressions can use the same function on the same columns, so the name also
+    # includes a hash of the whole spec.
+    spec_hash = hashlib.md5(
+        json.dumps(db_function_spec, sort_keys=True, default=str).encode()
+    ).hexdigest()[:8]
+    name_parts = sorted(db_function.referenced_columns) + [db_function.id, spec_hash]
+    return get_index_name(table_name, name_parts, 'expr_idx')
+
+
+def get_index_name(table_name, name_parts, suffix):
+    index_name = '_'.join([table_name, *name_parts, suffix])
+    if len(index_name) > MAX_INDEX_NAME_LENGTH:
+        name_hash = hashlib.md5(index_name.encode()).hexdigest()[:8]
+        index_name = f'{index_name[:MAX_INDEX_NAME_LENGTH - len(name_hash) - 1]}_{name_hash}'
+    return index_name
+
+
+def _create_indexes(engine, indexes, concurrently):
+    with _get_index_connection(engine, concurrently) as conn:
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+        if not concurrently:
+            conn.commit()
+
+
+def _get_index_connection(engine, concurrently):
+    conn = engine.connect()
+    if concurrently:
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+    return conn
+
+
+def _get_search_index(table, column, backend, concurrently):
+    if backend == SearchBackend.TRIGRAM.value:
+        return Index(
+            get_index_name(table.name, [column.name], 'trgm_idx'),
+            column,
+            postgresql_using='gin',
+            postgresql_ops={column.name: 'gin_trgm_ops'},
+            postgresql_concurrently=concurrently,
+        )
+    else:
+        return Index(
+            get_index_name(table.name, [column.name], 'fts_idx'),
+            get_tsvector_expr(column),
+            postgresql_using='gin',
+            postgresql_concurrently=concurrently,
+        )
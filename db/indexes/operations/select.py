@@ -0,0 +1,109 @@
+from sqlalchemy import select, text
+
+from db.records.operations.relevance import FULL_TEXT_SEARCH_CONFIG, SearchBackend
+from db.utils import execute_statement, get_pg_catalog_table
+
+TRIGRAM_EXTENSION = 'pg_trgm'
+TRIGRAM_OPERATOR_CLASSES = ('gin_trgm_ops', 'gist_trgm_ops')
+
+
+def is_extension_installed(extension_name, engine, metadata, connection_to_use=None):
+    pg_extension = get_pg_catalog_table("pg_extension", engine, metadata=metadata)
+    sel = select(pg_extension.c.oid).where(pg_extension.c.extname == extension_name)
+    return execute_statement(engine, sel, connection_to_use).first() is not None
+
+
+def get_trigram_indexed_column_attnums(table_oid, engine, connection_to_use=None):
+    """
+    Returns the attnums of the table's columns that are covered by a trigram (GIN or GiST)
+    index, i.e. an index whose operator class for that column is one of pg_trgm's.
+    """
+    sel = text(
+        "SELECT DISTINCT i.indkey[k] AS attnum"
+        " FROM pg_catalog.pg_index i"
+        "   CROSS JOIN LATERAL generate_subscripts(i.indkey, 1) AS k"
+        "   JOIN pg_catalog.pg_opclass o ON o.oid = i.indclass[k]"
+        " WHERE i.indrelid = :table_oid AND o.opcname IN :opclass_names"
+    ).bindparams(table_oid=table_oid, opclass_names=TRIGRAM_OPERATOR_CLASSES)
+    result = execute_statement(engine, sel, connection_to_use).fetchall()
+    return {row['attnum'] for row in result}
+
+
+def get_full_text_indexed_column_attnums(table_oid, engine, connection_to_use=None):
+    """
+    Returns the attnums of the table's columns that are referenced by a to_tsvector expression
+    index using the text search configuration searches use, since indexes built with another
+    configuration can't serve those searches. Columns referenced by index expressions are recorded
+    in pg_depend.
+    """
+    sel = text(
+        "SELECT DISTINCT d.refobjsubid AS attnum"
+        " FROM pg_catalog.pg_index i"
+        "   JOIN pg_catalog.pg_depend d"
+        "     ON d.classid = 'pg_catalog.pg_class'::regclass"
+        "     AND d.objid = i.indexrelid"
+        "     AND d.refobjid = i.indrelid"
+        " WHERE i.indrelid = :table_oid"
+        "   AND i.indexprs IS NOT NULL"
+        "   AND d.refobjsubid > 0"
+        "   AND pg_catalog.pg_get_indexdef(i.indexrelid) LIKE :indexdef_pattern"
+    ).bindparams(
+        table_oid=table_oid,
+        indexdef_pattern=f"%to_tsvector('{FULL_TEXT_SEARCH_CONFIG}'::regconfig, %",
+    )
+    result = execute_statement(engine, sel, connection_to_use).fetchall()
+    return {row['attnum'] for row in result}
+
+
+def get_btree_index_column_attnums(table_oid, engine, connection_to_use=None):
+    """
+    Returns a tuple of key column attnums, in index order, for each of the table's B-tree
+    indexes. Expression keys have an attnum of 0, and included (non-key) columns are left out.
+    """
+    sel = text(
+        "SELECT i.indkey::int2[] AS attnums, i.indnkeyatts AS num_key_attnums"
+        " FROM pg_catalog.pg_index i"
+        "   JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid"
+        "   JOIN pg_catalog.pg_am a ON a.oid = c.relam"
+        " WHERE i.indrelid = :table_oid AND a.amname = 'btree'"
+    ).bindparams(table_oid=table_oid)
+    result = execute_statement(engine, sel, connection_to_use).fetchall()
+    return [tuple(row['attnums'][:row['num_key_attnums']]) for row in result]
+
+
+def get_index_names(table_oid, engine, connection_to_use=None):
+    sel = text(
+        "SELECT c.relname AS name"
+        " FROM pg_catalog.pg_index i"
+        "   JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid"
+        " WHERE i.indrelid = :table_oid"
+    ).bindparams(table_oid=table_oid)
+    result = execute_statement(engine, sel, connection_to_use).fetchall()
+    return {row['name'] for row in result}
+
+
+def get_search_backend(table_oid, column_attnums, engine, metadata):
+    """
+    Returns the SearchBackend value that should be used to search the given columns: a full
+    text or trigram backend, if all the columns are covered by a matching index, otherwise the
+    ILIKE backend, which works everywhere but can't use indexes.
+
+    The column_attnums should be those of the string-like columns being searched, since other
+    columns are always searched by equality.
+    """
+    column_attnums = set(column_attnums)
+    if not column_attnums:
+        return SearchBackend.ILIKE.value
+    with engine.begin() as conn:
+        if column_attnums.issubset(
+            get_full_text_indexed_column_attnums(table_oid, engine, connection_to_use=conn)
+        ):
+            return SearchBackend.FULL_TEXT.value
+        if (
+            is_extension_installed(TRIGRAM_EXTENSION, engine, metadata, connection_to_use=conn)
+            and column_attnums.issubset(
+                get_trigram_indexed_column_attnums(table_oid, engine, connection_to_use=conn)
+            )
+        ):
+            return SearchBackend.TRIGRAM.value
+    return SearchBackend.ILIKE.value
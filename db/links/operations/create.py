@@ -1,13 +1,28 @@
-from alembic.operations import Operations
-from alembic.migration import MigrationContext
-from sqlalchemy import ForeignKey, MetaData
+from sqlalchemy import MetaData, Table, bindparam, text
+from sqlalchemy.schema import Constraint, CreateTable, conv
 
-from db.columns.base import MathesarColumn
+from db.columns.utils import get_default_mathesar_column_list
 from db.constraints.utils import naming_convention
-from db.tables.operations.create import create_mathesar_table
-from db.tables.operations.select import reflect_table_from_oid, reflect_tables_from_oids
-from db.tables.utils import get_primary_key_column
-from db.metadata import get_empty_metadata
+from db.tables.operations.create import DuplicateTable
+from db.utils import execute_ddl, quote_identifier
+
+# Just what's needed to reference the tables: their names and their primary key columns' names and
+# types, rather than reflecting whole tables, and the tables those reference, with SQLAlchemy.
+PRIMARY_KEY_SNAPSHOT_SQL = """
+SELECT
+  c.oid,
+  n.nspname AS schema_name,
+  c.relname AS table_name,
+  (
+    SELECT coalesce(json_agg(json_build_array(a.attname, format_type(a.atttypid, a.atttypmod))), '[]')
+    FROM pg_catalog.pg_index i
+      JOIN pg_catalog.pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = c.oid AND i.indisprimary
+  ) AS primary_key_columns
+FROM pg_catalog.pg_class c
+  JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE c.oid IN :table_oids
+"""
 
 
 def create_foreign_key_link(
@@ -19,63 +34,83 @@ def create_foreign_key_link(
         unique_link=False
 ):
     with engine.begin() as conn:
-        referent_table = reflect_table_from_oid(
-            referent_table_oid,
-            engine,
-            connection_to_use=conn,
-            # TODO reuse metadata
-            metadata=get_empty_metadata(),
-        )
-        referrer_table = reflect_table_from_oid(
-            referrer_table_oid,
+        tables = _get_primary_key_snapshot([referrer_table_oid, referent_table_oid], conn)
+        _add_link_columns(
+            conn,
             engine,
-            connection_to_use=conn,
-            # TODO reuse metadata
-            metadata=get_empty_metadata(),
-        )
-        primary_key_column = get_primary_key_column(referent_table)
-        # TODO reuse metadata
-        metadata = MetaData(bind=engine, schema=schema, naming_convention=naming_convention)
-        opts = {
-            'target_metadata': metadata
-        }
-        ctx = MigrationContext.configure(conn, opts=opts)
-        op = Operations(ctx)
-        column = MathesarColumn(
-            referrer_column_name, primary_key_column.type
-        )
-        op.add_column(referrer_table.name, column, schema=schema)
-        if unique_link:
-            op.create_unique_constraint(None, referrer_table.name, [referrer_column_name], schema=schema)
-        op.create_foreign_key(
-            None,
-            referrer_table.name,
-            referent_table.name,
-            [column.name],
-            [primary_key_column.name],
-            source_schema=schema,
-            referent_schema=schema
+            schema,
+            tables[referrer_table_oid].table_name,
+            [(referrer_column_name, tables[referent_table_oid])],
+            unique=unique_link,
         )
 
 
 def create_many_to_many_link(engine, schema, map_table_name, referents):
     with engine.begin() as conn:
-        referent_tables_oid = [referent['referent_table'] for referent in referents]
-        referent_tables = reflect_tables_from_oids(
-            referent_tables_oid, engine, connection_to_use=conn, metadata=get_empty_metadata()
+        if engine.dialect.has_table(conn, map_table_name, schema=schema):
+            raise DuplicateTable
+        tables = _get_primary_key_snapshot(
+            [referent['referent_table'] for referent in referents], conn
+        )
+        map_table = Table(
+            map_table_name,
+            MetaData(naming_convention=naming_convention),
+            *get_default_mathesar_column_list(),
+            schema=schema,
+        )
+        conn.execute(CreateTable(map_table))
+        _add_link_columns(
+            conn,
+            engine,
+            schema,
+            map_table_name,
+            [
+                (referent['column_name'], tables[referent['referent_table']])
+                for referent in referents
+            ],
         )
-        metadata = MetaData(bind=engine, schema=schema, naming_convention=naming_convention)
-        # Throws sqlalchemy.exc.NoReferencedTableError if metadata is not reflected.
-        metadata.reflect()
-        referrer_columns = []
-        for referent in referents:
-            referent_table_oid = referent['referent_table']
-            referent_table = referent_tables[referent_table_oid]
-            col_name = referent['column_name']
-            primary_key_column = get_primary_key_column(referent_table)
-            foreign_keys = {ForeignKey(primary_key_column)}
-            column = MathesarColumn(
-                col_name, primary_key_column.type, foreign_keys=foreign_keys,
+
+
+def _get_primary_key_snapshot(table_oids, connection):
+    sel = text(PRIMARY_KEY_SNAPSHOT_SQL).bindparams(
+        bindparam('table_oids', value=list(set(table_oids)), expanding=True)
+    )
+    return {row.oid: row for row in connection.execute(sel)}
+
+
+def _add_link_columns(connection, engine, schema, table_name, links, unique=False):
+    """
+    Adds a column referencing the primary key of a table, with a foreign key constraint, for each
+    (column name, table snapshot) pair of `links`, all with a single ALTER TABLE statement.
+    Constraints are named following the naming convention, as SQLAlchemy would name them.
+    """
+    subcommands = []
+    for column_name, referent_table in links:
+        # We do not support linking to composite primary keys
+        assert len(referent_table.primary_key_columns) == 1
+        primary_key_column_name, primary_key_type = referent_table.primary_key_columns[0]
+        quoted_column = quote_identifier(column_name, engine)
+        subcommands.append(f'ADD COLUMN {quoted_column} {primary_key_type}')
+        if unique:
+            subcommands.append(
+                f'ADD CONSTRAINT {_format_constraint_name("uq", table_name, column_name, engine)}'
+                f' UNIQUE ({quoted_column})'
             )
-            referrer_columns.append(column)
-        create_mathesar_table(map_table_name, schema, referrer_columns, engine, metadata)
+        subcommands.append(
+            f'ADD CONSTRAINT {_format_constraint_name("fk", table_name, column_name, engine)}'
+            f' FOREIGN KEY ({quoted_column})'
+            f' REFERENCES {quote_identifier(referent_table.schema_name, engine)}'
+            f'.{quote_identifier(referent_table.table_name, engine)}'
+            f' ({quote_identifier(primary_key_column_name, engine)})'
+        )
+    quoted_table = f'{quote_identifier(schema, engine)}.{quote_identifier(table_name, engine)}'
+    execute_ddl(connection, f'ALTER TABLE {quoted_table} {", ".join(subcommands)}')
+
+
+def _format_constraint_name(convention_key, table_name, column_name, engine):
+    name = naming_convention[convention_key] % {
+        'table_name': table_name, 'column_0_name': column_name
+    }
+    # Quoted and, if too long for Postgres, truncated the way SQLAlchemy does it for names
+    # generated by the naming convention.
+    return engine.dialect.identifier_preparer.format_constraint(Constraint(name=conv(name)))
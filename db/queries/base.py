@@ -3,8 +3,8 @@ from sqlalchemy import select
 
 from db.records.operations import select as records_select
 from db.columns.base import MathesarColumn
-from db.columns.operations.select import get_column_name_from_attnum
-from db.tables.operations.select import reflect_table_from_oid
+from db.columns.operations.select import get_map_of_attnum_and_table_oid_to_column_name
+from db.tables.operations.bulk_reflect import reflect_tables_in_bulk
 from db.transforms.operations.apply import apply_transformations
 from db.metadata import get_empty_metadata
 
@@ -173,22 +173,28 @@ class DBQuery:
     @property
     def initial_relation(self):
         metadata = self.metadata
-        base_table = reflect_table_from_oid(
-            self.base_table_oid, self.engine, metadata=metadata
+        table_oids = {self.base_table_oid} | {
+            oid
+            for col in self.initial_columns
+            for edge in _guarantee_jp_path_tuples(col.jp_path)
+            for oid, _ in edge
+        }
+        # All involved tables are reflected at once, into the function-scoped
+        # metadata, so that they are aware of each other.
+        tables = reflect_tables_in_bulk(list(table_oids), self.engine, metadata=metadata)
+        column_names = get_map_of_attnum_and_table_oid_to_column_name(
+            list(table_oids), self.engine, metadata=metadata
         )
+        base_table = tables[self.base_table_oid]
         from_clause = base_table
         # We cache this to avoid copies of the same join path to a given table
         jp_path_alias_map = {(): base_table}
 
         def _get_table(oid):
-            """
-            We use the function-scoped metadata so all involved tables are aware
-            of each other.
-            """
-            return reflect_table_from_oid(oid, self.engine, metadata=metadata, keep_existing=True)
+            return tables[oid]
 
         def _get_column_name(oid, attnum):
-            return get_column_name_from_attnum(oid, attnum, self.engine, metadata=metadata)
+            return column_names[(attnum, oid)]
 
         def _process_initial_column(col):
             nonlocal from_clause
@@ -1,17 +1,25 @@
+from collections import OrderedDict
+from decimal import Decimal
 from enum import Enum
 import json
 import logging
+import math
 from sqlalchemy import select, func, and_, case, literal, cast, TEXT, extract
+from sqlalchemy.engine import make_url
 
 from db.functions.operations.deserialize import get_db_function_subclass_by_id
 from db.records import exceptions as records_exceptions
 from db.records.operations import calculation
 from db.records.utils import create_col_objects
+from db.utils import execute_pg_query
 
 logger = logging.getLogger(__name__)
 
 MATHESAR_GROUP_METADATA = '__mathesar_group_metadata'
 
+# Maximum number of sampled boundary sets kept in memory at once.
+SAMPLED_BOUNDS_CACHE_SIZE = 256
+
 
 class GroupMode(Enum):
     DISTINCT = 'distinct'
@@ -35,6 +43,10 @@ class GroupMetadataField(Enum):
     EQ_VALUE = 'eq_value'
 
 
+# Modes whose boundaries can be approximated from a sample of the relation.
+SAMPLEABLE_GROUP_MODES = {GroupMode.PERCENTILE.value, GroupMode.MAGNITUDE.value}
+
+
 class GroupBy:
     def __init__(
             self,
@@ -48,6 +60,7 @@ class GroupBy:
             global_max=None,
             prefix_length=None,
             extract_field=None,
+            sample_size=None,
     ):
         self._columns = tuple(columns) if type(columns) != str else tuple([columns])
         self._mode = mode
@@ -64,6 +77,7 @@ class GroupBy:
         self._global_max = global_max
         self._prefix_length = prefix_length
         self._extract_field = extract_field
+        self._sample_size = sample_size
         self._ranged = bool(mode != GroupMode.DISTINCT.value)
         self.validate()
 
@@ -110,6 +124,10 @@ class GroupBy:
     def extract_field(self):
         return self._extract_field
 
+    @property
+    def sample_size(self):
+        return self._sample_size
+
     @property
     def ranged(self):
         return self._ranged
@@ -180,6 +198,19 @@ class GroupBy:
                 f'{GroupMode.EXTRACT.value} requires extract_field,'
                 ' and only works for single columns.'
             )
+        elif (
+                self.sample_size is not None
+                and (
+                    self.mode not in SAMPLEABLE_GROUP_MODES
+                    or not isinstance(self.sample_size, int)
+                    or isinstance(self.sample_size, bool)
+                    or self.sample_size < 1
+                )
+        ):
+            raise records_exceptions.BadGroupFormat(
+                'sample_size must be a positive integer, and only works for the'
+                f' {GroupMode.PERCENTILE.value} and {GroupMode.MAGNITUDE.value} modes.'
+            )
 
         for col in self.columns:
             if type(col) != str:
@@ -226,7 +257,13 @@ def get_group_augmented_records_pg_query(table, group_by):
     """
     grouping_columns = group_by.get_validated_group_by_columns(table)
 
-    if group_by.mode == GroupMode.PERCENTILE.value:
+    if group_by.sample_size is not None and group_by.bound_tuples is not None:
+        # Boundaries were precomputed from a sample (see get_sampled_group_by),
+        # so we only need to sort rows into the resulting ranges.
+        pg_query = _get_custom_endpoints_range_group_select(
+            table, grouping_columns, group_by.bound_tuples, open_ended=True
+        )
+    elif group_by.mode == GroupMode.PERCENTILE.value:
         pg_query = _get_percentile_range_group_select(
             table, grouping_columns, group_by.num_groups
         )
@@ -394,11 +431,21 @@ def _get_tens_powers_range_group_select(table, grouping_columns):
     )
 
 
-def _get_custom_endpoints_range_group_select(table, columns, bound_tuples_list):
+def _get_custom_endpoints_range_group_select(
+        table, columns, bound_tuples_list, open_ended=False
+):
+    """
+    When open_ended is True, the first range has no lower bound, and the last
+    range has no upper bound and catches all remaining rows (including those
+    with NULLs in the grouping columns). This is used when the bounds were
+    derived from a sample, and so might not cover every row of the relation.
+    """
     column_names = [col.name for col in columns]
     RANGE_ID = 'range_id'
     GEQ_BOUND = 'geq_bound'
     LT_BOUND = 'lt_bound'
+    last_range_ix = len(bound_tuples_list) - 2
+    assert not open_ended or last_range_ix > 0
 
     def _get_inner_json_object(bound_tuple):
         key_value_tuples = (
@@ -410,32 +457,42 @@ def _get_custom_endpoints_range_group_select(table, columns, bound_tuples_list):
         ]
         return func.json_build_object(*key_value_list)
 
-    def _build_range_cases(result_expr):
-        return [
-            (
-                and_(
-                    func.ROW(*columns) >= func.ROW(*bound_tuples_list[i]),
-                    func.ROW(*columns) < func.ROW(*bound_tuples_list[i + 1])
-                ),
-                result_expr(i)
-            )
-            for i in range(len(bound_tuples_list) - 1)
-        ]
+    def _get_range_condition(i):
+        lt_condition = func.ROW(*columns) < func.ROW(*bound_tuples_list[i + 1])
+        if open_ended and i == 0:
+            return lt_condition
+        return and_(
+            func.ROW(*columns) >= func.ROW(*bound_tuples_list[i]),
+            lt_condition
+        )
+
+    def _build_range_case(result_expr):
+        if open_ended:
+            range_ixs = range(last_range_ix)
+            else_expr = result_expr(last_range_ix)
+        else:
+            range_ixs = range(last_range_ix + 1)
+            else_expr = None
+        return case(
+            *[(_get_range_condition(i), result_expr(i)) for i in range_ixs],
+            else_=else_expr
+        )
+
+    def _get_geq_bound_expr(i):
+        if open_ended and i == 0:
+            return None
+        return _get_inner_json_object(bound_tuples_list[i])
+
+    def _get_lt_bound_expr(i):
+        if open_ended and i == last_range_ix:
+            return None
+        return _get_inner_json_object(bound_tuples_list[i + 1])
+
     ranges_cte = select(
-        *columns,
-        case(*_build_range_cases(lambda x: x + 1), else_=None).label(RANGE_ID),
-        case(
-            *_build_range_cases(
-                lambda x: _get_inner_json_object(bound_tuples_list[x])
-            ),
-            else_=None
-        ).label(GEQ_BOUND),
-        case(
-            *_build_range_cases(
-                lambda x: _get_inner_json_object(bound_tuples_list[x + 1])
-            ),
-            else_=None
-        ).label(LT_BOUND),
+        table,
+        _build_range_case(lambda x: x + 1).label(RANGE_ID),
+        _build_range_case(_get_geq_bound_expr).label(GEQ_BOUND),
+        _build_range_case(_get_lt_bound_expr).label(LT_BOUND),
     ).cte()
 
     ranges_aggregation_cols = [
@@ -460,6 +517,133 @@ def _get_custom_endpoints_range_group_select(table, columns, bound_tuples_list):
     ).where(ranges_cte.columns[RANGE_ID] != None)  # noqa
 
 
+def get_sampled_group_by(relation, group_by, engine):
+    """
+    Returns a copy of the given GroupBy whose bound tuples are computed from a
+    random sample of sample_size rows of the relation, so that grouping the
+    relation only needs cheap range comparisons instead of window functions
+    over the whole relation. Returns the given GroupBy unchanged when it isn't
+    sampled, or when the sample is too small to give at least two ranges (in
+    which case grouping falls back to the exact computation).
+
+    Boundaries are cached per relation (including any filtering applied to
+    it), grouping columns, mode, and num_groups.
+
+    Args:
+        relation:   SQLAlchemy selectable, after any filtering
+        group_by:   GroupBy object giving args for grouping
+        engine:     SQLAlchemy engine object
+    """
+    if group_by.sample_size is None or group_by.bound_tuples is not None:
+        return group_by
+    compiled_relation = select(relation).compile(dialect=engine.dialect)
+    cache_key = (
+        str(engine.url),
+        str(compiled_relation),
+        repr(sorted(compiled_relation.params.items())),
+        group_by.columns,
+        group_by.mode,
+        group_by.num_groups,
+        group_by.sample_size,
+    )
+    bound_tuples = _get_from_sampled_bounds_cache(cache_key)
+    if bound_tuples is None:
+        bound_tuples = _get_sampled_bound_tuples(relation, group_by, engine)
+        _set_on_sampled_bounds_cache(cache_key, bound_tuples)
+    if len(bound_tuples) < 3:
+        return group_by
+    return GroupBy(
+        columns=group_by.columns,
+        mode=group_by.mode,
+        num_groups=group_by.num_groups,
+        bound_tuples=bound_tuples,
+        sample_size=group_by.sample_size,
+    )
+
+
+def clear_sampled_bounds_cache(db_name=None):
+    """
+    Forgets the sampled boundaries of the database with the given name, or of every database if no
+    name is given.
+    """
+    if db_name is None:
+        _sampled_bounds_cache.clear()
+        return
+    for key in list(_sampled_bounds_cache):
+        # Keys start with the engine's URL.
+        if make_url(key[0]).database == db_name:
+            _sampled_bounds_cache.pop(key, None)
+
+
+def _get_from_sampled_bounds_cache(key):
+    bound_tuples = _sampled_bounds_cache.get(key)
+    if bound_tuples is not None:
+        _sampled_bounds_cache.move_to_end(key)
+    return bound_tuples
+
+
+def _set_on_sampled_bounds_cache(key, bound_tuples):
+    _sampled_bounds_cache[key] = bound_tuples
+    if len(_sampled_bounds_cache) > SAMPLED_BOUNDS_CACHE_SIZE:
+        _sampled_bounds_cache.popitem(last=False)
+
+
+def _get_sampled_bound_tuples(relation, group_by, engine):
+    """
+    Fetches a random sample of the grouping columns' values (ignoring rows
+    with NULLs), sorted by Postgres, and derives ascending bound tuples from
+    it.
+    """
+    columns = group_by.get_validated_group_by_columns(relation)
+    # ORDER BY random() with a LIMIT is a single pass with a bounded top-N
+    # sort, so this works for any relation (unlike TABLESAMPLE, which only
+    # works on base tables).
+    sample = select(*columns).where(
+        and_(*[col.isnot(None) for col in columns])
+    ).order_by(func.random()).limit(group_by.sample_size).subquery()
+    sorted_sample = select(sample).order_by(*sample.columns)
+    sample_rows = [tuple(row) for row in execute_pg_query(engine, sorted_sample)]
+    if not sample_rows:
+        return []
+    if group_by.mode == GroupMode.PERCENTILE.value:
+        bound_tuples = _get_percentile_bound_tuples(sample_rows, group_by.num_groups)
+    else:
+        bound_tuples = _get_tens_powers_bound_tuples(sample_rows[0][0], sample_rows[-1][0])
+    return bound_tuples
+
+
+def _get_percentile_bound_tuples(sorted_rows, num_groups):
+    num_rows = len(sorted_rows)
+    bound_tuples = []
+    for i in range(num_groups):
+        bound_tuple = sorted_rows[i * num_rows // num_groups]
+        if not bound_tuples or bound_tuples[-1] != bound_tuple:
+            bound_tuples.append(bound_tuple)
+    if bound_tuples[-1] != sorted_rows[-1]:
+        bound_tuples.append(sorted_rows[-1])
+    return bound_tuples
+
+
+def _get_tens_powers_bound_tuples(min_value, max_value):
+    """
+    Mirrors the computation in _get_tens_powers_range_group_select, so that
+    bounds are multiples of the power of ten just below the magnitude of the
+    difference between the extrema.
+    """
+    min_value = Decimal(str(min_value))
+    max_value = Decimal(str(max_value))
+    if max_value == min_value:
+        return [(min_value,)]
+    power = math.floor(math.log10(max_value - min_value)) - 1
+    step = Decimal(1).scaleb(power)
+    first_ix = math.floor(min_value / step)
+    last_ix = math.floor(max_value / step) + 1
+    return [
+        ((Decimal(ix) * step).normalize(),)
+        for ix in range(first_ix, last_ix + 1)
+    ]
+
+
 def _get_percentile_range_group_select(table, columns, num_groups):
     column_names = [col.name for col in columns]
     # cume_dist is a PostgreSQL function that calculates the cumulative
@@ -594,3 +778,6 @@ def extract_group_metadata(
     )
 
     return list(record_tup), reduced_groups if reduced_groups != [None] else None
+
+
+_sampled_bounds_cache = OrderedDict()
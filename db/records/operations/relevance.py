@@ -1,4 +1,6 @@
-from sqlalchemy import case, select
+from enum import Enum
+
+from sqlalchemy import case, select, func, literal, or_
 from sqlalchemy_filters import apply_sort
 from db.types import categories
 from db.types.operations.convert import get_db_type_enum_from_class
@@ -10,14 +12,35 @@ WEIGHT_1 = 1
 WEIGHT_0 = 0
 SCORE_COL = '__mathesar_relevance_score'
 
+# Text search configuration used both when searching and when creating full
+# text search indexes; they have to match for the index to be usable.
+FULL_TEXT_SEARCH_CONFIG = 'simple'
+
+
+class SearchBackend(Enum):
+    # Scores rows via ILIKE patterns; always available, but can't use indexes.
+    ILIKE = 'ilike'
+    # Scores rows via pg_trgm word similarity; can use GIN/GiST trigram indexes.
+    TRIGRAM = 'trigram'
+    # Scores rows via tsvector ranking; can use GIN to_tsvector indexes.
+    FULL_TEXT = 'full_text'
 
-def get_rank_and_filter_rows_query(relation, parameters_dict, limit=10):
+
+def get_rank_and_filter_rows_query(
+        relation, parameters_dict, limit=10, backend=SearchBackend.ILIKE.value
+):
     """
     Given a relation, we use a score-assignment algorithm to rank rows of
     the relation by the strength of their match with the various
     parameters given in parameters_dict.
+
+    The backend determines how string-like columns are matched and scored.
+    Non-ILIKE backends also filter rows with index-friendly match conditions,
+    rather than only by their score.
     """
-    rank_cte = _get_scored_selectable(relation, parameters_dict)
+    if backend is None:
+        backend = SearchBackend.ILIKE.value
+    rank_cte = _get_scored_selectable(relation, parameters_dict, backend)
     filtered_ordered_cte = apply_sort(
         select(rank_cte).where(rank_cte.columns[SCORE_COL] > 0),
         {'field': SCORE_COL, 'direction': 'desc'}
@@ -27,29 +50,80 @@ def get_rank_and_filter_rows_query(relation, parameters_dict, limit=10):
     ).limit(limit)
 
 
-def _get_scored_selectable(relation, parameters_dict):
-    return select(
+def _get_scored_selectable(relation, parameters_dict, backend=SearchBackend.ILIKE.value):
+    scored_selectable = select(
         relation,
         sum(
             [
-                _get_col_score_expr(relation.columns[col_name], val)
+                _get_col_score_expr(relation.columns[col_name], val, backend)
                 for col_name, val in parameters_dict.items()
             ]
         ).label(SCORE_COL)
-    ).cte()
+    )
+    if backend != SearchBackend.ILIKE.value:
+        scored_selectable = scored_selectable.where(
+            or_(
+                *[
+                    _get_col_match_expr(relation.columns[col_name], val, backend)
+                    for col_name, val in parameters_dict.items()
+                ]
+            )
+        )
+    return scored_selectable.cte()
 
 
-def _get_col_score_expr(col, param_val):
+def is_string_like_column(col):
     col_type = get_db_type_enum_from_class(col.type.__class__)
+    return col_type in categories.STRING_LIKE_TYPES
+
 
-    if col_type in categories.STRING_LIKE_TYPES:
+def _get_col_score_expr(col, param_val, backend=SearchBackend.ILIKE.value):
+    if is_string_like_column(col):
+        if backend == SearchBackend.TRIGRAM.value:
+            fallback_score_expr = func.word_similarity(param_val, col)
+        elif backend == SearchBackend.FULL_TEXT.value:
+            fallback_score_expr = func.ts_rank(
+                get_tsvector_expr(col), _get_tsquery_expr(param_val)
+            )
+        else:
+            fallback_score_expr = WEIGHT_0
         score_expr = case(
             (col.ilike(param_val), WEIGHT_4),
             (col.ilike(param_val + '%'), WEIGHT_3),
             (col.ilike('%' + param_val + '%'), WEIGHT_2),
-            else_=WEIGHT_0
+            else_=fallback_score_expr
         )
     else:
         score_expr = case((col == param_val, WEIGHT_4), else_=WEIGHT_0)
 
     return score_expr
+
+
+def _get_col_match_expr(col, param_val, backend):
+    """
+    Returns a boolean expression that's true for rows where the column
+    matches the search parameter. It's written so that Postgres can answer it
+    via the search index of the given backend, if one exists.
+    """
+    if not is_string_like_column(col):
+        return col == param_val
+    elif backend == SearchBackend.TRIGRAM.value:
+        # Trigram indexes support ILIKE, and `<%` is true when the parameter
+        # is similar to some word in the column.
+        return or_(
+            col.ilike('%' + param_val + '%'),
+            literal(param_val).op('<%')(col)
+        )
+    elif backend == SearchBackend.FULL_TEXT.value:
+        # Only whole words match, since an ILIKE alternative couldn't use the
+        # index.
+        return get_tsvector_expr(col).op('@@')(_get_tsquery_expr(param_val))
+    return col.ilike('%' + param_val + '%')
+
+
+def get_tsvector_expr(col):
+    return func.to_tsvector(FULL_TEXT_SEARCH_CONFIG, col)
+
+
+def _get_tsquery_expr(param_val):
+    return func.plainto_tsquery(FULL_TEXT_SEARCH_CONFIG, param_val)
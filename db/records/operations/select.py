@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.sql.functions import count
 
 from db.columns.base import MathesarColumn
+from db.records.operations.group import get_sampled_group_by
 from db.records.operations.sort import get_default_order_by
 from db.tables.utils import get_primary_key_column
 from db.types.operations.cast import get_column_cast_expression
@@ -9,6 +10,8 @@ from db.types.operations.convert import get_db_type_enum_from_id
 from db.utils import execute_pg_query
 from db.transforms.operations.apply import apply_transformations_deprecated
 
+COUNT_COLUMN_NAME = "_count"
+
 
 def get_record(table, engine, id_value):
     primary_key_column = get_primary_key_column(table)
@@ -48,6 +51,7 @@ def get_records(
     group_by=None,
     search=None,
     duplicate_only=None,
+    search_backend=None,
 ):
     """
     Returns annotated records from a table.
@@ -68,11 +72,22 @@ def get_records(
         group_by:        group.GroupBy object
         duplicate_only:  list of column names; only rows that have duplicates across those rows
                          will be returned
+        search_backend:  relevance.SearchBackend value used to match and score search; defaults
+                         to the ILIKE scorer.
     """
     if order_by is None:
         order_by = []
     if search is None:
         search = []
+    if group_by is not None and group_by.sample_size is not None:
+        # Sampled group boundaries must be computed over the same rows that
+        # will be grouped, i.e. after filtering.
+        filtered_relation = apply_transformations_deprecated(
+            table=table,
+            filter=filter,
+            duplicate_only=duplicate_only,
+        )
+        group_by = get_sampled_group_by(filtered_relation, group_by, engine)
     relation = apply_transformations_deprecated(
         table=table,
         limit=limit,
@@ -82,18 +97,26 @@ def get_records(
         group_by=group_by,
         search=search,
         duplicate_only=duplicate_only,
+        search_backend=search_backend,
     )
     return execute_pg_query(engine, relation)
 
 
-def get_count(table, engine, filter=None, search=None):
+def get_count(table, engine, filter=None, search=None, search_backend=None):
+    relation = get_count_relation(table, filter=filter, search=search, search_backend=search_backend)
+    return execute_count_relation(engine, relation)
+
+
+def get_count_relation(table, filter=None, search=None, search_backend=None):
+    """
+    Builds the query counting the records of a table or relation, without executing it.
+    """
     if search is None:
         search = []
-    col_name = "_count"
     columns_to_select = [
-        count(1).label(col_name)
+        count(1).label(COUNT_COLUMN_NAME)
     ]
-    relation = apply_transformations_deprecated(
+    return apply_transformations_deprecated(
         table=table,
         limit=None,
         offset=None,
@@ -102,8 +125,12 @@ def get_count(table, engine, filter=None, search=None):
         filter=filter,
         columns_to_select=columns_to_select,
         search=search,
+        search_backend=search_backend,
     )
-    return execute_pg_query(engine, relation)[0][col_name]
+
+
+def execute_count_relation(engine, relation):
+    return execute_pg_query(engine, relation)[0][COUNT_COLUMN_NAME]
 
 
 def get_column_cast_records(engine, table, column_definitions, num_records=20):
@@ -1,45 +1,109 @@
 from collections import namedtuple
-from sqlalchemy import select
+from enum import Enum
+
+from sqlalchemy import Table, UniqueConstraint, select
+from sqlalchemy.sql.expression import Alias
 from db.columns import utils as col_utils
 from db.records.exceptions import BadSortFormat, SortFieldNotFound
 
 
+class OrderingStrategy(Enum):
+    # Rows are ordered by the primary keys of the underlying tables.
+    PRIMARY_KEY = 'primary_key'
+    # Rows are ordered by non-nullable unique constraint or unique index columns of the
+    # underlying tables, which is as cheap as the primary key, when there's an index.
+    UNIQUE_COLUMNS = 'unique_columns'
+    # Rows are ordered by every column, which is inherently inefficient.
+    ALL_COLUMNS = 'all_columns'
+
+
 def get_default_order_by(relation, order_by=None):
     if order_by is None:
         order_by = []
-    # appending primary key sort guarantees determinism
-    order_by = _append_primary_key_sort(relation, order_by)
-    if not order_by:
-        # This is a last-ditch attempt to guarantee determinism
-        order_by = _build_order_by_all_columns_clause(relation)
-    return order_by
+    strategy, columns = get_default_ordering(relation)
+    if strategy == OrderingStrategy.ALL_COLUMNS.value and order_by:
+        # Ordering by every column is too expensive to append to an explicit ordering.
+        return order_by
+    # appending a sort by unique columns guarantees determinism
+    return order_by + [{'field': col, 'direction': 'asc'} for col in columns]
 
 
-def _append_primary_key_sort(relation, order_by):
+def get_default_ordering(relation):
+    """
+    Returns the OrderingStrategy value that guarantees a deterministic ordering of the relation's
+    rows, and the relation's columns to sort by for it.
+
+    The relation's columns are traced back to the tables they come from. If each of those tables
+    has its primary key, or else a unique set of non-nullable columns, among the relation's
+    columns, sorting by those is enough. Aliased tables are ignored, since in our queries those
+    are tables joined onto a base table via a foreign key, which doesn't repeat base rows.
     """
-    Given an order by clause, we can guarantee a deterministic ordering
-    overall by appending a final ordering by primary key if one exists.
+    table_columns_map = _get_map_of_table_column_to_relation_column(relation)
+    tables = {table_column.table for table_column in table_columns_map}
+    strategy = OrderingStrategy.PRIMARY_KEY.value
+    ordering_columns = []
+    for table in sorted(tables, key=lambda table: table.fullname):
+        key_columns = _get_primary_key_columns(table)
+        if not key_columns or not all(col in table_columns_map for col in key_columns):
+            key_columns = _get_unique_non_nullable_columns(table, table_columns_map)
+            strategy = OrderingStrategy.UNIQUE_COLUMNS.value
+        if not key_columns:
+            return OrderingStrategy.ALL_COLUMNS.value, list(relation.columns)
+        ordering_columns += [table_columns_map[col] for col in key_columns]
+    if not ordering_columns:
+        return OrderingStrategy.ALL_COLUMNS.value, list(relation.columns)
+    return strategy, ordering_columns
+
+
+def _get_map_of_table_column_to_relation_column(relation):
     """
-    pk_cols = col_utils.get_primary_key_column_collection_from_relation(relation)
-    if pk_cols is not None:
-        order_by += [
-            {'field': col, 'direction': 'asc'}
-            for col
-            in set(pk_cols).intersection(relation.columns)
+    Maps the table columns that the relation's columns are selected from to the relation's
+    columns. Computed columns and columns of aliased tables aren't traced.
+    """
+    table_columns_map = {}
+    for col in relation.columns:
+        if any(isinstance(getattr(proxy, 'table', None), Alias) for proxy in col.proxy_set):
+            continue
+        base_columns = [
+            base_col for base_col in col.base_columns
+            if isinstance(getattr(base_col, 'table', None), Table)
         ]
-    return order_by
+        # Only plain columns (and their labels) can be traced; an expression using many columns
+        # can't tell us anything about uniqueness.
+        if len(base_columns) == 1:
+            table_columns_map.setdefault(base_columns[0], col)
+    return table_columns_map
+
 
+def _get_primary_key_columns(table):
+    return list(table.primary_key.columns)
 
-def _build_order_by_all_columns_clause(relation):
+
+def _get_unique_non_nullable_columns(table, table_columns_map):
     """
-    To be used when we have failed to find any other ordering criteria,
-    since ordering by all columns is inherently inefficient.
+    Returns the smallest set of the table's columns that is unique per a unique constraint or a
+    non-partial unique index, and is available in the relation. Only non-nullable columns are
+    considered, since a unique column can contain any number of nulls.
     """
-    return [
-        {'field': col, 'direction': 'asc'}
-        for col
-        in relation.columns
+    unique_column_sets = [
+        list(constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ] + [
+        list(index.columns)
+        for index in table.indexes
+        if index.unique
+        and index.columns
+        and len(index.columns) == len(index.expressions)
+        and not index.dialect_options['postgresql'].get('where')
+    ]
+    usable_column_sets = [
+        column_set for column_set in unique_column_sets
+        if all(col in table_columns_map and not col.nullable for col in column_set)
     ]
+    if not usable_column_sets:
+        return []
+    return min(usable_column_sets, key=len)
 
 
 def apply_relation_sorting(relation, sort_spec):
@@ -0,0 +1,322 @@
+"""
+Builds SQLAlchemy Table objects for many tables at once. SQLAlchemy's autoload runs several
+catalog queries for every table it reflects (and for every table those reference); here the
+columns, constraints and indexes of the requested tables, and of the tables they reference, are
+fetched with a single query and the Table objects are built the way autoload would build them.
+
+Column types are resolved with private methods of SQLAlchemy's Postgres dialect, as autoload does,
+since no public API resolves the type of a single column. They're those of the SQLAlchemy version
+pinned in requirements.txt; if they don't accept the arguments used here, as in other versions,
+tables are reflected one by one with autoload instead.
+"""
+import inspect
+import re
+
+from sqlalchemy import (
+    CheckConstraint, Column, Computed, DefaultClause, ForeignKeyConstraint, Identity, Index,
+    PrimaryKeyConstraint, Table, UniqueConstraint, bindparam, text,
+)
+from sqlalchemy.sql import operators
+
+from db.tables.operations.select import reflect_tables_from_oids
+
+# The tables referenced through foreign keys are fetched too (recursively), since the Table
+# objects of the requested tables need them in the metadata to resolve their foreign keys.
+BULK_REFLECTION_SQL = """
+WITH RECURSIVE related_tables(oid) AS (
+  SELECT c.oid FROM pg_catalog.pg_class c WHERE c.oid IN :table_oids
+  UNION
+  SELECT con.confrelid
+  FROM pg_catalog.pg_constraint con JOIN related_tables r ON r.oid = con.conrelid
+  WHERE con.contype = 'f'
+)
+SELECT
+  c.oid,
+  n.nspname AS schema_name,
+  c.relname AS table_name,
+  obj_description(c.oid, 'pg_class') AS comment,
+  (
+    SELECT coalesce(
+      json_agg(
+        json_build_array(
+          a.attnum,
+          a.attname,
+          format_type(a.atttypid, a.atttypmod),
+          CASE WHEN a.atthasdef THEN pg_get_expr(d.adbin, d.adrelid) END,
+          a.attnotnull,
+          col_description(a.attrelid, a.attnum),
+          a.attgenerated,
+          (
+            SELECT json_build_object(
+              'always', a.attidentity = 'a',
+              'start', s.seqstart,
+              'increment', s.seqincrement,
+              'minvalue', s.seqmin,
+              'maxvalue', s.seqmax,
+              'cache', s.seqcache,
+              'cycle', s.seqcycle
+            )
+            FROM pg_catalog.pg_sequence s
+            WHERE a.attidentity != ''
+              AND s.seqrelid = pg_get_serial_sequence(
+                a.attrelid::regclass::text, a.attname
+              )::regclass::oid
+          )
+        )
+        ORDER BY a.attnum
+      ),
+      '[]'
+    )
+    FROM pg_catalog.pg_attribute a
+      LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+  ) AS columns,
+  (
+    SELECT coalesce(
+      json_agg(
+        json_build_array(
+          con.conname,
+          con.contype,
+          con.conkey,
+          con.confrelid,
+          con.confkey,
+          con.confupdtype,
+          con.confdeltype,
+          con.confmatchtype,
+          con.condeferrable,
+          con.condeferred,
+          pg_get_constraintdef(con.oid)
+        )
+        ORDER BY con.conname
+      ),
+      '[]'
+    )
+    FROM pg_catalog.pg_constraint con
+    WHERE con.conrelid = c.oid AND con.contype IN ('p', 'u', 'f', 'c')
+  ) AS constraints,
+  (
+    SELECT coalesce(
+      json_agg(
+        json_build_array(
+          i.relname,
+          ix.indisunique,
+          ix.indkey::int2[],
+          ix.indnkeyatts,
+          ix.indoption::int2[],
+          i.reloptions,
+          am.amname,
+          pg_get_expr(ix.indpred, ix.indrelid)
+        )
+        ORDER BY i.relname
+      ),
+      '[]'
+    )
+    FROM pg_catalog.pg_index ix
+      JOIN pg_catalog.pg_class i ON i.oid = ix.indexrelid
+      LEFT JOIN pg_catalog.pg_am am ON am.oid = i.relam
+    WHERE ix.indrelid = c.oid
+      AND NOT ix.indisprimary
+      AND ix.indexprs IS NULL
+      AND NOT EXISTS (
+        SELECT 1 FROM pg_catalog.pg_constraint con
+        WHERE con.conindid = ix.indexrelid
+          AND con.conrelid = ix.indrelid
+          AND con.contype IN ('p', 'u', 'x')
+      )
+  ) AS indexes
+FROM related_tables r
+  JOIN pg_catalog.pg_class c ON c.oid = r.oid
+  JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+"""
+
+FK_ACTIONS = {'r': 'RESTRICT', 'c': 'CASCADE', 'n': 'SET NULL', 'd': 'SET DEFAULT'}
+
+# Flags of pg_index.indoption
+INDOPTION_DESC = 0x01
+INDOPTION_NULLS_FIRST = 0x02
+
+
+def reflect_tables_in_bulk(oids, engine, metadata, connection_to_use=None, keep_existing=False):
+    """
+    Returns a dict of the given table oids to their SQLAlchemy Table objects, which are added to
+    `metadata` along with the tables they reference. Like reflect_table, tables already in the
+    metadata are extended, unless keep_existing is set, in which case they're left as they are.
+    Oids of tables that don't exist are left out.
+    """
+    if len(oids) == 0:
+        return {}
+    if not has_supported_dialect_internals(engine.dialect):
+        return reflect_tables_from_oids(
+            oids, engine, metadata, connection_to_use=connection_to_use, keep_existing=keep_existing
+        )
+    if connection_to_use is None:
+        with engine.begin() as conn:
+            return _reflect_tables_in_bulk(oids, engine, metadata, conn, keep_existing)
+    return _reflect_tables_in_bulk(oids, engine, metadata, connection_to_use, keep_existing)
+
+
+def has_supported_dialect_internals(dialect):
+    """
+    Returns whether the dialect's private methods used for resolving column types accept the
+    arguments they're called with here.
+    """
+    try:
+        inspect.signature(dialect._load_domains).bind(None)
+        inspect.signature(dialect._load_enums).bind(None, schema='*')
+        inspect.signature(dialect._get_column_info).bind(*[None] * 10)
+    except (AttributeError, TypeError):
+        return False
+    return True
+
+
+def _reflect_tables_in_bulk(oids, engine, metadata, connection, keep_existing):
+    sel = text(BULK_REFLECTION_SQL).bindparams(
+        bindparam('table_oids', value=list(oids), expanding=True)
+    )
+    rows = connection.execute(sel).fetchall()
+    dialect = engine.dialect
+    # The same lookups SQLAlchemy's Postgres dialect does for each table it reflects, to resolve
+    # domain and enum types.
+    domains = dialect._load_domains(connection)
+    enums = dict(
+        ((enum["name"],), enum) if enum["visible"] else ((enum["schema"], enum["name"]), enum)
+        for enum in dialect._load_enums(connection, schema="*")
+    )
+    column_names = {
+        (row.oid, attnum): name
+        for row in rows
+        for attnum, name, *_ in row.columns
+    }
+    table_names = {row.oid: (row.schema_name, row.table_name) for row in rows}
+    tables = {}
+    for row in rows:
+        existing_table = metadata.tables.get(f'{row.schema_name}.{row.table_name}')
+        if keep_existing and existing_table is not None:
+            tables[row.oid] = existing_table
+            continue
+        if existing_table is not None:
+            _remove_constraints_and_indexes(existing_table)
+        columns = [
+            _build_column(
+                dialect._get_column_info(
+                    name, format_type, default, notnull, domains, enums, row.schema_name, comment,
+                    generated, identity,
+                )
+            )
+            for _, name, format_type, default, notnull, comment, generated, identity in row.columns
+        ]
+        constraints = [
+            _build_constraint(constraint, row.oid, column_names, table_names)
+            for constraint in row.constraints
+        ]
+        table = Table(
+            row.table_name,
+            metadata,
+            *columns,
+            *[constraint for constraint in constraints if constraint is not None],
+            schema=row.schema_name,
+            comment=row.comment,
+            extend_existing=True,
+        )
+        for index in row.indexes:
+            _build_index(index, table, row.oid, column_names)
+        tables[row.oid] = table
+    return {oid: tables[oid] for oid in oids if oid in tables}
+
+
+def _remove_constraints_and_indexes(table):
+    """
+    Foreign keys and the primary key are replaced along with the columns when a table is
+    extended, but unique and check constraints and indexes would be added next to the old ones,
+    piling up in long lived metadata.
+    """
+    for constraint in list(table.constraints):
+        if isinstance(constraint, (UniqueConstraint, CheckConstraint)):
+            table.constraints.remove(constraint)
+    table.indexes.clear()
+
+
+def _build_column(column_info):
+    """
+    Builds a column from the output of the dialect's _get_column_info, the way autoload does.
+    """
+    column_args = []
+    if column_info.get('default') is not None:
+        column_args.append(DefaultClause(text(column_info['default']), _reflected=True))
+    if 'computed' in column_info:
+        column_args.append(Computed(**column_info['computed']))
+    if 'identity' in column_info:
+        column_args.append(Identity(**column_info['identity']))
+    return Column(
+        column_info['name'],
+        column_info['type'],
+        *column_args,
+        nullable=column_info['nullable'],
+        autoincrement=column_info['autoincrement'],
+        comment=column_info['comment'],
+    )
+
+
+def _build_constraint(constraint, table_oid, column_names, table_names):
+    (
+        name, type_, attnums, referent_table_oid, referent_attnums, on_update, on_delete,
+        match_type, deferrable, deferred, definition,
+    ) = constraint
+    columns = [column_names[(table_oid, attnum)] for attnum in attnums]
+    if type_ == 'p':
+        return PrimaryKeyConstraint(*columns, name=name)
+    elif type_ == 'u':
+        return UniqueConstraint(*columns, name=name)
+    elif type_ == 'f':
+        referent_schema_name, referent_table_name = table_names[referent_table_oid]
+        refspec = [
+            '.'.join(
+                [referent_schema_name, referent_table_name, column_names[(referent_table_oid, attnum)]]
+            )
+            for attnum in referent_attnums
+        ]
+        options = {}
+        if on_update in FK_ACTIONS:
+            options['onupdate'] = FK_ACTIONS[on_update]
+        if on_delete in FK_ACTIONS:
+            options['ondelete'] = FK_ACTIONS[on_delete]
+        if match_type == 'f':
+            options['match'] = 'FULL'
+        if deferrable:
+            options['deferrable'] = True
+        if deferred:
+            options['initially'] = 'DEFERRED'
+        return ForeignKeyConstraint(columns, refspec, name=name, link_to_name=True, **options)
+    elif type_ == 'c':
+        match = re.match(r"^CHECK *\((.+)\)( NOT VALID)?$", definition, flags=re.DOTALL)
+        if match is None:
+            return None
+        sqltext = re.sub(r"^[\s\n]*\((.+)\)[\s\n]*$", r"\1", match.group(1), flags=re.DOTALL)
+        return CheckConstraint(sqltext, name=name)
+
+
+def _build_index(index, table, table_oid, column_names):
+    (
+        name, unique, attnums, key_attnum_count, column_options, storage_options, access_method,
+        predicate,
+    ) = index
+    # Included (non-key) columns are left out, as autoload does.
+    attnums = attnums[:key_attnum_count]
+    expressions = []
+    for attnum, flags in zip(attnums, column_options):
+        expression = table.c[column_names[(table_oid, attnum)]]
+        if flags & INDOPTION_DESC:
+            expression = operators.desc_op(expression)
+            if not flags & INDOPTION_NULLS_FIRST:
+                expression = operators.nulls_last_op(expression)
+        elif flags & INDOPTION_NULLS_FIRST:
+            expression = operators.nulls_first_op(expression)
+        expressions.append(expression)
+    dialect_options = {}
+    if storage_options:
+        dialect_options['postgresql_with'] = dict(option.split('=') for option in storage_options)
+    if access_method and access_method != 'btree':
+        dialect_options['postgresql_using'] = access_method
+    if predicate:
+        dialect_options['postgresql_where'] = predicate
+    return Index(name, *expressions, _table=table, unique=unique, **dialect_options)
@@ -6,8 +6,12 @@ from db.columns.base import MathesarColumn
 from db.columns.operations.alter import batch_alter_table_drop_columns
 from db.columns.operations.create import bulk_create_mathesar_column
 from db.columns.operations.select import get_column_names_from_attnums
+from db.tables.operations.online import (
+    ONLINE_PREFIX, create_row_trigger, drop_row_trigger, lock_table, run_in_batches,
+)
 from db.tables.operations.select import reflect_table_from_oid
 from db.metadata import get_empty_metadata
+from db.utils import quote_identifier, quote_table
 
 
 def move_columns_between_related_tables(
@@ -15,8 +19,15 @@ def move_columns_between_related_tables(
         target_table_oid,
         column_attnums_to_move,
         schema,
-        engine
+        engine,
+        batch_size=None,
+        on_progress=None,
 ):
+    """
+    Moves columns to a table related to theirs by a foreign key. With a batch size, columns moved
+    to the referrer table are moved online, see _move_columns_to_referrer_table_online. Columns
+    moved to the referent table are regrouped by their values, which isn't done in batches.
+    """
     # TODO reuse metadata
     metadata = get_empty_metadata()
     source_table = reflect_table_from_oid(source_table_oid, engine, metadata=metadata)
@@ -35,6 +46,23 @@ def move_columns_between_related_tables(
     # Re reflect the target table as we have added a new column
     # Metadata needs to be shared so that target table is the same object as the table returned from the relation finding function
     target_table = reflect_table_from_oid(target_table_oid, engine, metadata=metadata)
+    if batch_size is not None and relationship["referenced"] != target_table:
+        _move_columns_to_referrer_table_online(
+            source_table_oid,
+            source_table,
+            target_table_oid,
+            target_table,
+            moving_columns,
+            column_attnums_to_move,
+            source_table_reference_column,
+            target_table_reference_column,
+            engine,
+            batch_size,
+            on_progress,
+        )
+        # TODO reuse metadata
+        source_table = reflect_table_from_oid(source_table_oid, engine, metadata=get_empty_metadata())
+        return target_table, source_table
     if relationship["referenced"] == target_table:
         extracted_columns_update_stmt = _create_move_referrer_table_columns_update_stmt(
             source_table,
@@ -62,6 +90,86 @@ def move_columns_between_related_tables(
     return target_table, source_table
 
 
+def _move_columns_to_referrer_table_online(
+        source_table_oid,
+        source_table,
+        target_table_oid,
+        target_table,
+        columns_to_move,
+        column_attnums_to_move,
+        source_table_reference_column,
+        target_table_reference_column,
+        engine,
+        batch_size,
+        on_progress,
+):
+    """
+    Copies the moved columns' values to the referrer (target) table in batches of its rows, each
+    in its own transaction. Meanwhile, triggers copy the values to rows of the target table
+    written with a new foreign key, and to rows referring to source rows whose values change.
+    Finally, under an exclusive lock, the triggers and the source table's columns are dropped.
+    """
+    moved_column_names = [col.name for col in columns_to_move]
+    quoted_columns = [quote_identifier(name, engine) for name in moved_column_names]
+    quoted_reference_column = quote_identifier(target_table_reference_column.name, engine)
+    quoted_source_id_column = quote_identifier(source_table_reference_column.name, engine)
+    target_trigger_name = f'{ONLINE_PREFIX}move_to_{target_table_oid}'
+    source_trigger_name = f'{ONLINE_PREFIX}move_from_{source_table_oid}'
+    try:
+        with engine.begin() as conn:
+            create_row_trigger(
+                conn,
+                engine,
+                target_table,
+                target_trigger_name,
+                f'BEFORE INSERT OR UPDATE OF {quoted_reference_column}',
+                f'SELECT {", ".join(quoted_columns)}'
+                f' INTO {", ".join(f"NEW.{column}" for column in quoted_columns)}'
+                f' FROM {quote_table(source_table, engine)}'
+                f' WHERE {quoted_source_id_column} = NEW.{quoted_reference_column};'
+            )
+            create_row_trigger(
+                conn,
+                engine,
+                source_table,
+                source_trigger_name,
+                f'AFTER UPDATE OF {", ".join(quoted_columns)}',
+                f'UPDATE {quote_table(target_table, engine)}'
+                f' SET {", ".join(f"{column} = NEW.{column}" for column in quoted_columns)}'
+                f' WHERE {quoted_reference_column} = NEW.{quoted_source_id_column};'
+            )
+        run_in_batches(
+            target_table,
+            lambda conn, condition: conn.execute(
+                _create_move_referent_table_columns_update_stmt(
+                    source_table,
+                    target_table,
+                    columns_to_move,
+                    source_table_reference_column,
+                    target_table_reference_column,
+                ).where(condition)
+            ),
+            batch_size,
+            engine,
+            on_progress=on_progress,
+        )
+        with engine.begin() as conn:
+            lock_table(conn, engine, source_table)
+            lock_table(conn, engine, target_table, mode='SHARE ROW EXCLUSIVE')
+            drop_row_trigger(conn, engine, target_table, target_trigger_name)
+            drop_row_trigger(conn, engine, source_table, source_trigger_name)
+            deletion_column_data = [
+                {'attnum': column_attnum, 'delete': True}
+                for column_attnum in column_attnums_to_move
+            ]
+            batch_alter_table_drop_columns(source_table_oid, deletion_column_data, conn, engine)
+    except Exception:
+        with engine.begin() as conn:
+            drop_row_trigger(conn, engine, target_table, target_trigger_name)
+            drop_row_trigger(conn, engine, source_table, source_trigger_name)
+        raise
+
+
 def _create_move_referent_table_columns_update_stmt(
         source_table,
         target_table,
@@ -0,0 +1,149 @@
+"""
+Helpers for altering large tables online. Rows are processed in primary key ordered batches, each
+in its own transaction, so that no single statement locks or rewrites a whole table, and triggers
+keep rows written concurrently consistent until a final, brief, swap under an exclusive lock.
+"""
+import logging
+
+from sqlalchemy import TEXT, Float, Interval, Numeric, and_, cast, func, select, text
+
+from db import constants
+from db.tables.utils import get_primary_key_column
+from db.utils import execute_ddl, quote_identifier, quote_table
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the names of triggers, trigger functions and helper columns used while a table is
+# altered online.
+ONLINE_PREFIX = f'{constants.MATHESAR_PREFIX}online_'
+
+
+def run_in_batches(table, execute_batch, batch_size, engine, on_progress=None):
+    """
+    Calls `execute_batch(connection, condition)` for consecutive batches of at most `batch_size`
+    rows of the table, in primary key order, each in its own transaction. `condition` selects the
+    rows of the batch. Rows inserted meanwhile are processed too, if their primary key is higher
+    than those already processed.
+
+    `on_progress`, if given, is called after each batch with the number of rows processed so far
+    and the estimated total. Returns the number of rows processed.
+    """
+    primary_key_column = get_primary_key_column(table)
+    estimated_row_count = get_estimated_row_count(table, engine)
+    processed_row_count = 0
+    last_id = None
+    while True:
+        with engine.begin() as conn:
+            batch_ids = select(primary_key_column.label('id')).order_by(primary_key_column).limit(batch_size)
+            if last_id is not None:
+                batch_ids = batch_ids.where(primary_key_column > last_id)
+            batch_ids = batch_ids.subquery()
+            row_count, max_id = conn.execute(
+                select(func.count(), func.max(batch_ids.c.id))
+            ).fetchone()
+            if row_count == 0:
+                break
+            condition = primary_key_column <= max_id
+            if last_id is not None:
+                condition = and_(primary_key_column > last_id, condition)
+            execute_batch(conn, condition)
+        processed_row_count += row_count
+        last_id = max_id
+        logger.info(
+            f'Processed {processed_row_count} of about {estimated_row_count} rows'
+            f' of {table.schema}.{table.name}'
+        )
+        if on_progress is not None:
+            on_progress(processed_row_count, estimated_row_count)
+    return processed_row_count
+
+
+def get_estimated_row_count(table, engine):
+    sel = text(
+        'SELECT reltuples FROM pg_catalog.pg_class WHERE oid = CAST(:table AS regclass)'
+    ).bindparams(table=quote_table(table, engine))
+    with engine.begin() as conn:
+        # reltuples is negative (or zero, before Postgres 14) for tables never analyzed.
+        return max(int(conn.execute(sel).scalar()), 0)
+
+
+def create_row_trigger(connection, engine, table, name, timing, body):
+    """
+    Creates a trigger running the PL/pgSQL statements of `body` for each row, and its function,
+    which gets the same name and the table's schema. `timing` is what goes between the trigger
+    name and ON in CREATE TRIGGER, like 'BEFORE INSERT OR UPDATE OF "x"'.
+    """
+    function = _quote_function(table, name, engine)
+    execute_ddl(
+        connection,
+        f'CREATE FUNCTION {function}() RETURNS trigger AS $mathesar$'
+        f' BEGIN {body} RETURN NEW; END'
+        f' $mathesar$ LANGUAGE plpgsql'
+    )
+    execute_ddl(
+        connection,
+        f'CREATE TRIGGER {quote_identifier(name, engine)} {timing} ON {quote_table(table, engine)}'
+        f' FOR EACH ROW EXECUTE FUNCTION {function}()'
+    )
+
+
+def drop_row_trigger(connection, engine, table, name):
+    execute_ddl(
+        connection,
+        f'DROP TRIGGER IF EXISTS {quote_identifier(name, engine)} ON {quote_table(table, engine)}'
+    )
+    execute_ddl(connection, f'DROP FUNCTION IF EXISTS {_quote_function(table, name, engine)}()')
+
+
+def lock_table(connection, engine, table, mode='ACCESS EXCLUSIVE'):
+    execute_ddl(connection, f'LOCK TABLE {quote_table(table, engine)} IN {mode} MODE')
+
+
+def get_row_key(columns):
+    """
+    An expression identifying the combination of values in the columns, NULLs included, usable
+    in a unique index. Values are compared by their JSON representation, after normalizing those
+    of types whose equal values can be represented differently (e.g. 1.0 and 1.00), so that rows
+    are deduplicated as by the types' equality, as when splitting tables offline. Floating point
+    -0 and 0 are still told apart.
+    """
+    return func.md5(cast(func.jsonb_build_array(*[
+        _normalize(column, column.type) for column in columns
+    ]), TEXT))
+
+
+def get_row_key_sql(column_references, column_types):
+    """
+    The same as get_row_key, as SQL, for use in trigger bodies.
+    """
+    normalized_references = [
+        _normalize_sql(reference, column_type)
+        for reference, column_type in zip(column_references, column_types)
+    ]
+    return f'md5(CAST(jsonb_build_array({", ".join(normalized_references)}) AS text))'
+
+
+def _normalize(column, column_type):
+    function_name = _get_normalizing_function_name(column_type)
+    return getattr(func, function_name)(column) if function_name else column
+
+
+def _normalize_sql(column_reference, column_type):
+    function_name = _get_normalizing_function_name(column_type)
+    return f'{function_name}({column_reference})' if function_name else column_reference
+
+
+def _get_normalizing_function_name(column_type):
+    # Custom types, like Mathesar money, are normalized as their underlying type.
+    sa_type = getattr(column_type, 'underlying_type', None) or column_type
+    sa_type_class = sa_type if isinstance(sa_type, type) else type(sa_type)
+    if issubclass(sa_type_class, Numeric) and not issubclass(sa_type_class, Float):
+        # Drops trailing zeroes of the fractional part.
+        return 'trim_scale'
+    elif issubclass(sa_type_class, Interval):
+        # E.g. '1 day' for '24 hours'.
+        return 'justify_interval'
+
+
+def _quote_function(table, name, engine):
+    return f'{quote_identifier(table.schema, engine)}.{quote_identifier(name, engine)}'
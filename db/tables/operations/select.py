@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Table, select, join, inspect, and_, cast, func, Integer, literal, or_,
+    Table, select, join, inspect, and_, cast, func, Integer, literal, or_, text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -103,6 +103,32 @@ def get_table_oids_from_schemas(schema_oids, engine, metadata):
     return table_oids
 
 
+def get_next_table_name_suffix(base_name, schema, engine, first_suffix=1):
+    """
+    Looks for relations in the schema named `base_name`, or `base_name` followed by a space and a
+    number, as in "Table 2". Returns whether `base_name` itself is taken, and the number following
+    the highest one in use (or `first_suffix` if none is).
+
+    Any kind of relation counts, since they all share a namespace with tables.
+    """
+    sel = text("""
+        WITH names AS (
+          SELECT c.relname
+          FROM pg_catalog.pg_class c JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+          WHERE n.nspname = :schema AND left(c.relname, length(:base_name)) = :base_name
+        )
+        SELECT
+          EXISTS(SELECT 1 FROM names WHERE relname = :base_name) AS base_name_taken,
+          (
+            SELECT coalesce(max(substr(relname, length(:base_name) + 2)::integer) + 1, :first_suffix)
+            FROM names
+            WHERE substr(relname, length(:base_name) + 1) ~ '^ [0-9]{1,9}$'
+          ) AS next_suffix
+    """).bindparams(base_name=base_name, schema=schema, first_suffix=first_suffix)
+    with engine.begin() as conn:
+        return tuple(conn.execute(sel).fetchone())
+
+
 def get_oid_from_table(name, schema, engine):
     inspector = inspect(engine)
     return inspector.get_table_oid(name, schema=schema)
@@ -1,13 +1,25 @@
 from sqlalchemy import exists, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
 
 from db import constants
 from db.columns.base import MathesarColumn
 from db.columns.operations.alter import batch_alter_table_drop_columns
 from db.columns.operations.select import get_column_names_from_attnums
+from db.constraints.utils import naming_convention
 from db.links.operations.create import create_foreign_key_link
 from db.tables.operations.create import create_mathesar_table
+from db.tables.operations.online import (
+    ONLINE_PREFIX, create_row_trigger, drop_row_trigger, get_row_key, get_row_key_sql, lock_table,
+    run_in_batches,
+)
 from db.tables.operations.select import get_oid_from_table, reflect_table, reflect_table_from_oid
+from db.tables.utils import get_primary_key_column
 from db.metadata import get_empty_metadata
+from db.utils import execute_ddl, quote_identifier, quote_table
+
+# Helper column of the extracted table while a table is split online, holding a key of each row's
+# values, so that rows are deduplicated by a unique index.
+SPLIT_KEY = f'{ONLINE_PREFIX}split_key'
 
 
 def _create_split_tables(extracted_table_name, extracted_columns, remainder_table_name, schema, engine, fk_column_name=None):
@@ -60,7 +72,21 @@ def _create_split_insert_stmt(old_table, extracted_table, extracted_columns, rem
     return split_ins
 
 
-def extract_columns_from_table(old_table_oid, extracted_column_attnums, extracted_table_name, schema, engine, relationship_fk_column_name=None):
+def extract_columns_from_table(
+        old_table_oid,
+        extracted_column_attnums,
+        extracted_table_name,
+        schema,
+        engine,
+        relationship_fk_column_name=None,
+        batch_size=None,
+        on_progress=None,
+):
+    """
+    Moves the given columns to a new table holding their distinct combinations of values, and
+    links the old table to it with a foreign key column. With a batch size, this is done online,
+    see _extract_columns_from_table_online.
+    """
     # TODO reuse metadata
     old_table = reflect_table_from_oid(old_table_oid, engine, metadata=get_empty_metadata())
     old_table_name = old_table.name
@@ -73,6 +99,19 @@ def extract_columns_from_table(old_table_oid, extracted_column_attnums, extracte
     extracted_columns = [
         col for col in old_non_default_columns if col.name in extracted_column_names
     ]
+    if batch_size is not None:
+        return _extract_columns_from_table_online(
+            old_table,
+            old_table_oid,
+            extracted_columns,
+            extracted_column_attnums,
+            extracted_table_name,
+            schema,
+            engine,
+            relationship_fk_column_name,
+            batch_size,
+            on_progress,
+        )
     with engine.begin() as conn:
         extracted_table, remainder_table_with_fk_column, fk_column_name = _create_split_tables(
             extracted_table_name,
@@ -96,3 +135,148 @@ def extract_columns_from_table(old_table_oid, extracted_column_attnums, extracte
         ]
         batch_alter_table_drop_columns(remainder_table_oid, deletion_column_data, conn, engine)
     return extracted_table, remainder_table_with_fk_column, fk_column_name
+
+
+def _extract_columns_from_table_online(
+        old_table,
+        old_table_oid,
+        extracted_columns,
+        extracted_column_attnums,
+        extracted_table_name,
+        schema,
+        engine,
+        fk_column_name,
+        batch_size,
+        on_progress,
+):
+    """
+    Splits the table without locking it for longer than the final swap. The extracted table is
+    filled, and the new foreign key column back-filled, in batches of the old table's rows, while
+    a trigger does the same for rows written meanwhile. Extracted rows are deduplicated through a
+    unique helper column holding a key of their values.
+
+    Finally, under an exclusive lock, the trigger, the helper column and the extracted columns are
+    dropped and the foreign key constraint is added without checking it. It's validated
+    afterwards, which doesn't block writes.
+    """
+    extracted_column_names = [col.name for col in extracted_columns]
+    extracted_table = create_mathesar_table(extracted_table_name, schema, extracted_columns, engine)
+    extracted_table_oid = get_oid_from_table(extracted_table_name, schema, engine)
+    fk_column_name = fk_column_name if fk_column_name else f"{extracted_table.name}_{constants.ID}"
+    fk_constraint_name = naming_convention['fk'] % {
+        'table_name': old_table.name, 'column_0_name': fk_column_name
+    }
+    trigger_name = f'{ONLINE_PREFIX}split_{old_table_oid}'
+    extracted_id_column = get_primary_key_column(extracted_table)
+    quoted_old_table = quote_table(old_table, engine)
+    quoted_extracted_table = quote_table(extracted_table, engine)
+    quoted_key = quote_identifier(SPLIT_KEY, engine)
+    quoted_fk_column = quote_identifier(fk_column_name, engine)
+    quoted_extracted_columns = ', '.join(quote_identifier(name, engine) for name in extracted_column_names)
+    new_values = [f'NEW.{quote_identifier(name, engine)}' for name in extracted_column_names]
+    new_key = get_row_key_sql(new_values, [col.type for col in extracted_columns])
+    try:
+        with engine.begin() as conn:
+            execute_ddl(conn, f'ALTER TABLE {quoted_extracted_table} ADD COLUMN {quoted_key} TEXT UNIQUE')
+            execute_ddl(
+                conn,
+                f'ALTER TABLE {quoted_old_table} ADD COLUMN {quoted_fk_column}'
+                f' {extracted_id_column.type.compile(dialect=engine.dialect)}'
+            )
+            create_row_trigger(
+                conn,
+                engine,
+                old_table,
+                trigger_name,
+                f'BEFORE INSERT OR UPDATE OF {quoted_extracted_columns}',
+                f'INSERT INTO {quoted_extracted_table} ({quoted_extracted_columns}, {quoted_key})'
+                f' VALUES ({", ".join(new_values)}, {new_key})'
+                f' ON CONFLICT ({quoted_key}) DO UPDATE SET {quoted_key} = EXCLUDED.{quoted_key}'
+                f' RETURNING {quote_identifier(extracted_id_column.name, engine)} INTO NEW.{quoted_fk_column};'
+            )
+        metadata = get_empty_metadata()
+        old_table = reflect_table_from_oid(old_table_oid, engine, metadata=metadata)
+        extracted_table = reflect_table_from_oid(extracted_table_oid, engine, metadata=metadata)
+        run_in_batches(
+            old_table,
+            lambda conn, condition: conn.execute(
+                _create_online_split_batch_stmt(
+                    old_table, extracted_table, extracted_column_names, fk_column_name, condition
+                )
+            ),
+            batch_size,
+            engine,
+            on_progress=on_progress,
+        )
+        with engine.begin() as conn:
+            lock_table(conn, engine, old_table)
+            drop_row_trigger(conn, engine, old_table, trigger_name)
+            execute_ddl(conn, f'ALTER TABLE {quoted_extracted_table} DROP COLUMN {quoted_key}')
+            deletion_column_data = [
+                {'attnum': column_attnum, 'delete': True}
+                for column_attnum in extracted_column_attnums
+            ]
+            batch_alter_table_drop_columns(old_table_oid, deletion_column_data, conn, engine)
+            execute_ddl(
+                conn,
+                f'ALTER TABLE {quoted_old_table} ADD CONSTRAINT {quote_identifier(fk_constraint_name, engine)}'
+                f' FOREIGN KEY ({quoted_fk_column})'
+                f' REFERENCES {quoted_extracted_table} ({quote_identifier(extracted_id_column.name, engine)})'
+                f' NOT VALID'
+            )
+    except Exception:
+        with engine.begin() as conn:
+            drop_row_trigger(conn, engine, old_table, trigger_name)
+            execute_ddl(conn, f'ALTER TABLE {quoted_old_table} DROP COLUMN IF EXISTS {quoted_fk_column}')
+            execute_ddl(conn, f'DROP TABLE IF EXISTS {quoted_extracted_table}')
+        raise
+    with engine.begin() as conn:
+        execute_ddl(
+            conn,
+            f'ALTER TABLE {quoted_old_table} VALIDATE CONSTRAINT {quote_identifier(fk_constraint_name, engine)}'
+        )
+    metadata = get_empty_metadata()
+    return (
+        reflect_table_from_oid(extracted_table_oid, engine, metadata=metadata),
+        reflect_table_from_oid(old_table_oid, engine, metadata=metadata),
+        fk_column_name,
+    )
+
+
+def _create_online_split_batch_stmt(old_table, extracted_table, extracted_column_names, fk_column_name, condition):
+    """
+    Inserts the batch's distinct combinations of values into the extracted table, unless they're
+    there already, and points the batch's rows to them.
+    """
+    old_extracted_columns = [old_table.c[name] for name in extracted_column_names]
+    batch_cte = select(
+        old_table.c[constants.ID],
+        get_row_key(old_extracted_columns).label(SPLIT_KEY),
+        *old_extracted_columns,
+    ).where(condition).cte()
+    batch_values = select(
+        *[batch_cte.c[name] for name in extracted_column_names],
+        batch_cte.c[SPLIT_KEY],
+    ).distinct(batch_cte.c[SPLIT_KEY])
+    upsert = insert(extracted_table).from_select(extracted_column_names + [SPLIT_KEY], batch_values)
+    # Updating on conflict, rather than doing nothing, makes existing rows part of the output, even
+    # those inserted by the trigger after this statement started.
+    upsert_cte = (
+        upsert
+        .on_conflict_do_update(
+            index_elements=[extracted_table.c[SPLIT_KEY]],
+            set_={SPLIT_KEY: upsert.excluded[SPLIT_KEY]},
+        )
+        .returning(extracted_table.c[constants.ID], extracted_table.c[SPLIT_KEY])
+        .cte()
+    )
+    return (
+        old_table
+        .update().values({fk_column_name: upsert_cte.c[constants.ID]})
+        .where(
+            old_table.c[constants.ID] == batch_cte.c[constants.ID],
+            batch_cte.c[SPLIT_KEY] == upsert_cte.c[SPLIT_KEY],
+            # Rows changed since the batch was read got their foreign key from the trigger.
+            get_row_key(old_extracted_columns) == batch_cte.c[SPLIT_KEY],
+        )
+    )
@@ -7,7 +7,8 @@ from sqlalchemy.exc import IntegrityError
 
 from db import constants
 from db.columns.operations import alter as alter_operations
-from db.columns.operations.alter import alter_column, batch_update_columns, change_column_nullable, rename_column, retype_column, set_column_default
+from db.columns.exceptions import InvalidTypeError
+from db.columns.operations.alter import alter_column, alter_columns_in_bulk, batch_update_columns, change_column_nullable, rename_column, retype_column, set_column_default
 from db.columns.operations.select import get_column_attnum_from_name, get_column_default, get_columns_attnum_from_names
 from db.columns.utils import to_mathesar_column_with_engine
 from db.tables.operations.create import create_mathesar_table
@@ -560,3 +561,78 @@ def test_batch_update_column_all_operations(engine_with_schema):
         new_column_type = get_db_type_enum_from_class(new_column_type_class).id
         assert new_column_type == column_data[index]['type']
         assert updated_table.columns[index].name == column_data[index]['name']
+
+
+def test_alter_columns_in_bulk(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = _create_pizza_table(engine, schema)
+    table_oid = get_oid_from_table(table.name, schema, engine)
+
+    column_data = _get_pizza_column_data(table_oid, engine)
+    column_data[0]['type'] = PostgresType.INTEGER.id
+    column_data[0]['nullable'] = False
+    column_data[1]['name'] = 'Pizza Style'
+    column_data[1]['column_default_dict'] = {'value': "Chef's choice"}
+    column_data[2]['type'] = PostgresType.BOOLEAN.id
+    column_data[3]['type'] = PostgresType.NUMERIC.id
+    column_data[3]['type_options'] = {'precision': 3, 'scale': 1}
+
+    alter_columns_in_bulk(engine, table_oid, column_data)
+    updated_table = reflect_table(table.name, schema, engine, metadata=get_empty_metadata())
+
+    assert [column.name for column in updated_table.columns] == [data['name'] for data in column_data]
+    for index, column in enumerate(updated_table.columns):
+        new_column_type = get_db_type_enum_from_class(column.type.__class__).id
+        assert new_column_type == column_data[index]['type']
+    assert updated_table.columns['ID'].nullable is False
+    assert updated_table.columns['Rating'].type.precision == 3
+    pizza_attnum = column_data[1]['attnum']
+    assert get_column_default(table_oid, pizza_attnum, engine, metadata=get_empty_metadata()) == "Chef's choice"
+    with engine.begin() as conn:
+        ratings = conn.execute(select(updated_table.c.Rating)).scalars().all()
+    assert [str(rating) for rating in ratings] == ['4.0', '5.0', '3.5']
+
+
+def test_alter_columns_in_bulk_json_default(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = create_test_table('atable', [Column('data', VARCHAR)], [], schema, engine)
+    table_oid = get_oid_from_table(table.name, schema, engine)
+    attnum = get_column_attnum_from_name(table_oid, 'data', engine, metadata=get_empty_metadata())
+    default = {'discount': "10%", 'note': "it's \\ fine"}
+
+    alter_columns_in_bulk(
+        engine,
+        table_oid,
+        [{'attnum': attnum, 'type': PostgresType.JSONB.id, 'column_default_dict': {'value': default}}]
+    )
+
+    assert get_column_default(table_oid, attnum, engine, metadata=get_empty_metadata()) == default
+
+
+def test_alter_columns_in_bulk_casts_defaults(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = create_test_table(
+        'atable', [Column('amount', VARCHAR, server_default='5')], [], schema, engine
+    )
+    table_oid = get_oid_from_table(table.name, schema, engine)
+    attnum = get_column_attnum_from_name(table_oid, 'amount', engine, metadata=get_empty_metadata())
+
+    alter_columns_in_bulk(engine, table_oid, [{'attnum': attnum, 'type': PostgresType.INTEGER.id}])
+
+    assert get_column_default(table_oid, attnum, engine, metadata=get_empty_metadata()) == 5
+
+
+def test_alter_columns_in_bulk_invalid_type(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = _create_pizza_table(engine, schema)
+    table_oid = get_oid_from_table(table.name, schema, engine)
+    column_data = _get_pizza_column_data(table_oid, engine)
+    column_data[0]['type'] = PostgresType.INTEGER.id
+    column_data[1]['type'] = PostgresType.INTEGER.id
+
+    with pytest.raises(InvalidTypeError):
+        alter_columns_in_bulk(engine, table_oid, column_data)
+    # Nothing is altered if any of the changes fails.
+    updated_table = reflect_table(table.name, schema, engine, metadata=get_empty_metadata())
+    new_column_type = get_db_type_enum_from_class(updated_table.columns['ID'].type.__class__)
+    assert new_column_type == PostgresType.CHARACTER_VARYING
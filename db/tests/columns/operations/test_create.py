@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import INTEGER, Column, Table, MetaData, NUMERIC, UniqueConstraint
+from sqlalchemy import INTEGER, Column, Table, MetaData, NUMERIC, UniqueConstraint, text
 
 from db.columns.operations.create import create_column, duplicate_column, gen_col_name
 from db.columns.operations.select import get_column_attnum_from_name, get_column_default
@@ -336,6 +336,45 @@ def test_duplicate_column_default(engine_with_schema, copy_data, copy_constraint
         assert default is None
 
 
+@pytest.mark.parametrize('copy_constraints', [True, False])
+def test_duplicate_column_in_batches(engine_with_schema, copy_constraints):
+    engine, schema = engine_with_schema
+    table_name = "atable"
+    target_column_name = "columtoduplicate"
+    new_col_name = "duplicated_column"
+    cols = [
+        Column("id", INTEGER, primary_key=True),
+        Column(target_column_name, NUMERIC, unique=True, nullable=False),
+    ]
+    insert_data = [(i, i * 10) for i in range(1, 8)]
+    create_test_table(table_name, cols, insert_data, schema, engine)
+
+    table_oid = get_oid_from_table(table_name, schema, engine)
+    target_col_attnum = get_column_attnum_from_name(table_oid, target_column_name, engine, metadata=get_empty_metadata())
+    progress = []
+    col = duplicate_column(
+        table_oid, target_col_attnum, engine, new_col_name, True, copy_constraints,
+        batch_size=3, on_progress=lambda processed, _: progress.append(processed),
+    )
+
+    table = reflect_table_from_oid(table_oid, engine, metadata=get_empty_metadata())
+    with engine.begin() as conn:
+        rows = conn.execute(table.select()).fetchall()
+        assert all(row[target_column_name] == row[new_col_name] for row in rows)
+        # The trigger copying values written during the batches is dropped afterwards.
+        trigger_count = conn.execute(
+            text('SELECT count(*) FROM pg_catalog.pg_trigger WHERE tgrelid = :oid AND NOT tgisinternal'),
+            {'oid': table_oid},
+        ).scalar()
+    assert trigger_count == 0
+    assert progress == [3, 6, 7]
+    assert col.nullable is not copy_constraints
+    col_attnum = get_column_attnum_from_name(table_oid, new_col_name, engine, metadata=get_empty_metadata())
+    _check_duplicate_unique_constraint(
+        table_oid, col_attnum, [col_attnum], engine, copy_constraints
+    )
+
+
 def test_create_column_accepts_column_data_without_name_attribute(engine_with_schema):
     engine, schema = engine_with_schema
     table_name = "atableone"
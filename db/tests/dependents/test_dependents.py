@@ -2,7 +2,8 @@ import pytest
 from sqlalchemy import MetaData, select, Index
 from sqlalchemy_utils import create_view
 from db.constraints.base import ForeignKeyConstraint
-from db.dependents.dependents_utils import get_dependents_graph
+from db.dependents import dependents_utils
+from db.dependents.dependents_utils import get_dependents_graph, get_objects_with_dependents, has_dependents
 from db.constraints.operations.select import get_constraint_oid_by_name_and_table_oid
 from db.columns.operations.create import create_column
 from db.columns.operations.select import get_column_attnum_from_name
@@ -221,3 +222,45 @@ def test_sequences_as_dependents(engine, library_tables_oids):
     publishers_sequence_dependent = _get_object_dependents_by_name(publishers_dependents_graph, publishers_oid, publishers_sequence_name)[0]
 
     assert publishers_sequence_dependent['name'] == publishers_sequence_name
+
+
+def test_objects_with_dependents_matches_has_dependents(engine, library_tables_oids):
+    publications_oid = library_tables_oids['Publications']
+    publications_title_attnum = get_column_attnum_from_name(publications_oid, 'Title', engine, metadata=get_empty_metadata())
+    publications_id_attnum = get_column_attnum_from_name(publications_oid, 'id', engine, metadata=get_empty_metadata())
+    referenced_objects = [(oid, None) for oid in library_tables_oids.values()] + [
+        (publications_oid, publications_id_attnum),
+        (publications_oid, publications_title_attnum),
+    ]
+
+    objects_with_dependents = get_objects_with_dependents(referenced_objects, engine)
+
+    assert (publications_oid, publications_id_attnum) in objects_with_dependents
+    for oid, attnum in referenced_objects:
+        assert ((oid, attnum) in objects_with_dependents) == has_dependents(oid, engine, attnum)
+
+
+def test_dependency_graph_rebuilt_only_on_catalog_change(engine_with_schema, library_db_tables, library_tables_oids, monkeypatch):
+    engine, schema = engine_with_schema
+    checkouts_oid = library_tables_oids['Checkouts']
+    dependents_utils.clear_dependency_graph_cache()
+    from_database = dependents_utils.DependencyGraph.from_database
+    builds = []
+
+    def _from_database(engine):
+        builds.append(engine)
+        return from_database(engine)
+    monkeypatch.setattr(dependents_utils.DependencyGraph, 'from_database', _from_database)
+
+    first_graph = get_dependents_graph(checkouts_oid, engine, [])
+    assert get_dependents_graph(checkouts_oid, engine, []) == first_graph
+    assert len(builds) == 1
+
+    metadata = MetaData(schema=schema, bind=engine)
+    create_view('checkouts_view', select(library_db_tables['Checkouts'].c.id), metadata)
+    metadata.create_all(engine)
+    new_graph = get_dependents_graph(checkouts_oid, engine, [])
+
+    assert len(builds) == 2
+    assert 'view' in [dependent['obj']['type'] for dependent in new_graph]
+    assert 'view' not in [dependent['obj']['type'] for dependent in first_graph]
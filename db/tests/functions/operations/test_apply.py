@@ -0,0 +1,50 @@
+import pytest
+
+from db.functions.exceptions import ReferencedColumnsDontExist
+from db.functions.operations import apply
+from db.utils import execute_pg_query
+
+
+@pytest.fixture(autouse=True)
+def empty_filter_cache():
+    apply.clear_filter_cache()
+    yield
+    apply.clear_filter_cache()
+
+
+def test_apply_db_function_spec_as_filter_cached(filter_sort_table_obj):
+    table, engine = filter_sort_table_obj
+    spec = {"greater": [{"column_name": ["numeric"]}, {"literal": [50]}]}
+
+    first_records = execute_pg_query(engine, apply.apply_db_function_spec_as_filter(table.select(), spec))
+    # An equal spec that is a different object hits the cache.
+    second_records = execute_pg_query(engine, apply.apply_db_function_spec_as_filter(table.select(), dict(spec)))
+
+    assert first_records == second_records
+    stats = apply.get_filter_cache_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['size'] == 1
+
+
+def test_apply_db_function_spec_as_filter_cached_checks_columns(filter_sort_table_obj):
+    table, _ = filter_sort_table_obj
+    spec = {"greater": [{"column_name": ["numeric"]}, {"literal": [50]}]}
+    apply.apply_db_function_spec_as_filter(table.select(), spec)
+    relation_without_column = table.select().with_only_columns([table.c.varchar])
+    with pytest.raises(ReferencedColumnsDontExist):
+        apply.apply_db_function_spec_as_filter(relation_without_column, spec)
+
+
+def test_filter_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(apply, 'FILTER_CACHE_SIZE', 2)
+    specs = [
+        {"equal": [{"column_name": ["numeric"]}, {"literal": [value]}]}
+        for value in range(3)
+    ]
+    apply._get_compiled_db_function_spec(specs[0])
+    apply._get_compiled_db_function_spec(specs[1])
+    apply._get_compiled_db_function_spec(specs[0])
+    apply._get_compiled_db_function_spec(specs[2])
+    # specs[1] was evicted, since specs[0] was used more recently.
+    apply._get_compiled_db_function_spec(specs[1])
+    stats = apply.get_filter_cache_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 4 and stats['size'] == 2
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+from db.functions.base import ExtractURIAuthority
+from db.functions.operations.check_support import get_supported_db_functions
+
+
+def test_get_supported_db_functions(engine_with_schema):
+    engine, _ = engine_with_schema
+    supported_db_functions = get_supported_db_functions(engine)
+    assert ExtractURIAuthority in supported_db_functions
+
+
+def test_get_supported_db_functions_cached(engine_with_schema):
+    engine, _ = engine_with_schema
+    supported_db_functions = get_supported_db_functions(engine)
+    assert get_supported_db_functions(engine) is supported_db_functions
+
+
+def test_get_supported_db_functions_catalog_change(engine_with_schema):
+    engine, schema = engine_with_schema
+    supported_db_functions = get_supported_db_functions(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(f'CREATE FUNCTION "{schema}".check_support_test() RETURNS integer AS $$ SELECT 1 $$ LANGUAGE SQL;')
+        )
+    new_supported_db_functions = get_supported_db_functions(engine)
+    assert new_supported_db_functions is not supported_db_functions
+    assert new_supported_db_functions == supported_db_functions
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from sqlalchemy.dialects import postgresql
+
+from db import engine as db_engine
+from db.functions import base
+from db.functions.operations.apply import get_sa_expression_from_db_function_spec
+from db.types.base import PostgresType
+
+
+def test_sa_call_sql_function_registers_once():
+    first = base.sa_call_sql_function('registry_test', 1, return_type=PostgresType.INTEGER)
+    second = base.sa_call_sql_function('registry_test', 2, return_type=PostgresType.INTEGER)
+    assert type(first) is type(second)
+    assert isinstance(first.type, PostgresType.INTEGER.get_sa_class(db_engine.get_dummy_engine()))
+
+
+def test_sa_call_sql_function_return_types():
+    integer_call = base.sa_call_sql_function('registry_types_test', 1, return_type=PostgresType.INTEGER)
+    text_call = base.sa_call_sql_function('registry_types_test', 1, return_type=PostgresType.TEXT)
+    assert type(integer_call) is not type(text_call)
+    # The first registered type isn't overwritten by the second one.
+    assert isinstance(integer_call.type, PostgresType.INTEGER.get_sa_class(db_engine.get_dummy_engine()))
+
+
+def test_filter_compilation_reuses_engine_and_function_classes():
+    """
+    Builds and compiles a filter using URI, email and JSON functions many times, checking that
+    no engines or SQL function classes are created after the first time.
+    """
+    spec = {'and': [
+        {'uri_authority_contains': [{'column_name': ['uri']}, {'literal': ['example']}]},
+        {'uri_scheme_equals': [{'column_name': ['uri']}, {'literal': ['https']}]},
+        {'email_domain_contains': [{'column_name': ['email']}, {'literal': ['example']}]},
+        {'json_array_length_equals': [{'column_name': ['json']}, {'literal': [2]}]},
+        {'contains_case_insensitive': [{'column_name': ['name']}, {'literal': ['a']}]},
+    ]}
+    dialect = postgresql.dialect()
+    # Warm up the SQL function registry and dummy engine.
+    str(get_sa_expression_from_db_function_spec(spec).compile(dialect=dialect))
+
+    num_iterations = 200
+    with patch.object(db_engine, 'sa_create_engine') as mock_create_engine, \
+            patch.object(base, '_register_sql_function') as mock_register:
+        for _ in range(num_iterations):
+            str(get_sa_expression_from_db_function_spec(spec).compile(dialect=dialect))
+
+    mock_create_engine.assert_not_called()
+    mock_register.assert_not_called()
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import text
+
+from db.columns.operations.select import (
+    get_column_attnum_from_name, get_column_attnum_from_names_as_map,
+)
+from db.indexes.operations.create import (
+    create_btree_index, create_expression_index, create_search_indexes,
+    get_expression_index_name, get_index_name,
+)
+from db.indexes.operations.select import (
+    get_btree_index_column_attnums, get_index_names, get_search_backend,
+)
+from db.records.operations.relevance import SearchBackend
+from db.tables.operations.select import get_oid_from_table
+from db.metadata import get_empty_metadata
+
+
+@pytest.mark.parametrize(
+    'backend', [SearchBackend.TRIGRAM.value, SearchBackend.FULL_TEXT.value]
+)
+def test_create_search_indexes(engine_with_roster, roster_table_name, backend):
+    engine, schema = engine_with_roster
+    table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    attnum = get_column_attnum_from_name(
+        table_oid, 'Student Name', engine, metadata=get_empty_metadata()
+    )
+    assert get_search_backend(
+        table_oid, [attnum], engine, get_empty_metadata()
+    ) == SearchBackend.ILIKE.value
+
+    index_names = create_search_indexes(table_oid, [attnum], engine, backend=backend)
+
+    assert len(index_names) == 1
+    assert get_search_backend(
+        table_oid, [attnum], engine, get_empty_metadata()
+    ) == backend
+
+
+def test_get_search_backend_ignores_other_text_search_configs(engine_with_roster, roster_table_name):
+    engine, schema = engine_with_roster
+    table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    attnum = get_column_attnum_from_name(
+        table_oid, 'Student Name', engine, metadata=get_empty_metadata()
+    )
+    with engine.begin() as conn:
+        conn.execute(text(
+            f'CREATE INDEX english_fts_idx ON "{schema}"."{roster_table_name}"'
+            ' USING gin (to_tsvector(\'english\', "Student Name"))'
+        ))
+
+    assert get_search_backend(
+        table_oid, [attnum], engine, get_empty_metadata()
+    ) == SearchBackend.ILIKE.value
+
+
+def test_create_search_indexes_ilike(engine_with_roster, roster_table_name):
+    engine, schema = engine_with_roster
+    table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    with pytest.raises(ValueError):
+        create_search_indexes(table_oid, [1], engine, backend=SearchBackend.ILIKE.value)
+
+
+def test_create_btree_index(engine_with_roster, roster_table_name):
+    engine, schema = engine_with_roster
+    table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    attnum_map = get_column_attnum_from_names_as_map(
+        table_oid, ['Subject', 'Grade'], engine, metadata=get_empty_metadata()
+    )
+    attnums = (attnum_map['Subject'], attnum_map['Grade'])
+
+    create_btree_index(table_oid, list(attnums), engine, concurrently=True)
+
+    assert attnums in get_btree_index_column_attnums(table_oid, engine)
+
+
+def test_create_expression_index(engine_with_roster, roster_table_name):
+    engine, schema = engine_with_roster
+    table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    spec = {'to_lowercase': [{'column_name': ['Student Name']}]}
+
+    index_name = create_expression_index(table_oid, spec, engine, concurrently=True)
+
+    assert index_name == get_expression_index_name(roster_table_name, spec)
+    assert index_name in get_index_names(table_oid, engine)
+
+
+def test_get_expression_index_name_differs_by_spec():
+    spec = {'extract_uri_authority': [{'column_name': ['uri']}]}
+    other_spec = {'extract_uri_authority': [{'to_lowercase': [{'column_name': ['uri']}]}]}
+    assert get_expression_index_name('table', spec) == get_expression_index_name('table', spec)
+    assert get_expression_index_name('table', spec) != get_expression_index_name('table', other_spec)
+
+
+def test_get_index_name_truncates():
+    index_name = get_index_name('a' * 60, ['column'], 'idx')
+    assert len(index_name) == 63
+    assert index_name != get_index_name('a' * 60, ['other_column'], 'idx')
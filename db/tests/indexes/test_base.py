@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+from db.indexes.base import IndexCandidate, IndexMethod, get_index_candidates
+
+
+def _get_table():
+    return Table(
+        'people',
+        MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('name', String),
+        Column('age', Integer),
+    )
+
+
+def test_get_index_candidates_filter():
+    lowercase_name_spec = {'to_lowercase': [{'column_name': ['name']}]}
+    filter = {'and': [
+        {'greater': [{'column_name': ['age']}, {'literal': [30]}]},
+        {'contains': [{'column_name': ['name']}, {'literal': ['ann']}]},
+        {'equal': [lowercase_name_spec, {'literal': ['ann']}]},
+        {'contains': [{'column_name': ['age']}, {'literal': ['3']}]},
+    ]}
+    candidates = get_index_candidates(_get_table(), filter=filter)
+    assert candidates['filter'] == [
+        IndexCandidate(IndexMethod.BTREE.value, ['age']),
+        IndexCandidate(IndexMethod.TRIGRAM.value, ['name']),
+        IndexCandidate(IndexMethod.EXPRESSION.value, ['name'], lowercase_name_spec),
+    ]
+
+
+def test_get_index_candidates_sort_group_search():
+    candidates = get_index_candidates(
+        _get_table(),
+        order_by=[{'field': 'name', 'direction': 'asc'}, {'field': 'id', 'direction': 'desc'}],
+        group_by_columns=['age'],
+        search=[{'column': 'name', 'literal': 'ann'}, {'column': 'age', 'literal': 3}],
+    )
+    assert candidates['sort'] == [IndexCandidate(IndexMethod.BTREE.value, ['name', 'id'])]
+    assert candidates['group'] == [IndexCandidate(IndexMethod.BTREE.value, ['age'])]
+    assert candidates['search'] == [
+        IndexCandidate(IndexMethod.TRIGRAM.value, ['name']),
+        IndexCandidate(IndexMethod.BTREE.value, ['age']),
+    ]
+
+
+def test_get_index_candidates_unknown_columns():
+    candidates = get_index_candidates(
+        _get_table(),
+        filter={'equal': [{'column_name': ['missing']}, {'literal': [1]}]},
+        order_by=[{'field': 'missing', 'direction': 'asc'}],
+    )
+    assert candidates['filter'] == [] and candidates['sort'] == []
@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import Column
+from sqlalchemy import Column, func, select
 
 from db.records.operations import group
 from db.records import exceptions as records_exceptions
@@ -149,6 +149,16 @@ def test_GB_validate_passes_valid_kwargs_extract_field():
     gb.validate()
 
 
+def test_GB_validate_passes_valid_kwargs_sampled():
+    gb = group.GroupBy(
+        columns=['col1', 'col2'],
+        mode=group.GroupMode.PERCENTILE.value,
+        num_groups=12,
+        sample_size=1000,
+    )
+    gb.validate()
+
+
 def test_GB_validate_fails_invalid_mode():
     with pytest.raises(records_exceptions.InvalidGroupType):
         group.GroupBy(
@@ -261,6 +271,24 @@ def test_GB_validate_fails_multiple_cols_with_count_by():
         )
 
 
+def test_GB_validate_fails_sample_size_unsupported_mode():
+    with pytest.raises(records_exceptions.BadGroupFormat):
+        group.GroupBy(
+            columns=['col1', 'col2'],
+            mode=group.GroupMode.DISTINCT.value,
+            sample_size=1000,
+        )
+
+
+def test_GB_validate_fails_invalid_sample_size():
+    with pytest.raises(records_exceptions.BadGroupFormat):
+        group.GroupBy(
+            columns=['col1'],
+            mode=group.GroupMode.MAGNITUDE.value,
+            sample_size=0,
+        )
+
+
 def test_GB_get_valid_group_by_columns_str_cols(roster_table_obj):
     roster, _ = roster_table_obj
     column_names = ['Student Number', 'Student Email']
@@ -807,3 +835,55 @@ def test_extract_group_metadata_correct_groups(record_dictionary_list):
         _group_id(rec['data']) for rec in record_dictionary_list
     ]
     assert set(actual_ids) == set(expect_ids)
+
+
+def test_get_percentile_bound_tuples():
+    sorted_rows = [(i,) for i in range(10)]
+    bound_tuples = group._get_percentile_bound_tuples(sorted_rows, 5)
+    assert bound_tuples == [(0,), (2,), (4,), (6,), (8,), (9,)]
+
+
+def test_get_percentile_bound_tuples_dedupes():
+    sorted_rows = [(1,), (1,), (1,), (2,)]
+    bound_tuples = group._get_percentile_bound_tuples(sorted_rows, 4)
+    assert bound_tuples == [(1,), (2,)]
+
+
+def test_get_tens_powers_bound_tuples():
+    bound_tuples = group._get_tens_powers_bound_tuples(3, 250)
+    assert bound_tuples[0] == (0,)
+    assert bound_tuples[-1] == (260,)
+    assert len(bound_tuples) == 27
+
+
+@pytest.mark.parametrize('columns,mode', [
+    (['Subject', 'Grade'], group.GroupMode.PERCENTILE.value),
+    (['Grade'], group.GroupMode.MAGNITUDE.value),
+])
+def test_sampled_group_select_keeps_all_rows(roster_table_obj, columns, mode):
+    roster, engine = roster_table_obj
+    group_by = group.GroupBy(
+        columns, mode=mode, num_groups=12, sample_size=100
+    )
+    sampled_group_by = group.get_sampled_group_by(roster, group_by, engine)
+    assert sampled_group_by.bound_tuples is not None
+    augmented_pg_query = group.get_group_augmented_records_pg_query(
+        roster, sampled_group_by
+    )
+    with engine.begin() as conn:
+        num_rows = conn.execute(select(func.count()).select_from(roster)).scalar()
+        res = conn.execute(augmented_pg_query).fetchall()
+
+    assert len(res) == num_rows
+    assert max([_group_id(row) for row in res]) == len(sampled_group_by.bound_tuples) - 1
+
+
+def test_sampled_group_by_bounds_are_cached(roster_table_obj):
+    roster, engine = roster_table_obj
+    group_by = group.GroupBy(
+        ['Grade'], mode=group.GroupMode.PERCENTILE.value, num_groups=5, sample_size=50
+    )
+    group.clear_sampled_bounds_cache()
+    first_group_by = group.get_sampled_group_by(roster, group_by, engine)
+    second_group_by = group.get_sampled_group_by(roster, group_by, engine)
+    assert first_group_by.bound_tuples is second_group_by.bound_tuples
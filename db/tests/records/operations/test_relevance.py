@@ -1,4 +1,4 @@
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, text
 from db.records.operations import relevance
 
 
@@ -125,3 +125,39 @@ def test_get_scored_selectable_nontext(roster_table_obj):
     assert len(matches) == 7 and all(
         [row['Grade'] == 100 and row[relevance.SCORE_COL] == 4 for row in matches]
     )
+
+
+def test_rank_and_filter_rows_full_text(roster_table_obj):
+    roster, engine = roster_table_obj
+    sel = relevance.get_rank_and_filter_rows_query(
+        relation=roster,
+        parameters_dict={'Student Name': 'John'},
+        limit=1000,
+        backend=relevance.SearchBackend.FULL_TEXT.value,
+    )
+
+    with engine.begin() as conn:
+        res = conn.execute(sel).fetchall()
+
+    # Full text search only matches whole words
+    assert len(res) > 0 and all(
+        ['john' in row['Student Name'].lower().split() for row in res]
+    )
+
+
+def test_rank_and_filter_rows_trigram(roster_table_obj):
+    roster, engine = roster_table_obj
+    with engine.begin() as conn:
+        conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    sel = relevance.get_rank_and_filter_rows_query(
+        relation=roster,
+        parameters_dict={'Student Name': 'John'},
+        backend=relevance.SearchBackend.TRIGRAM.value,
+    )
+
+    with engine.begin() as conn:
+        res = conn.execute(sel).fetchall()
+
+    assert len(res) == 10 and all(
+        ['John' in row['Student Name'] for row in res]
+    )
@@ -1,10 +1,12 @@
 import pytest
 
-from sqlalchemy import MetaData, Table
+from sqlalchemy import Column, MetaData, String, Table, UniqueConstraint
 from sqlalchemy.schema import DropConstraint
 
 from db.records.operations.select import get_records, get_records_with_default_order
-from db.records.operations.sort import BadSortFormat, SortFieldNotFound
+from db.records.operations.sort import (
+    BadSortFormat, OrderingStrategy, SortFieldNotFound, get_default_order_by, get_default_ordering,
+)
 
 
 def test_get_records_gets_ordered_records_str_col_name(roster_table_obj):
@@ -254,3 +256,51 @@ def test_get_records_orders_exceptions(filter_sort_table_obj, order_list, except
     filter_sort, engine = filter_sort_table_obj
     with pytest.raises(exception):
         get_records(filter_sort, engine, order_by=order_list)
+
+
+def test_get_default_ordering_primary_key(roster_table_obj):
+    roster, _ = roster_table_obj
+    strategy, columns = get_default_ordering(roster)
+    assert strategy == OrderingStrategy.PRIMARY_KEY.value
+    assert columns == list(roster.primary_key.columns)
+
+
+def test_get_default_ordering_unique_columns(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = Table(
+        'no_pkey_unique',
+        MetaData(bind=engine, schema=schema),
+        Column('nullable_code', String, unique=True),
+        Column('code', String, nullable=False),
+        Column('name', String),
+        UniqueConstraint('code'),
+    )
+    table.create()
+    reflected_table = Table(table.name, MetaData(bind=engine), schema=schema, autoload_with=engine)
+
+    strategy, columns = get_default_ordering(reflected_table)
+
+    assert strategy == OrderingStrategy.UNIQUE_COLUMNS.value
+    assert [col.name for col in columns] == ['code']
+    order_by = get_default_order_by(reflected_table.select().cte())
+    assert [spec['field'].name for spec in order_by] == ['code']
+
+
+def test_get_default_ordering_all_columns(engine_with_schema):
+    engine, schema = engine_with_schema
+    table = Table(
+        'no_pkey',
+        MetaData(bind=engine, schema=schema),
+        Column('code', String, unique=True),
+        Column('name', String),
+    )
+    table.create()
+    reflected_table = Table(table.name, MetaData(bind=engine), schema=schema, autoload_with=engine)
+
+    strategy, columns = get_default_ordering(reflected_table)
+
+    assert strategy == OrderingStrategy.ALL_COLUMNS.value
+    assert columns == list(reflected_table.columns)
+    # Ordering by all columns is only used when no other ordering is given
+    order_by = [{'field': 'name', 'direction': 'asc'}]
+    assert get_default_order_by(reflected_table, order_by=order_by) == order_by
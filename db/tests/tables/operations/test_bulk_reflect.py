@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import CheckConstraint, Table, UniqueConstraint, text
+
+from db.metadata import get_empty_metadata
+from db.tables.operations import bulk_reflect
+from db.tables.operations.bulk_reflect import has_supported_dialect_internals, reflect_tables_in_bulk
+from db.tables.operations.select import get_oid_from_table, reflect_table
+
+ACADEMICS_TABLE_NAMES = ['academics', 'articles', 'journals', 'publishers', 'universities']
+
+
+def _get_description(table):
+    return {
+        'columns': [
+            (
+                column.name,
+                str(column.type),
+                column.nullable,
+                column.primary_key,
+                _get_server_default(column),
+            )
+            for column in table.columns
+        ],
+        'primary_key': (table.primary_key.name, [column.name for column in table.primary_key]),
+        'foreign_keys': sorted(
+            (fk.parent.name, fk.column.table.schema, fk.column.table.name, fk.column.name, fk.ondelete)
+            for fk in table.foreign_keys
+        ),
+        'uniques': sorted(
+            (constraint.name, tuple(column.name for column in constraint.columns))
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ),
+        'checks': sorted(
+            constraint.name
+            for constraint in table.constraints
+            if isinstance(constraint, CheckConstraint)
+        ),
+        'indexes': sorted(
+            (index.name, index.unique, tuple(column.name for column in index.columns))
+            for index in table.indexes
+        ),
+    }
+
+
+def _get_server_default(column):
+    # Generated and identity columns have no DefaultClause, so no .arg
+    default = getattr(column.server_default, 'arg', None)
+    return str(default) if default is not None else None
+
+
+def test_reflect_tables_in_bulk_matches_autoload(engine_with_academics):
+    engine, schema = engine_with_academics
+    oids = [get_oid_from_table(name, schema, engine) for name in ACADEMICS_TABLE_NAMES]
+    bulk_tables = reflect_tables_in_bulk(oids, engine, metadata=get_empty_metadata())
+    autoload_metadata = get_empty_metadata()
+    for oid, name in zip(oids, ACADEMICS_TABLE_NAMES):
+        autoloaded_table = reflect_table(name, schema, engine, metadata=autoload_metadata)
+        assert _get_description(bulk_tables[oid]) == _get_description(autoloaded_table)
+
+
+def test_reflect_tables_in_bulk_constraints_and_indexes(engine_with_schema):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            SET search_path={schema};
+            CREATE TABLE referent (id SERIAL PRIMARY KEY, code TEXT UNIQUE);
+            CREATE TABLE referrer (
+                id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                referent_id INTEGER REFERENCES referent (id) ON DELETE CASCADE,
+                amount NUMERIC DEFAULT 1 CHECK (amount > 0),
+                doubled NUMERIC GENERATED ALWAYS AS (amount * 2) STORED,
+                label VARCHAR(20) NOT NULL,
+                UNIQUE (referent_id, label)
+            );
+            CREATE INDEX referrer_label_idx ON referrer (label DESC);
+            CREATE UNIQUE INDEX referrer_partial_idx ON referrer (amount) WHERE amount > 10;
+        """))
+    referrer_oid = get_oid_from_table('referrer', schema, engine)
+    metadata = get_empty_metadata()
+    bulk_table = reflect_tables_in_bulk([referrer_oid], engine, metadata=metadata)[referrer_oid]
+    autoloaded_table = reflect_table('referrer', schema, engine, metadata=get_empty_metadata())
+    assert _get_description(bulk_table) == _get_description(autoloaded_table)
+    assert bulk_table.c.doubled.computed is not None
+    assert bulk_table.c.id.identity is not None
+    partial_index = next(index for index in bulk_table.indexes if index.name == 'referrer_partial_idx')
+    assert partial_index.dialect_options['postgresql']['where'] is not None
+    # Referenced tables are reflected too, so that foreign keys resolve.
+    assert f'{schema}.referent' in metadata.tables
+
+
+def test_reflect_tables_in_bulk_keep_existing(engine_with_academics):
+    engine, schema = engine_with_academics
+    oid = get_oid_from_table('academics', schema, engine)
+    metadata = get_empty_metadata()
+    existing_table = Table('academics', metadata, schema=schema)
+    tables = reflect_tables_in_bulk([oid], engine, metadata=metadata, keep_existing=True)
+    assert tables[oid] is existing_table
+    assert len(existing_table.columns) == 0
+
+
+def test_reflect_tables_in_bulk_extends_without_duplicates(engine_with_academics):
+    engine, schema = engine_with_academics
+    oid = get_oid_from_table('academics', schema, engine)
+    metadata = get_empty_metadata()
+    first = reflect_tables_in_bulk([oid], engine, metadata=metadata)[oid]
+    description = _get_description(first)
+    second = reflect_tables_in_bulk([oid], engine, metadata=metadata)[oid]
+    assert second is first
+    assert _get_description(second) == description
+
+
+@pytest.mark.parametrize('oids', [[], [0]])
+def test_reflect_tables_in_bulk_missing(engine_with_schema, oids):
+    engine, _ = engine_with_schema
+    assert reflect_tables_in_bulk(oids, engine, metadata=get_empty_metadata()) == {}
+
+
+def test_dialect_internals_supported(engine):
+    # Fails if an upgrade of SQLAlchemy changes the private dialect methods used for bulk
+    # reflection, which would otherwise silently fall back to autoload.
+    assert has_supported_dialect_internals(engine.dialect)
+
+
+def test_reflect_tables_in_bulk_falls_back_to_autoload(engine_with_academics):
+    engine, schema = engine_with_academics
+    oids = [get_oid_from_table(name, schema, engine) for name in ACADEMICS_TABLE_NAMES]
+    bulk_tables = reflect_tables_in_bulk(oids, engine, metadata=get_empty_metadata())
+    with patch.object(bulk_reflect, 'has_supported_dialect_internals', return_value=False):
+        fallback_tables = reflect_tables_in_bulk(oids, engine, metadata=get_empty_metadata())
+    for oid in oids:
+        assert _get_description(fallback_tables[oid]) == _get_description(bulk_tables[oid])
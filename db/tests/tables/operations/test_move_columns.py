@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData, select
+from sqlalchemy import MetaData, select, text
 
 from db.columns.operations.select import get_columns_attnum_from_names
 from db.tables.operations.move_columns import move_columns_between_related_tables
@@ -152,3 +152,34 @@ def test_move_columns_moves_correct_data_from_rem_to_extract(extracted_remainder
 
     # check that expected and actual tuple tables match
     assert sorted(expect_tuples) == sorted(actual_tuples)
+
+
+def test_move_columns_online_from_ext_to_rem(extracted_remainder_roster, roster_extracted_cols, roster_fkey_col):
+    extracted, remainder, engine, schema = extracted_remainder_roster
+    moving_col = roster_extracted_cols[0]
+    extracted_oid = get_oid_from_table(extracted.name, schema, engine)
+    remainder_oid = get_oid_from_table(remainder.name, schema, engine)
+    expect_sel = select(remainder.c.id, extracted.c[moving_col]).select_from(
+        remainder.join(extracted, remainder.c[roster_fkey_col] == extracted.c.id)
+    )
+    with engine.begin() as conn:
+        expect_rows = conn.execute(expect_sel).fetchall()
+    column_attnums_to_move = get_columns_attnum_from_names(extracted_oid, [moving_col], engine, metadata=get_empty_metadata())
+    new_remainder, new_extracted = move_columns_between_related_tables(
+        extracted_oid,
+        remainder_oid,
+        column_attnums_to_move,
+        schema,
+        engine,
+        batch_size=5,
+    )
+    assert moving_col not in new_extracted.columns
+    with engine.begin() as conn:
+        actual_rows = conn.execute(
+            select(new_remainder.c.id, new_remainder.c[moving_col]).where(new_remainder.c[roster_fkey_col].isnot(None))
+        ).fetchall()
+        trigger_count = conn.execute(
+            text("SELECT count(*) FROM pg_trigger WHERE tgname LIKE 'mathesar_online_%'")
+        ).scalar()
+    assert sorted(actual_rows) == sorted(expect_rows)
+    assert trigger_count == 0
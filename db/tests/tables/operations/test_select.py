@@ -231,3 +231,21 @@ def test_get_description_from_table(roster_table_name, engine_with_roster):
     actual_comment = ma_sel.get_table_description(roster_table_oid, engine)
 
     assert actual_comment == expect_comment
+
+
+@pytest.mark.parametrize(
+    'existing_names,base_name,first_suffix,expect',
+    [
+        ([], 'Table', 0, (False, 0)),
+        (['Table 2', 'Table 3', 'Tables 7', 'Table 4x'], 'Table', 0, (False, 4)),
+        (['patents'], 'patents', 1, (True, 1)),
+        (['patents', 'patents 1', 'patents 5'], 'patents', 1, (True, 6)),
+    ]
+)
+def test_get_next_table_name_suffix(engine_with_schema, existing_names, base_name, first_suffix, expect):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        for name in existing_names:
+            conn.execute(text(f'CREATE TABLE "{schema}"."{name}" (id INTEGER)'))
+    actual = ma_sel.get_next_table_name_suffix(base_name, schema, engine, first_suffix=first_suffix)
+    assert actual == expect
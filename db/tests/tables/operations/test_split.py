@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData, select
+from sqlalchemy import MetaData, func, select, text
 
 from db import constants
 from db.columns.defaults import DEFAULT_COLUMNS
@@ -141,3 +141,59 @@ def test_extract_columns_leaves_correct_data(engine_with_roster, roster_table_na
     with engine.begin() as conn:
         actual_tuples = conn.execute(actual_tuple_sel).fetchall()
     assert sorted(expect_tuples) == sorted(actual_tuples)
+
+
+def test_extract_columns_online_matches_offline(engine_with_roster, roster_table_name, roster_extracted_cols, teachers_table_name, roster_fkey_col):
+    engine, schema = engine_with_roster
+    metadata = get_empty_metadata()
+    roster = reflect_table(roster_table_name, schema, engine, metadata=metadata)
+    roster_table_oid = get_oid_from_table(roster_table_name, schema, engine)
+    roster_extracted_col_attnums = get_columns_attnum_from_names(roster_table_oid, roster_extracted_cols, engine, metadata=metadata)
+    with engine.begin() as conn:
+        expect_tuples = conn.execute(
+            select([roster.columns[constants.ID]] + [roster.columns[name] for name in roster_extracted_cols])
+        ).fetchall()
+    progress = []
+    extracted, remainder, fk_column_name = extract_columns_from_table(
+        roster_table_oid,
+        roster_extracted_col_attnums,
+        teachers_table_name,
+        schema,
+        engine,
+        batch_size=7,
+        on_progress=lambda processed, total: progress.append(processed),
+    )
+    assert fk_column_name == roster_fkey_col
+    assert progress == sorted(progress) and progress[-1] == len(expect_tuples)
+    assert [fk.column.table.name for fk in remainder.foreign_keys] == [teachers_table_name]
+    assert not any(name in remainder.columns for name in roster_extracted_cols)
+    assert sorted(col.name for col in extracted.columns if col.name not in DEFAULT_COLUMNS) == sorted(roster_extracted_cols)
+    actual_tuple_sel = select(
+        [remainder.columns[constants.ID]] + [extracted.columns[name] for name in roster_extracted_cols]
+    ).select_from(
+        remainder.join(extracted, remainder.columns[fk_column_name] == extracted.columns[constants.ID])
+    )
+    with engine.begin() as conn:
+        actual_tuples = conn.execute(actual_tuple_sel).fetchall()
+        extracted_count = conn.execute(select(func.count()).select_from(extracted)).scalar()
+    assert sorted(expect_tuples) == sorted(actual_tuples)
+    assert extracted_count == len({tuple(row[1:]) for row in expect_tuples})
+
+
+def test_extract_columns_online_deduplicates_equal_values(engine_with_schema):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE "{schema}".measurements (id SERIAL PRIMARY KEY, amount NUMERIC, duration INTERVAL);
+            INSERT INTO "{schema}".measurements (amount, duration) VALUES
+              (1.0, '1 day'), (1.00, '24 hours'), (2, '1 day');
+        """))
+    table_oid = get_oid_from_table('measurements', schema, engine)
+    attnums = get_columns_attnum_from_names(table_oid, ['amount', 'duration'], engine, metadata=get_empty_metadata())
+    extracted, _, _ = extract_columns_from_table(
+        table_oid, attnums, 'amounts', schema, engine, batch_size=1,
+    )
+    with engine.begin() as conn:
+        extracted_count = conn.execute(select(func.count()).select_from(extracted)).scalar()
+    # The same as the offline split, which groups values by equality.
+    assert extracted_count == 2
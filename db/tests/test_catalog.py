@@ -0,0 +1,46 @@
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+
+from db.catalog import get_catalog_snapshot
+from db.schemas.operations.select import get_mathesar_schemas_with_oids
+from db.schemas.utils import get_schema_oid_from_name
+from db.tables.operations.select import get_oid_from_table
+
+
+def test_catalog_snapshot(engine_with_schema):
+    engine, schema = engine_with_schema
+    metadata = MetaData(bind=engine, schema=schema)
+    referent = Table(
+        "referent",
+        metadata,
+        Column("id", Integer, primary_key=True),
+    )
+    Table(
+        "referrer",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String, nullable=False),
+        Column("referent_id", Integer, ForeignKey(referent.c.id)),
+    )
+    metadata.create_all()
+    referent_oid = get_oid_from_table("referent", schema, engine)
+    referrer_oid = get_oid_from_table("referrer", schema, engine)
+
+    catalog = get_catalog_snapshot(engine)
+
+    schema_oid = get_schema_oid_from_name(schema, engine)
+    assert set(catalog.schemas) == {row['oid'] for row in get_mathesar_schemas_with_oids(engine)}
+    assert catalog.schemas[schema_oid].name == schema
+    assert {table.oid for table in catalog.get_tables([schema_oid])} == {referent_oid, referrer_oid}
+    assert [column.name for column in catalog.get_columns([referrer_oid])] == ['id', 'name', 'referent_id']
+    name_column = catalog.columns[(referrer_oid, 2)]
+    assert name_column.type == 'character varying'
+    assert name_column.nullable is False
+    assert catalog.get_column_name(referrer_oid, 3) == 'referent_id'
+    foreign_keys = [
+        constraint for constraint in catalog.constraints.values()
+        if constraint.table_oid == referrer_oid and constraint.type == 'f'
+    ]
+    assert len(foreign_keys) == 1
+    assert foreign_keys[0].columns == [3]
+    assert foreign_keys[0].referent_table_oid == referent_oid
+    assert foreign_keys[0].referent_columns == [1]
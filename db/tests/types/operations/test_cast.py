@@ -13,6 +13,7 @@ from db.columns.operations.alter import alter_column_type
 from db.tables.operations.select import get_oid_from_table
 from db.types.custom import multicurrency
 from db.types.operations import cast as cast_operations
+from db.types import base as db_types_base
 from db.types.operations.convert import get_db_type_enum_from_class
 from db.types.base import (
     DatabaseType, PostgresType, MathesarCustomType, get_available_known_db_types,
@@ -1484,6 +1485,26 @@ def test_get_full_cast_map(engine_with_schema, source_type, expect_target_types)
     assert set(actual_target_types) == set(expect_target_types)
 
 
+def test_get_full_cast_map_cached_until_types_change(engine_with_schema, monkeypatch):
+    engine, schema = engine_with_schema
+    cast_map = cast_operations.get_full_cast_map(engine)
+    type_id_queries = []
+    get_type_ids_on_database = db_types_base.get_type_ids_on_database
+
+    def _get_type_ids_on_database(engine):
+        type_id_queries.append(engine)
+        return get_type_ids_on_database(engine)
+    monkeypatch.setattr(db_types_base, 'get_type_ids_on_database', _get_type_ids_on_database)
+
+    assert cast_operations.get_full_cast_map(engine) is cast_map
+    assert type_id_queries == []
+
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE TYPE "{schema}".cast_map_test_type AS ENUM (\'a\')'))
+    assert cast_operations.get_full_cast_map(engine) == cast_map
+    assert len(type_id_queries) == 1
+
+
 money_array_examples = [
     ('$1,000.00', ['1,000.00', ',', '.', '$']),
     ('1,000.00$', ['1,000.00', ',', '.', '$']),
@@ -16,3 +16,39 @@ def test_create_type_schema_when_exists(engine):
     # already exists when it's run.
     install.create_type_schema(engine)
     install.create_type_schema(engine)
+
+
+def test_install_mathesar_on_database_skips_installed_version(engine):
+    # The test database already has Mathesar installed.
+    timings = install.install_mathesar_on_database(engine)
+    assert set(timings) == {'generate', 'check_version'}
+    assert install.get_installed_version(engine) == install.get_install_version(
+        install.get_install_queries(engine)
+    )
+
+
+def test_install_mathesar_on_database_is_idempotent(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"COMMENT ON SCHEMA {base.get_ma_qualified_schema()} IS 'outdated'"))
+    timings = install.install_mathesar_on_database(engine)
+    assert set(timings) == {'generate', 'check_version', 'execute'}
+    assert all(duration >= 0 for duration in timings.values())
+    assert install.get_installed_version(engine) != 'outdated'
+    with engine.connect() as conn:
+        res = conn.execute(text(f"SELECT count(*) FROM {base.get_qualified_name('top_level_domains')}"))
+        assert res.scalar() > 0
+
+
+def test_install_mathesar_on_database_updates_domain_check(engine):
+    email_id = base.MathesarCustomType.EMAIL.id
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER DOMAIN {email_id} ADD CONSTRAINT outdated_check CHECK (true)"))
+        conn.execute(text(f"COMMENT ON SCHEMA {base.get_ma_qualified_schema()} IS 'outdated'"))
+    install.install_mathesar_on_database(engine)
+    with engine.connect() as conn:
+        res = conn.execute(text(
+            f"SELECT conname FROM pg_catalog.pg_constraint WHERE contypid = '{email_id}'::regtype"
+        ))
+        constraint_names = [row[0] for row in res]
+    assert len(constraint_names) == 1
+    assert constraint_names[0].startswith('email_check_')
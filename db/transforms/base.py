@@ -189,11 +189,20 @@ class Search(Transform):
     def limit_spec(self):
         return self.spec[1]
 
+    @property
+    def backend_spec(self):
+        """
+        Optional; see db.records.operations.relevance.SearchBackend.
+        """
+        return self.spec[2] if len(self.spec) > 2 else None
+
     def apply_to_relation(self, relation):
         search = self.search_spec
         limit = self.limit_spec
         search_params = {search_obj['column']: search_obj['literal'] for search_obj in search}
-        executable = relevance.get_rank_and_filter_rows_query(relation, search_params, limit)
+        executable = relevance.get_rank_and_filter_rows_query(
+            relation, search_params, limit, backend=self.backend_spec
+        )
         return _to_non_executable(executable)
 
 
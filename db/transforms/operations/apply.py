@@ -27,6 +27,7 @@ def apply_transformations_deprecated(
     group_by=None,
     duplicate_only=None,
     search=None,
+    search_backend=None,
 ):
     # TODO rename the actual method parameter
     if search is None:
@@ -46,7 +47,7 @@ def apply_transformations_deprecated(
     if order_by:
         transforms.append(base.Order(order_by))
     if search:
-        transforms.append(base.Search([search, limit]))
+        transforms.append(base.Search([search, limit, search_backend]))
     if columns_to_select:
         transforms.append(base.SelectSubsetOfColumns(columns_to_select))
     if offset:
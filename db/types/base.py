@@ -1,3 +1,4 @@
+import hashlib
 from enum import Enum
 
 from sqlalchemy import text, create_engine as sa_create_engine
@@ -157,6 +158,67 @@ def get_qualified_name(unqualified_name):
     return ".".join([qualifier_prefix, unqualified_name])
 
 
+def get_create_type_if_missing_sql(create_type_sql):
+    """
+    Wraps a CREATE TYPE statement so that running it again is a no-op, since Postgres has no IF
+    NOT EXISTS for it. Existing types aren't dropped, because columns may be using them, so
+    changing the definition of an installed type needs its own ALTER TYPE statements.
+    """
+    return f"""
+    DO $$ BEGIN
+        {create_type_sql.strip()}
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$;
+    """
+
+
+def get_create_or_update_domain_sql(qualified_name, base_type, check=None):
+    """
+    Returns SQL that creates a domain over the given base type, with the given CHECK expression,
+    or brings an existing one up to date. Existing domains aren't dropped, because columns may be
+    using them. Instead, the check constraint is named after a hash of its expression, and the
+    check constraints of a domain lacking that name are replaced. A domain with another base type
+    can't be altered, so that raises an error.
+    """
+    unqualified_name = qualified_name.split('.')[-1]
+    if check is None:
+        constraint_sql = ''
+        add_constraint_sql = ''
+        constraint_name = ''
+    else:
+        check_hash = hashlib.md5(check.encode()).hexdigest()[:8]
+        constraint_name = f'{unqualified_name}_check_{check_hash}'
+        constraint_sql = f'CONSTRAINT {constraint_name} CHECK ({check})'
+        add_constraint_sql = f'ALTER DOMAIN {qualified_name} ADD {constraint_sql};'
+    return f"""
+    DO $$
+    DECLARE
+        old_constraint_name text;
+    BEGIN
+        CREATE DOMAIN {qualified_name} AS {base_type} {constraint_sql};
+    EXCEPTION WHEN duplicate_object THEN
+        IF (
+            SELECT typbasetype FROM pg_catalog.pg_type WHERE oid = '{qualified_name}'::regtype
+        ) <> '{base_type}'::regtype THEN
+            RAISE EXCEPTION 'Domain {qualified_name} does not have the base type {base_type}';
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_catalog.pg_constraint
+            WHERE contypid = '{qualified_name}'::regtype AND conname = '{constraint_name}'
+        ) THEN
+            FOR old_constraint_name IN
+                SELECT conname FROM pg_catalog.pg_constraint
+                WHERE contypid = '{qualified_name}'::regtype AND contype = 'c'
+            LOOP
+                EXECUTE 'ALTER DOMAIN {qualified_name} DROP CONSTRAINT '
+                    || quote_ident(old_constraint_name);
+            END LOOP;
+            {add_constraint_sql}
+        END IF;
+    END $$;
+    """
+
+
 # TODO big misnomer!
 # we already have a concept of Mathesar types (UI types) in the mathesar namespace.
 # maybe rename to just CustomType?
@@ -217,9 +279,17 @@ def get_available_known_db_types(engine):
     """
     Returns a tuple of DatabaseType instances that are not ignored and are available on provided
     engine.
+
+    The result is cached per database, and recomputed only when the database's type catalog
+    changes, which is checked via a single-row query.
     """
+    catalog_version = _get_types_catalog_version(engine)
+    cache_key = str(engine.url)
+    cached = _available_known_db_types_cache.get(cache_key)
+    if cached is not None and cached[0] == catalog_version:
+        return cached[1]
     type_ids_on_database = get_type_ids_on_database(engine)
-    return tuple(
+    available_known_db_types = tuple(
         db_type
         for db_type in known_db_types
         if (
@@ -230,6 +300,26 @@ def get_available_known_db_types(engine):
             )
         )
     )
+    _available_known_db_types_cache[cache_key] = (catalog_version, available_known_db_types)
+    return available_known_db_types
+
+
+def clear_available_known_db_types_cache():
+    _available_known_db_types_cache.clear()
+
+
+def _get_types_catalog_version(engine):
+    """
+    Returns a value that changes whenever types are created or dropped on the database: creating
+    a type gives it a new, higher oid, and dropping one lowers the count.
+    """
+    select_statement = text(
+        "SELECT count(*) AS num_types, coalesce(max(oid::bigint), 0) AS max_oid"
+        " FROM pg_catalog.pg_type"
+    )
+    with engine.connect() as connection:
+        row = connection.execute(select_statement).first()
+    return row.num_types, row.max_oid
 
 
 def get_type_ids_on_database(engine):
@@ -256,3 +346,7 @@ def get_type_ids_on_database(engine):
 
 class UnknownDbTypeId(Exception):
     pass
+
+
+# Maps database URLs to (catalog version, available known DB types) tuples.
+_available_known_db_types_cache = {}
@@ -1,7 +1,7 @@
 from sqlalchemy import text, TEXT
 from sqlalchemy.types import UserDefinedType
 
-from db.types.base import MathesarCustomType
+from db.types.base import MathesarCustomType, get_create_or_update_domain_sql
 from db.types.custom.underlying_type import HasUnderlyingType
 
 DB_TYPE = MathesarCustomType.EMAIL.id
@@ -26,16 +26,13 @@ class Email(UserDefinedType, HasUnderlyingType):
         return DB_TYPE.upper()
 
 
-def install(engine):
+def get_install_sql():
     # We'll use postgres domains to check that a given string conforms to what
     # an email should look like.  We also create some DB-level functions to
     # split out the different parts of an email address for grouping.
-    drop_domain_query = f"""
-    DROP DOMAIN IF EXISTS {DB_TYPE};
-    """
-    create_domain_query = f"""
-    CREATE DOMAIN {DB_TYPE} AS text CHECK (value ~ {EMAIL_REGEX_STR});
-    """
+    create_domain_query = get_create_or_update_domain_sql(
+        DB_TYPE, 'text', check=f'value ~ {EMAIL_REGEX_STR}'
+    )
     create_email_domain_name_query = f"""
     CREATE OR REPLACE FUNCTION {EMAIL_DOMAIN_NAME}({DB_TYPE})
     RETURNS text AS $$
@@ -50,9 +47,15 @@ def install(engine):
     $$
     LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
     """
+    return ''.join(
+        [
+            create_domain_query,
+            create_email_domain_name_query,
+            create_email_local_part_query,
+        ]
+    )
+
+
+def install(engine):
     with engine.begin() as conn:
-        conn.execute(text(drop_domain_query))
-        conn.execute(text(create_domain_query))
-        conn.execute(text(create_email_domain_name_query))
-        conn.execute(text(create_email_local_part_query))
-        conn.commit()
+        conn.execute(text(get_install_sql()))
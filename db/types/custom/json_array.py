@@ -3,7 +3,7 @@ from sqlalchemy.dialects.postgresql import JSONB as SA_JSONB, TEXT
 from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.compiler import compiles
 
-from db.types.base import MathesarCustomType
+from db.types.base import MathesarCustomType, get_create_or_update_domain_sql
 
 DB_TYPE = MathesarCustomType.MATHESAR_JSON_ARRAY.id
 
@@ -31,15 +31,12 @@ def _compile_mathesarjsonobject(element, compiler, **kw):
     return changed_compiled_string
 
 
-def install(engine):
-    drop_domain_query = f"""
-    DROP DOMAIN IF EXISTS {DB_TYPE};
-    """
-    create_domain_query = f"""
-    CREATE DOMAIN {DB_TYPE} AS JSONB CHECK (jsonb_typeof(VALUE) = 'array');
-    """
+def get_install_sql():
+    return get_create_or_update_domain_sql(
+        DB_TYPE, 'JSONB', check="jsonb_typeof(VALUE) = 'array'"
+    )
+
 
+def install(engine):
     with engine.begin() as conn:
-        conn.execute(text(drop_domain_query))
-        conn.execute(text(create_domain_query))
-        conn.commit()
+        conn.execute(text(get_install_sql()))
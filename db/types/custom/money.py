@@ -1,7 +1,7 @@
 from sqlalchemy import ARRAY, String, func, select, text, NUMERIC
 from sqlalchemy.types import UserDefinedType
 
-from db.types.base import MathesarCustomType
+from db.types.base import MathesarCustomType, get_create_or_update_domain_sql
 from db.columns.operations.select import get_column_name_from_attnum
 from db.tables.operations.select import reflect_table_from_oid
 from db.types.base import get_ma_qualified_schema
@@ -19,18 +19,13 @@ class MathesarMoney(UserDefinedType, HasUnderlyingType):
         return DB_TYPE.upper()
 
 
-def install(engine):
-    drop_domain_query = f"""
-    DROP DOMAIN IF EXISTS {DB_TYPE};
-    """
-    create_domain_query = f"""
-    CREATE DOMAIN {DB_TYPE} AS NUMERIC;
-    """
+def get_install_sql():
+    return get_create_or_update_domain_sql(DB_TYPE, 'NUMERIC')
+
 
+def install(engine):
     with engine.begin() as conn:
-        conn.execute(text(drop_domain_query))
-        conn.execute(text(create_domain_query))
-        conn.commit()
+        conn.execute(text(get_install_sql()))
 
 
 def get_money_array_select_statement(table_oid, engine, column_attnum):
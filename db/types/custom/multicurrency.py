@@ -2,7 +2,7 @@ from psycopg2.extras import Json
 from sqlalchemy import cast, text, func
 from sqlalchemy.types import UserDefinedType
 
-from db.types.base import MathesarCustomType
+from db.types.base import MathesarCustomType, get_create_type_if_missing_sql
 
 DB_TYPE = MathesarCustomType.MULTICURRENCY_MONEY.id
 VALUE = 'value'
@@ -24,17 +24,13 @@ class MulticurrencyMoney(UserDefinedType):
         return func.to_json(col)
 
 
-def install(engine):
-
-    drop_type_query = f"""
-    DROP TYPE IF EXISTS {DB_TYPE};
-    """
-
+def get_install_sql():
     create_type_query = f"""
     CREATE TYPE {DB_TYPE} AS ({VALUE} NUMERIC, {CURRENCY} CHAR(3));
     """
+    return get_create_type_if_missing_sql(create_type_query)
+
 
+def install(engine):
     with engine.begin() as conn:
-        conn.execute(text(drop_type_query))
-        conn.execute(text(create_type_query))
-        conn.commit()
+        conn.execute(text(get_install_sql()))
@@ -1,9 +1,9 @@
 from enum import Enum
 import os
-from sqlalchemy import text, Table, Column, String, MetaData, TEXT
+from sqlalchemy import text, TEXT
 from sqlalchemy.types import UserDefinedType
 
-from db.types.base import MathesarCustomType, PostgresType, get_qualified_name, get_ma_qualified_schema
+from db.types.base import MathesarCustomType, PostgresType, get_create_or_update_domain_sql, get_qualified_name
 from db.types.custom.underlying_type import HasUnderlyingType
 
 DB_TYPE = MathesarCustomType.URI.id
@@ -39,11 +39,7 @@ class URI(UserDefinedType, HasUnderlyingType):
         return DB_TYPE.upper()
 
 
-def install(engine):
-    drop_domain_query = f"""
-    DROP DOMAIN IF EXISTS {DB_TYPE};
-    """
-
+def get_install_sql():
     create_uri_parts_query = f"""
     CREATE OR REPLACE FUNCTION {URIFunction.PARTS.value}({PostgresType.TEXT.value})
     RETURNS {PostgresType.TEXT.value}[] AS $$
@@ -59,39 +55,47 @@ def install(engine):
         URIFunction.FRAGMENT.value: 9,
     }
 
-    create_domain_query = f"""
-    CREATE DOMAIN {DB_TYPE} AS text CHECK (
-        (value IS NULL) OR ({URIFunction.SCHEME.value}(value) IS NOT NULL
-        AND {URIFunction.PATH.value}(value) IS NOT NULL)
-    );
-    """
+    create_domain_query = get_create_or_update_domain_sql(
+        DB_TYPE,
+        'text',
+        check=(
+            f'(value IS NULL) OR ({URIFunction.SCHEME.value}(value) IS NOT NULL'
+            f' AND {URIFunction.PATH.value}(value) IS NOT NULL)'
+        ),
+    )
+
+    install_queries = [create_uri_parts_query]
+    for part, index in uri_parts_map.items():
+        create_uri_part_getter_query = f"""
+        CREATE OR REPLACE FUNCTION {part}({PostgresType.TEXT.value})
+        RETURNS {PostgresType.TEXT.value} AS $$
+            SELECT ({URIFunction.PARTS.value}($1))[{index}];
+        $$
+        LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
+        """
+        install_queries.append(create_uri_part_getter_query)
+    install_queries.append(create_domain_query)
+    return ''.join(install_queries)
 
+
+def install(engine):
     with engine.begin() as conn:
-        conn.execute(text(drop_domain_query))
-        conn.execute(text(create_uri_parts_query))
-        for part, index in uri_parts_map.items():
-            create_uri_part_getter_query = f"""
-            CREATE OR REPLACE FUNCTION {part}({PostgresType.TEXT.value})
-            RETURNS {PostgresType.TEXT.value} AS $$
-                SELECT ({URIFunction.PARTS.value}($1))[{index}];
-            $$
-            LANGUAGE SQL IMMUTABLE RETURNS NULL ON NULL INPUT;
-            """
-            conn.execute(text(create_uri_part_getter_query))
-        conn.execute(text(create_domain_query))
-        conn.commit()
+        conn.execute(text(get_install_sql()))
+
+
+def get_tld_lookup_table_install_sql():
+    """
+    Creates the top level domains table unless it exists, and fills in any missing domains.
+    """
+    with open(TLDS_PATH) as f:
+        tlds = [tld.strip().lower() for tld in f if tld[:2] != "# "]
+    tld_values = ', '.join("('" + tld.replace("'", "''") + "')" for tld in tlds)
+    return f"""
+    CREATE TABLE IF NOT EXISTS {QUALIFIED_TLDS} (tld VARCHAR PRIMARY KEY);
+    INSERT INTO {QUALIFIED_TLDS} (tld) VALUES {tld_values} ON CONFLICT DO NOTHING;
+    """
 
 
 def install_tld_lookup_table(engine):
-    tlds_table = Table(
-        TLDS_TABLE_NAME,
-        MetaData(bind=engine),
-        Column("tld", String, primary_key=True),
-        schema=get_ma_qualified_schema(),
-    )
-    tlds_table.create()
-    with engine.begin() as conn, open(TLDS_PATH) as f:
-        conn.execute(
-            tlds_table.insert(),
-            [{"tld": tld.strip().lower()} for tld in f if tld[:2] != "# "],
-        )
+    with engine.begin() as conn:
+        conn.execute(text(get_tld_lookup_table_install_sql()))
@@ -1,8 +1,19 @@
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
 from db.types.custom import email, money, multicurrency, uri, json_array, json_object
-from db.types.base import SCHEMA
+from db.types.base import (
+    SCHEMA, MathesarCustomType, get_ma_qualified_schema, get_type_ids_on_database, known_db_types,
+)
 from db.schemas.operations.create import create_schema
 from db.schemas.operations.drop import drop_schema
-from db.types.operations.cast import install_all_casts
+from db.types.operations.cast import get_install_all_casts_queries
+
+logger = logging.getLogger(__name__)
 
 
 def create_type_schema(engine):
@@ -10,15 +21,74 @@ def create_type_schema(engine):
 
 
 def install_mathesar_on_database(engine):
-    create_type_schema(engine)
-    email.install(engine)
-    money.install(engine)
-    multicurrency.install(engine)
-    uri.install(engine)
-    uri.install_tld_lookup_table(engine)
-    json_array.install(engine)
-    json_object.install(engine)
-    install_all_casts(engine)
+    """
+    Installs Mathesar's custom types, their functions and the cast functions on the database via
+    a single script run in one transaction. The installed version is recorded as the comment of
+    the types schema, and the install is skipped if that version is already installed.
+
+    Returns a dict mapping each install phase that ran to its duration in seconds: 'generate' for
+    generating the queries, 'check_version' for checking the installed version and 'execute' for
+    running the script. The durations are also logged.
+    """
+    timings = {}
+    with _timed(timings, 'generate'):
+        install_queries = get_install_queries(engine)
+        version = get_install_version(install_queries)
+    with _timed(timings, 'check_version'):
+        is_installed = get_installed_version(engine) == version
+    if not is_installed:
+        with _timed(timings, 'execute'):
+            install_queries.append(f"COMMENT ON SCHEMA {get_ma_qualified_schema()} IS '{version}';")
+            with engine.begin() as conn:
+                conn.execute(text(''.join(install_queries)))
+    logger.info(
+        f'Mathesar install on {engine.url.database}: '
+        + ', '.join(f'{phase} {duration:.3f} secs' for phase, duration in timings.items())
+    )
+    return timings
+
+
+def get_install_queries(engine):
+    """
+    Returns the queries that install Mathesar on the database, in order. They're idempotent: types
+    are only created if missing, domains are brought up to date, and functions are replaced.
+    """
+    # Casts from the custom types are created along with the types themselves.
+    type_ids_on_database = get_type_ids_on_database(engine)
+    supported_types = sorted(
+        (
+            db_type for db_type in known_db_types
+            if not db_type.is_ignored
+            and (db_type.id in type_ids_on_database or isinstance(db_type, MathesarCustomType))
+        ),
+        key=lambda db_type: db_type.id
+    )
+    return [
+        f"CREATE SCHEMA IF NOT EXISTS {get_ma_qualified_schema()};",
+        email.get_install_sql(),
+        money.get_install_sql(),
+        multicurrency.get_install_sql(),
+        uri.get_install_sql(),
+        uri.get_tld_lookup_table_install_sql(),
+        json_array.get_install_sql(),
+        json_object.get_install_sql(),
+        *get_install_all_casts_queries(supported_types),
+    ]
+
+
+def get_install_version(install_queries):
+    # Some queries are generated by iterating over sets, so their order isn't stable across
+    # processes. Queries that replace each other are always generated in the same order though.
+    return hashlib.md5(''.join(sorted(install_queries)).encode()).hexdigest()
+
+
+def get_installed_version(engine):
+    sel = text(
+        "SELECT pg_catalog.obj_description(oid, 'pg_namespace') AS version"
+        " FROM pg_catalog.pg_namespace WHERE nspname = :schema"
+    ).bindparams(schema=SCHEMA)
+    with engine.connect() as conn:
+        return conn.execute(sel).scalar()
 
 
 def uninstall_mathesar_from_database(engine):
@@ -27,3 +97,10 @@ def uninstall_mathesar_from_database(engine):
 
 def _cascade_type_schema(engine):
     drop_schema(SCHEMA, engine, cascade=True)
+
+
+@contextmanager
+def _timed(timings, phase):
+    start = time.perf_counter()
+    yield
+    timings[phase] = time.perf_counter() - start
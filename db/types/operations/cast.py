@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from frozendict import frozendict
 
 from sqlalchemy import text
@@ -43,20 +45,61 @@ def get_column_cast_expression(column, target_type, engine, type_options=None):
 
 
 def install_all_casts(engine):
-    create_boolean_casts(engine)
-    create_date_casts(engine)
-    create_decimal_number_casts(engine)
-    create_email_casts(engine)
-    create_integer_casts(engine)
-    create_interval_casts(engine)
-    create_datetime_casts(engine)
-    create_mathesar_money_casts(engine)
-    create_money_casts(engine)
-    create_multicurrency_money_casts(engine)
-    create_textual_casts(engine)
-    create_uri_casts(engine)
-    create_numeric_casts(engine)
-    create_json_casts(engine)
+    install_queries = get_install_all_casts_queries(get_available_known_db_types(engine))
+    with engine.begin() as conn:
+        conn.execute(text(''.join(install_queries)))
+
+
+def get_install_all_casts_queries(supported_types):
+    """
+    Returns the queries that create all cast functions, for casting from the given supported
+    types (and others) to the types supported by Mathesar.
+
+    Later functions replace earlier ones with the same signature, so the queries have to be run
+    in order.
+    """
+    install_queries = [
+        _build_mathesar_money_array_function(),
+        _build_numeric_array_function(),
+    ]
+    for target_type, type_body_map in _get_cast_type_body_maps(supported_types):
+        install_queries.extend(
+            assemble_function_creation_sql(type_, target_type, body)
+            for type_, body in type_body_map.items()
+        )
+    return install_queries
+
+
+def _get_cast_type_body_maps(supported_types):
+    """
+    Yields (target type, type body map) tuples in the same order as the create_*_casts functions
+    would create them.
+    """
+    yield PostgresType.BOOLEAN, _get_boolean_type_body_map()
+    yield PostgresType.DATE, _get_date_type_body_map()
+    for db_type in categories.DECIMAL_TYPES:
+        yield db_type, _get_decimal_number_type_body_map(target_type=db_type)
+    yield MathesarCustomType.EMAIL, _get_email_type_body_map()
+    for db_type in categories.INTEGER_TYPES:
+        yield db_type, _get_integer_type_body_map(target_type=db_type)
+    yield PostgresType.INTERVAL, _get_interval_type_body_map()
+    for time_type in [PostgresType.TIME_WITHOUT_TIME_ZONE, PostgresType.TIME_WITH_TIME_ZONE]:
+        yield time_type, _get_time_type_body_map(time_type)
+    yield (
+        PostgresType.TIMESTAMP_WITH_TIME_ZONE,
+        _get_timestamp_with_timezone_type_body_map(PostgresType.TIMESTAMP_WITH_TIME_ZONE)
+    )
+    yield PostgresType.TIMESTAMP_WITHOUT_TIME_ZONE, _get_timestamp_without_timezone_type_body_map()
+    yield MathesarCustomType.MATHESAR_MONEY, _get_mathesar_money_type_body_map()
+    yield PostgresType.MONEY, _get_money_type_body_map()
+    yield MathesarCustomType.MULTICURRENCY_MONEY, _get_multicurrency_money_type_body_map()
+    textual_type_body_map = _get_textual_type_body_map(supported_types=supported_types)
+    for db_type in categories.STRING_LIKE_TYPES:
+        yield db_type, textual_type_body_map
+    yield MathesarCustomType.URI, _get_uri_type_body_map()
+    yield PostgresType.NUMERIC, _get_numeric_type_body_map()
+    for db_type in categories.JSON_TYPES:
+        yield db_type, _get_json_type_body_map(db_type)
 
 
 def create_boolean_casts(engine):
@@ -158,12 +201,21 @@ def create_numeric_casts(engine):
 def get_full_cast_map(engine):
     """
     Returns a mapping of source types to target type sets.
+
+    The map only depends on the types available on the database, so it's built once per set of
+    available types.
     """
+    return _get_full_cast_map(get_available_known_db_types(engine))
+
+
+@lru_cache(maxsize=32)
+def _get_full_cast_map(available_known_db_types):
+    textual_type_body_map = _get_textual_type_body_map(supported_types=available_known_db_types)
     target_to_source_maps = {
         PostgresType.BIGINT: _get_integer_type_body_map(target_type=PostgresType.BIGINT),
         PostgresType.BOOLEAN: _get_boolean_type_body_map(),
-        PostgresType.CHARACTER: _get_textual_type_body_map(engine),
-        PostgresType.CHARACTER_VARYING: _get_textual_type_body_map(engine),
+        PostgresType.CHARACTER: textual_type_body_map,
+        PostgresType.CHARACTER_VARYING: textual_type_body_map,
         PostgresType.DATE: _get_date_type_body_map(),
         PostgresType.JSON: _get_json_type_body_map(target_type=PostgresType.JSON),
         PostgresType.JSONB: _get_json_type_body_map(target_type=PostgresType.JSONB),
@@ -183,7 +235,7 @@ def get_full_cast_map(engine):
         PostgresType.TIME_WITH_TIME_ZONE: _get_time_type_body_map(PostgresType.TIME_WITH_TIME_ZONE),
         PostgresType.TIMESTAMP_WITH_TIME_ZONE: _get_timestamp_with_timezone_type_body_map(PostgresType.TIMESTAMP_WITH_TIME_ZONE),
         PostgresType.TIMESTAMP_WITHOUT_TIME_ZONE: _get_timestamp_without_timezone_type_body_map(),
-        PostgresType.TEXT: _get_textual_type_body_map(engine),
+        PostgresType.TEXT: textual_type_body_map,
         MathesarCustomType.URI: _get_uri_type_body_map(),
     }
     # invert the map
@@ -805,7 +857,7 @@ def _get_multicurrency_money_type_body_map():
     return type_body_map
 
 
-def _get_textual_type_body_map(engine):
+def _get_textual_type_body_map(engine=None, supported_types=None):
     """
     Get SQL strings that create various functions for casting different
     types to text types through the TEXT type.
@@ -813,7 +865,8 @@ def _get_textual_type_body_map(engine):
     All casts to varchar use default PostgreSQL behavior.
     All types in get_supported_alter_column_types are supported.
     """
-    supported_types = get_available_known_db_types(engine)
+    if supported_types is None:
+        supported_types = get_available_known_db_types(engine)
     # We cast everything through TEXT so that formatting is done correctly
     # for CHAR.
     text_cast_str = f"""
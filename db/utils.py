@@ -24,6 +24,20 @@ def execute_statement(engine, statement, connection_to_use=None):
             raise e
 
 
+def execute_ddl(connection, statement):
+    # Not through text(), which would take colons in quoted identifiers for bind parameters, and
+    # without parameters, so that the driver doesn't take percent signs for placeholders.
+    connection.execution_options(no_parameters=True).exec_driver_sql(statement)
+
+
+def quote_identifier(identifier, engine):
+    return engine.dialect.identifier_preparer.quote(identifier)
+
+
+def quote_table(table, engine):
+    return engine.dialect.identifier_preparer.format_table(table)
+
+
 def execute_pg_query(engine, query, connection_to_use=None):
     if isinstance(query, sqlalchemy.sql.expression.Executable):
         executable = query
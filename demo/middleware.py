@@ -1,11 +1,10 @@
 """This module adds a middleware for the Live Demo."""
 import logging
 
-from django.conf import settings
-
-from demo.install import load_datasets, customize_settings
+from demo.install import customize_settings
 from demo.db_namer import get_name
-from db.install import create_mathesar_database
+from demo.provision import provision_demo_database
+from demo.reaper import reap_in_background, record_database_access, start_reaper
 from mathesar.database.base import create_mathesar_engine
 from mathesar.models.base import Database
 from mathesar.state import reset_reflection
@@ -17,6 +16,7 @@ logger = logging.getLogger(__name__)
 class LiveDemoModeMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        start_reaper()
 
     def __call__(self, request):
         sessionid = request.COOKIES.get('sessionid', None)
@@ -24,18 +24,13 @@ class LiveDemoModeMiddleware:
         db_name = get_name(str(sessionid))
         database, created = Database.current_objects.get_or_create(name=db_name)
         if created:
-            create_mathesar_database(
-                db_name,
-                username=settings.DATABASES["default"]["USER"],
-                password=settings.DATABASES["default"]["PASSWORD"],
-                hostname=settings.DATABASES["default"]["HOST"],
-                root_database=settings.DATABASES["default"]["NAME"],
-                port=settings.DATABASES["default"]["PORT"],
-            )
+            provision_demo_database(db_name)
             engine = create_mathesar_engine(db_name)
-            load_datasets(engine)
-            reset_reflection()
+            reset_reflection(db_name=db_name)
             customize_settings(engine)
+            reap_in_background()
+        else:
+            record_database_access(database)
 
         logger.debug(f"Using database {db_name} for sessionid {sessionid}")
         params = request.GET.copy()
@@ -0,0 +1,275 @@
+"""
+Provisions Live Demo databases by cloning a template database that already has Mathesar and the
+demo datasets installed, preferably from a warm pool of clones made ahead of time.
+
+The template and the pool databases are named after a version, a hash of the Mathesar install
+script and the demo datasets, so that an upgrade builds a new template and stops handing out
+databases made from the old one.
+"""
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from db.engine import create_future_engine
+from db.install import create_mathesar_database
+from db.types.install import get_install_queries, get_install_version
+from demo.install import RESOURCES, load_datasets
+from mathesar.database.base import create_mathesar_engine
+
+POOL_DB_NAME_PREFIX = 'mathesar_demo_pool_'
+# Held while building the template, so that only one process builds it.
+TEMPLATE_ADVISORY_LOCK_KEY = 5_820_163_407
+
+logger = logging.getLogger(__name__)
+
+
+def provision_demo_database(db_name):
+    """
+    Creates the database `db_name` with Mathesar and the demo datasets installed. A database from
+    the warm pool is renamed if one is available, otherwise the template is cloned. Either way,
+    the pool is refilled in the background.
+    """
+    root_engine = get_root_engine()
+    try:
+        if not _claim_pool_database(root_engine, db_name):
+            logger.debug(f"Demo database pool is empty, cloning template for {db_name}")
+            _clone_template_database(root_engine, db_name)
+    finally:
+        root_engine.dispose()
+    refill_pool_in_background()
+
+
+def refill_pool_in_background():
+    """
+    Starts a thread that clones the template until the pool has MATHESAR_DEMO_POOL_SIZE
+    databases, unless such a thread is already running in this process.
+    """
+    with _refill_lock:
+        global _refill_thread
+        if _refill_thread is not None and _refill_thread.is_alive():
+            return
+        _refill_thread = threading.Thread(target=refill_pool, daemon=True)
+        _refill_thread.start()
+
+
+def refill_pool():
+    root_engine = get_root_engine()
+    try:
+        _drop_stale_pool_databases(root_engine)
+        missing_count = settings.MATHESAR_DEMO_POOL_SIZE - len(_get_pool_database_names(root_engine))
+        for _ in range(missing_count):
+            _clone_template_database(
+                root_engine, f'{_get_pool_prefix(root_engine)}{uuid.uuid4().hex}'
+            )
+    except Exception:
+        logger.exception("Refilling the demo database pool failed")
+    finally:
+        root_engine.dispose()
+
+
+def ensure_template_database(root_engine):
+    """
+    Creates the template database of the current version unless it exists, and drops templates
+    of other versions. It's built under a temporary name and only renamed once fully installed,
+    so a failed build never leaves a broken template behind. The temporary database of a failed
+    build is dropped.
+
+    Returns the name of the template database.
+    """
+    template_name = get_template_name(root_engine)
+    if _database_exists(root_engine, template_name):
+        return template_name
+    with _template_advisory_lock(root_engine):
+        # Another process may have built it while we waited for the lock.
+        if _database_exists(root_engine, template_name):
+            return template_name
+        building_prefix = f'{settings.MATHESAR_DEMO_TEMPLATE}_building_'
+        # Builds are serialized by the lock, so these were left by processes that died mid-build.
+        for db_name in _get_database_names_with_prefix(root_engine, building_prefix):
+            _drop_database(root_engine, db_name)
+        building_name = f'{building_prefix}{uuid.uuid4().hex[:8]}'
+        try:
+            _build_template_database(building_name)
+        except Exception:
+            _drop_database(root_engine, building_name)
+            raise
+        execute_autocommit(
+            root_engine,
+            f'ALTER DATABASE {quote_identifier(root_engine, building_name)} RENAME TO {quote_identifier(root_engine, template_name)}'
+        )
+        _drop_stale_databases(root_engine, f'{settings.MATHESAR_DEMO_TEMPLATE}_v', template_name)
+    return template_name
+
+
+def get_template_version(root_engine):
+    """
+    Returns a hash of the Mathesar install script and the demo dataset files, computed once per
+    process. The install script is generated against the root database, which has the same
+    types available as a newly created one.
+    """
+    global _template_version
+    if _template_version is None:
+        version_hash = hashlib.md5(
+            get_install_version(get_install_queries(root_engine)).encode()
+        )
+        for file_name in sorted(os.listdir(RESOURCES)):
+            with open(os.path.join(RESOURCES, file_name), 'rb') as f:
+                version_hash.update(f.read())
+        _template_version = version_hash.hexdigest()[:8]
+    return _template_version
+
+
+def get_template_name(root_engine):
+    return f'{settings.MATHESAR_DEMO_TEMPLATE}_v{get_template_version(root_engine)}'
+
+
+def _build_template_database(db_name):
+    db_settings = settings.DATABASES["default"]
+    create_mathesar_database(
+        db_name,
+        username=db_settings["USER"],
+        password=db_settings["PASSWORD"],
+        hostname=db_settings["HOST"],
+        root_database=db_settings["NAME"],
+        port=db_settings["PORT"],
+    )
+    engine = create_mathesar_engine(db_name)
+    try:
+        load_datasets(engine)
+    finally:
+        # A template can't be cloned while there are connections to it.
+        engine.dispose()
+
+
+def _drop_database(root_engine, db_name):
+    execute_autocommit(
+        root_engine, f'DROP DATABASE IF EXISTS {quote_identifier(root_engine, db_name)} WITH (FORCE)'
+    )
+
+
+def _claim_pool_database(root_engine, db_name):
+    """
+    Renames a pool database to `db_name`. Renaming is atomic, so processes sharing the pool never
+    claim the same database.
+    """
+    for pool_db_name in _get_pool_database_names(root_engine):
+        try:
+            execute_autocommit(
+                root_engine,
+                f'ALTER DATABASE {quote_identifier(root_engine, pool_db_name)} RENAME TO {quote_identifier(root_engine, db_name)}'
+            )
+        except ProgrammingError:
+            # Claimed by another process in the meantime.
+            continue
+        return True
+    return False
+
+
+def _clone_template_database(root_engine, db_name):
+    template_name = ensure_template_database(root_engine)
+    execute_autocommit(
+        root_engine,
+        f'CREATE DATABASE {quote_identifier(root_engine, db_name)}'
+        f' TEMPLATE {quote_identifier(root_engine, template_name)}'
+    )
+
+
+def _get_pool_prefix(root_engine):
+    return f'{POOL_DB_NAME_PREFIX}{get_template_version(root_engine)}_'
+
+
+def _get_pool_database_names(root_engine):
+    """
+    Returns the names of the pool databases cloned from the current version of the template.
+    """
+    return _get_database_names_with_prefix(root_engine, _get_pool_prefix(root_engine))
+
+
+def _drop_stale_pool_databases(root_engine):
+    _drop_stale_databases(root_engine, POOL_DB_NAME_PREFIX, _get_pool_prefix(root_engine))
+
+
+def _drop_stale_databases(root_engine, prefix, current_prefix):
+    """
+    Drops the databases whose names start with `prefix` but not with `current_prefix`, i.e. the
+    ones made from older versions of the template. Databases that are in use, e.g. a pool
+    database being claimed, are left for a later attempt.
+    """
+    for db_name in _get_database_names_with_prefix(root_engine, prefix):
+        if db_name.startswith(current_prefix):
+            continue
+        try:
+            execute_autocommit(
+                root_engine, f'DROP DATABASE IF EXISTS {quote_identifier(root_engine, db_name)}'
+            )
+        except OperationalError:
+            logger.debug(f"Not dropping stale demo database {db_name}, since it's in use")
+
+
+def _get_database_names_with_prefix(root_engine, prefix):
+    # LIKE would treat the underscores of the prefix as wildcards.
+    sel = text(
+        "SELECT datname FROM pg_catalog.pg_database"
+        " WHERE left(datname, length(:prefix)) = :prefix ORDER BY datname"
+    ).bindparams(prefix=prefix)
+    with root_engine.connect() as conn:
+        return [row.datname for row in conn.execute(sel)]
+
+
+@contextmanager
+def _template_advisory_lock(root_engine):
+    """
+    Holds a session-level advisory lock on a dedicated connection, which waits for other
+    processes, e.g. other workers, holding it.
+    """
+    with root_engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text("SELECT pg_advisory_lock(:key)").bindparams(key=TEMPLATE_ADVISORY_LOCK_KEY))
+        try:
+            yield
+        finally:
+            conn.execute(
+                text("SELECT pg_advisory_unlock(:key)").bindparams(key=TEMPLATE_ADVISORY_LOCK_KEY)
+            )
+
+
+def _database_exists(root_engine, db_name):
+    sel = text(
+        "SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_database WHERE datname = :db_name)"
+    ).bindparams(db_name=db_name)
+    with root_engine.connect() as conn:
+        return conn.execute(sel).scalar()
+
+
+def execute_autocommit(root_engine, statement):
+    # CREATE, ALTER and DROP DATABASE can't run inside a transaction block.
+    with root_engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text(statement))
+
+
+def quote_identifier(root_engine, identifier):
+    return root_engine.dialect.identifier_preparer.quote(identifier)
+
+
+def get_root_engine():
+    db_settings = settings.DATABASES["default"]
+    return create_future_engine(
+        db_settings["USER"],
+        db_settings["PASSWORD"],
+        db_settings["HOST"],
+        db_settings["NAME"],
+        db_settings["PORT"],
+    )
+
+
+_template_version = None
+_refill_lock = threading.Lock()
+_refill_thread = None
@@ -0,0 +1,150 @@
+"""
+Drops Live Demo databases that haven't been used for MATHESAR_DEMO_DB_TTL seconds, along with
+their Database rows, and the least recently used ones beyond MATHESAR_DEMO_MAX_DATABASES.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from sqlalchemy import text
+
+from demo.provision import execute_autocommit, get_root_engine, quote_identifier
+from mathesar.models.base import Database
+
+# Access times are only written when the stored one is older than this, so that requests don't
+# all write to the Database row.
+ACCESS_RECORD_INTERVAL = timedelta(minutes=1)
+
+logger = logging.getLogger(__name__)
+
+
+def record_database_access(database):
+    now = timezone.now()
+    if (
+        database.last_accessed_at is None
+        or now - database.last_accessed_at > ACCESS_RECORD_INTERVAL
+    ):
+        Database.current_objects.filter(id=database.id).update(last_accessed_at=now)
+        database.last_accessed_at = now
+
+
+def get_databases_to_reap(now=None):
+    """
+    Returns the demo databases that have been idle for longer than the TTL, plus the least
+    recently used ones that don't fit under the cap. Databases configured in the settings are
+    never reaped.
+    """
+    now = now or timezone.now()
+    idle_since = now - timedelta(seconds=settings.MATHESAR_DEMO_DB_TTL)
+    demo_databases = (
+        Database.current_objects
+        .exclude(name__in=_get_configured_database_names())
+        # Databases that were never accessed count from their creation.
+        .annotate(last_used_at=Coalesce('last_accessed_at', 'created_at'))
+        .order_by('-last_used_at')
+    )
+    return [
+        database
+        for index, database in enumerate(demo_databases)
+        if database.last_used_at < idle_since or index >= settings.MATHESAR_DEMO_MAX_DATABASES
+    ]
+
+
+def reap_demo_databases():
+    databases = get_databases_to_reap()
+    if not databases:
+        return
+    root_engine = get_root_engine()
+    try:
+        for database in databases:
+            # Checked right before dropping, to keep the window for new queries short.
+            if is_database_busy(root_engine, database.name):
+                logger.debug(f"Not dropping demo database {database.name}, since it's in use")
+                continue
+            logger.debug(f"Dropping idle demo database {database.name}")
+            drop_demo_database(root_engine, database)
+    finally:
+        root_engine.dispose()
+
+
+def is_database_busy(root_engine, db_name):
+    """
+    Returns whether the database has a session running a query or in a transaction. Idle
+    sessions don't count, since every worker keeps idle pooled connections to the databases it
+    has served.
+    """
+    sel = text(
+        "SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_stat_activity"
+        " WHERE datname = :db_name AND state IS DISTINCT FROM 'idle')"
+    ).bindparams(db_name=db_name)
+    with root_engine.connect() as conn:
+        return conn.execute(sel).scalar()
+
+
+def drop_demo_database(root_engine, database):
+    """
+    Drops the database, terminating the idle sessions left on it, e.g. pooled connections of
+    other workers. A session that starts a query between the busy check and the drop still gets
+    terminated.
+    """
+    # Our own pooled connections would otherwise be terminated by the forced drop.
+    database._sa_engine.dispose()
+    execute_autocommit(
+        root_engine,
+        f'DROP DATABASE IF EXISTS {quote_identifier(root_engine, database.name)} WITH (FORCE)'
+    )
+    database.delete()
+
+
+def start_reaper():
+    """
+    Starts a thread that reaps demo databases every MATHESAR_DEMO_REAP_INTERVAL seconds, unless
+    one is already running in this process.
+    """
+    with _reaper_lock:
+        global _reaper_thread
+        if _reaper_thread is not None and _reaper_thread.is_alive():
+            return
+        _reaper_thread = threading.Thread(target=_run_reaper, daemon=True)
+        _reaper_thread.start()
+
+
+def reap_in_background():
+    """
+    Reaps demo databases once, without waiting for the reaper thread. Used to enforce the cap
+    as soon as a new demo database is created.
+    """
+    threading.Thread(target=_reap, daemon=True).start()
+
+
+def _run_reaper():
+    while True:
+        time.sleep(settings.MATHESAR_DEMO_REAP_INTERVAL)
+        _reap()
+
+
+def _reap():
+    try:
+        reap_demo_databases()
+    except Exception:
+        logger.exception("Reaping demo databases failed")
+    finally:
+        # The thread's Django connection would otherwise stay open.
+        connection.close()
+
+
+def _get_configured_database_names():
+    return {
+        name
+        for db_key, db_settings in settings.DATABASES.items()
+        for name in (db_key, db_settings["NAME"])
+    }
+
+
+_reaper_lock = threading.Lock()
+_reaper_thread = None
@@ -1,3 +1,5 @@
+from decouple import config as decouple_config
+
 from config.settings import *  # noqa
 
 MIDDLEWARE += [  # noqa
@@ -5,3 +7,15 @@ MIDDLEWARE += [  # noqa
 ]
 
 MATHESAR_LIVE_DEMO = True
+
+# Demo databases are cloned from a template database named after this and a version of the
+# install script and datasets, which is built on first use.
+MATHESAR_DEMO_TEMPLATE = decouple_config('MATHESAR_DEMO_TEMPLATE', default='mathesar_demo_template')
+# Number of demo databases to keep cloned ahead of time, to be handed out to new sessions.
+MATHESAR_DEMO_POOL_SIZE = decouple_config('MATHESAR_DEMO_POOL_SIZE', default=3, cast=int)
+# Demo databases that haven't been accessed for this many seconds get dropped.
+MATHESAR_DEMO_DB_TTL = decouple_config('MATHESAR_DEMO_DB_TTL', default=24 * 60 * 60, cast=int)
+# The least recently accessed demo databases beyond this number get dropped.
+MATHESAR_DEMO_MAX_DATABASES = decouple_config('MATHESAR_DEMO_MAX_DATABASES', default=200, cast=int)
+# Seconds between checks for demo databases to drop.
+MATHESAR_DEMO_REAP_INTERVAL = decouple_config('MATHESAR_DEMO_REAP_INTERVAL', default=10 * 60, cast=int)
@@ -0,0 +1,99 @@
+import pytest
+
+from demo import provision
+
+
+@pytest.fixture
+def root_engine():
+    root_engine = provision.get_root_engine()
+    yield root_engine
+    root_engine.dispose()
+
+
+@pytest.fixture
+def template_version(monkeypatch, uid):
+    # A version of its own, so that the pool databases of other tests aren't involved.
+    version = f'test{uid.lower()}'
+    monkeypatch.setattr(provision, '_template_version', version)
+    return version
+
+
+@pytest.fixture
+def create_database(root_engine):
+    db_names = []
+
+    def _create_database(db_name):
+        provision.execute_autocommit(
+            root_engine, f'CREATE DATABASE {provision.quote_identifier(root_engine, db_name)}'
+        )
+        db_names.append(db_name)
+        return db_name
+    yield _create_database
+    for db_name in db_names:
+        drop_database_if_exists(root_engine, db_name)
+
+
+def drop_database_if_exists(root_engine, db_name):
+    provision.execute_autocommit(
+        root_engine, f'DROP DATABASE IF EXISTS {provision.quote_identifier(root_engine, db_name)}'
+    )
+
+
+def test_claim_pool_database(root_engine, template_version, create_database, uid):
+    pool_db_name = create_database(f'{provision.POOL_DB_NAME_PREFIX}{template_version}_{uid.lower()}')
+    stale_pool_db_name = create_database(f'{provision.POOL_DB_NAME_PREFIX}stale_{uid.lower()}')
+    db_name = f'demo_claimed_{uid.lower()}'
+    try:
+        assert provision._claim_pool_database(root_engine, db_name) is True
+        assert provision._database_exists(root_engine, db_name)
+        assert not provision._database_exists(root_engine, pool_db_name)
+        assert provision._database_exists(root_engine, stale_pool_db_name)
+    finally:
+        drop_database_if_exists(root_engine, db_name)
+
+
+def test_claim_pool_database_empty_pool(root_engine, template_version, create_database, uid):
+    create_database(f'{provision.POOL_DB_NAME_PREFIX}stale_{uid.lower()}')
+    db_name = f'demo_claimed_{uid.lower()}'
+    assert provision._claim_pool_database(root_engine, db_name) is False
+    assert not provision._database_exists(root_engine, db_name)
+
+
+def test_drop_stale_databases(root_engine, create_database, uid):
+    prefix = f'{provision.POOL_DB_NAME_PREFIX}{uid.lower()}_'
+    current_db_name = create_database(f'{prefix}current_1')
+    stale_db_name = create_database(f'{prefix}old_1')
+    provision._drop_stale_databases(root_engine, prefix, f'{prefix}current_')
+    assert provision._database_exists(root_engine, current_db_name)
+    assert not provision._database_exists(root_engine, stale_db_name)
+
+
+def test_get_pool_database_names_escapes_prefix(root_engine, template_version, create_database, uid):
+    # Underscores in the prefix are matched literally, unlike with LIKE.
+    pool_db_name = create_database(f'{provision.POOL_DB_NAME_PREFIX}{template_version}_{uid.lower()}')
+    create_database(f'{provision.POOL_DB_NAME_PREFIX}{template_version}x{uid.lower()}')
+    assert provision._get_pool_database_names(root_engine) == [pool_db_name]
+
+
+def test_ensure_template_database_drops_failed_builds(
+        root_engine, template_version, create_database, monkeypatch, settings
+):
+    building_prefix = f'{settings.MATHESAR_DEMO_TEMPLATE}_building_'
+    # Left by a process that died mid-build.
+    create_database(f'{building_prefix}leftover')
+
+    def _create_mathesar_database(db_name, **kwargs):
+        provision.execute_autocommit(
+            root_engine, f'CREATE DATABASE {provision.quote_identifier(root_engine, db_name)}'
+        )
+
+    def _load_datasets(engine):
+        raise RuntimeError('Loading the datasets failed')
+    monkeypatch.setattr(provision, 'create_mathesar_database', _create_mathesar_database)
+    monkeypatch.setattr(provision, 'load_datasets', _load_datasets)
+
+    with pytest.raises(RuntimeError):
+        provision.ensure_template_database(root_engine)
+
+    assert provision._get_database_names_with_prefix(root_engine, building_prefix) == []
+    assert not provision._database_exists(root_engine, provision.get_template_name(root_engine))
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from sqlalchemy import text
+
+from demo import reaper
+from demo.provision import _database_exists, execute_autocommit, get_root_engine, quote_identifier
+from mathesar.database.base import create_mathesar_engine
+from mathesar.models.base import Database
+
+
+@pytest.fixture
+def demo_settings(settings):
+    settings.MATHESAR_DEMO_DB_TTL = 60 * 60
+    settings.MATHESAR_DEMO_MAX_DATABASES = 3
+    return settings
+
+
+@pytest.fixture
+def root_engine():
+    root_engine = get_root_engine()
+    yield root_engine
+    root_engine.dispose()
+
+
+def _create_database_model(name, last_accessed_at=None):
+    database = Database.current_objects.create(name=name)
+    if last_accessed_at is not None:
+        Database.current_objects.filter(id=database.id).update(last_accessed_at=last_accessed_at)
+    return database
+
+
+@pytest.mark.django_db
+def test_get_databases_to_reap(demo_settings):
+    now = timezone.now()
+    _create_database_model('recent_1', now - timedelta(minutes=1))
+    _create_database_model('recent_2', now - timedelta(minutes=2))
+    # Counts from its creation, so it's the most recently used one.
+    _create_database_model('never_accessed')
+    _create_database_model('over_cap', now - timedelta(minutes=3))
+    _create_database_model('idle', now - timedelta(hours=2))
+
+    reaped_names = {database.name for database in reaper.get_databases_to_reap(now=now)}
+
+    assert reaped_names == {'over_cap', 'idle'}
+
+
+@pytest.mark.django_db
+def test_get_databases_to_reap_skips_configured_databases(demo_settings):
+    now = timezone.now()
+    configured_name = demo_settings.DATABASES['default']['NAME']
+    _create_database_model(configured_name, now - timedelta(hours=2))
+
+    reaped_names = {database.name for database in reaper.get_databases_to_reap(now=now)}
+
+    assert configured_name not in reaped_names
+
+
+@pytest.mark.django_db
+def test_reap_demo_databases_skips_busy_databases(demo_settings, root_engine, uid):
+    db_name = f'demo_reaped_{uid.lower()}'
+    execute_autocommit(root_engine, f'CREATE DATABASE {quote_identifier(root_engine, db_name)}')
+    _create_database_model(db_name, timezone.now() - timedelta(hours=2))
+    engine = create_mathesar_engine(db_name)
+    try:
+        with engine.connect() as conn:
+            # Leaves the session idle in a transaction.
+            conn.execute(text('SELECT 1'))
+            assert reaper.is_database_busy(root_engine, db_name)
+            reaper.reap_demo_databases()
+            assert _database_exists(root_engine, db_name)
+            assert Database.current_objects.filter(name=db_name).exists()
+        engine.dispose()
+
+        reaper.reap_demo_databases()
+
+        assert not _database_exists(root_engine, db_name)
+        assert not Database.current_objects.filter(name=db_name).exists()
+    finally:
+        engine.dispose()
+        execute_autocommit(
+            root_engine, f'DROP DATABASE IF EXISTS {quote_identifier(root_engine, db_name)} WITH (FORCE)'
+        )
@@ -36,6 +36,10 @@ class TableAccessPolicy(AccessPolicy):
                 'partial_update',
                 'split_table',
                 'move_columns',
+                'search_indexes',
+                'index_advisor',
+                'add_primary_key',
+                'apply_type_suggestions',
                 'previews',
                 'existing_import',
                 'map_imported_columns'
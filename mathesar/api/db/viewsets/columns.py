@@ -38,7 +38,7 @@ class ColumnViewSet(AccessViewSetMixin, viewsets.ModelViewSet):
         )
         # Prefetching instead of using select_related because select_related uses joins,
         # and we need a reuse of individual Django object instead of its data
-        prefetched_queryset = queryset.prefetch_related('table').prefetch('name')
+        prefetched_queryset = queryset.prefetch_related('table').prefetch('name', 'has_dependents')
         return prefetched_queryset
 
     def create(self, request, table_pk=None):
@@ -202,7 +202,11 @@ class ColumnViewSet(AccessViewSetMixin, viewsets.ModelViewSet):
         types_exclude = serializer.validated_data['exclude']
 
         column = self.get_object()
-        serializer = DependentSerializer(column.get_dependents(types_exclude), many=True, context={'request': request})
+        serializer = DependentSerializer(
+            column.get_dependents(types_exclude),
+            many=True,
+            context={'request': request, 'database': column.table.schema.database},
+        )
         return Response(serializer.data)
 
     def destroy(self, request, pk=None, table_pk=None):
@@ -64,5 +64,9 @@ class SchemaViewSet(AccessViewSetMixin, viewsets.GenericViewSet, ListModelMixin,
         types_exclude = serializer.validated_data['exclude']
 
         schema = self.get_object()
-        serializer = DependentSerializer(schema.get_dependents(types_exclude), many=True, context={'request': request})
+        serializer = DependentSerializer(
+            schema.get_dependents(types_exclude),
+            many=True,
+            context={'request': request, 'database': schema.database},
+        )
         return Response(serializer.data)
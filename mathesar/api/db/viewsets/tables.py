@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
 
 from db.types.exceptions import UnsupportedTypeException
-from db.columns.exceptions import NotNullError, ForeignKeyError, TypeMismatchError, UniqueValueError, ExclusionError, ColumnMappingsNotFound
+from db.columns.exceptions import InvalidTypeError, NotNullError, ForeignKeyError, TypeMismatchError, UniqueValueError, ExclusionError, ColumnMappingsNotFound
 from mathesar.api.db.permissions.table import TableAccessPolicy
 from mathesar.api.serializers.dependents import DependentFilterSerializer, DependentSerializer
 from mathesar.api.utils import get_table_or_404
@@ -19,6 +19,9 @@ from mathesar.api.exceptions.database_exceptions import (
 )
 from mathesar.api.pagination import DefaultLimitOffsetPagination
 from mathesar.api.serializers.tables import (
+    ApplyTypeSuggestionsRequestSerializer,
+    IndexRecommendationRequestSerializer,
+    SearchIndexRequestSerializer,
     SplitTableRequestSerializer,
     SplitTableResponseSerializer,
     TablePreviewSerializer,
@@ -27,7 +30,8 @@ from mathesar.api.serializers.tables import (
     MoveTableRequestSerializer
 )
 from mathesar.models.base import Table
-from mathesar.utils.tables import get_table_column_types
+from mathesar.utils.index_advisor import create_recommended_index, get_index_recommendations
+from mathesar.utils.tables import apply_table_column_types, get_table_column_types
 from mathesar.utils.joins import get_processed_joinable_tables
 
 
@@ -43,7 +47,7 @@ class TableViewSet(AccessViewSetMixin, CreateModelMixin, RetrieveModelMixin, Lis
         # because select_related would lead to duplicate object instances and could result in multiple engines instances
         # We prefetch `columns` using Django prefetch_related to get list of column objects and
         # then prefetch column properties like `column name` using prefetch library.
-        return self.access_policy.scope_viewset_queryset(self.request, Table.objects.prefetch_related('schema', 'schema__database', 'columns').prefetch('_sa_table', 'columns').order_by('-created_at'))
+        return self.access_policy.scope_viewset_queryset(self.request, Table.objects.prefetch_related('schema', 'schema__database', 'columns').prefetch('_sa_table', 'columns', 'has_dependents').order_by('-created_at'))
 
     def partial_update(self, request, pk=None):
         table = self.get_object()
@@ -70,7 +74,11 @@ class TableViewSet(AccessViewSetMixin, CreateModelMixin, RetrieveModelMixin, Lis
         types_exclude = serializer.validated_data['exclude']
 
         table = self.get_object()
-        serializer = DependentSerializer(table.get_dependents(types_exclude), many=True, context={'request': request})
+        serializer = DependentSerializer(
+            table.get_dependents(types_exclude),
+            many=True,
+            context={'request': request, 'database': table.schema.database},
+        )
         return Response(serializer.data)
 
     @action(methods=['get'], detail=True)
@@ -96,6 +104,26 @@ class TableViewSet(AccessViewSetMixin, CreateModelMixin, RetrieveModelMixin, Lis
         col_types = get_table_column_types(table)
         return Response(col_types)
 
+    @action(methods=['post'], detail=True)
+    def apply_type_suggestions(self, request, pk=None):
+        table = self.get_object()
+        serializer = ApplyTypeSuggestionsRequestSerializer(data=request.data, context={"request": request, 'table': table})
+        serializer.is_valid(raise_exception=True)
+        col_types = serializer.validated_data.get('columns')
+        if col_types is None:
+            col_types = get_table_column_types(table)
+        try:
+            result = apply_table_column_types(table, col_types)
+        except InvalidTypeError as e:
+            raise database_api_exceptions.InvalidTypeCastAPIException(
+                e,
+                message=f'{e.column_name} cannot be casted to {e.new_type}.'
+                if e.column_name and e.new_type
+                else 'This type casting is invalid.',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(result)
+
     @action(methods=['post'], detail=True)
     def split_table(self, request, pk=None):
         table = self.get_object()
@@ -134,6 +162,55 @@ class TableViewSet(AccessViewSetMixin, CreateModelMixin, RetrieveModelMixin, Lis
             )
             return Response(status=status.HTTP_201_CREATED)
 
+    @action(methods=['post'], detail=True)
+    def search_indexes(self, request, pk=None):
+        table = self.get_object()
+        serializer = SearchIndexRequestSerializer(data=request.data, context={"request": request, 'table': table})
+        serializer.is_valid(raise_exception=True)
+        backend = serializer.validated_data['backend']
+        try:
+            index_names = table.create_search_indexes(
+                columns=serializer.validated_data['columns'],
+                backend=backend,
+            )
+        except ProgrammingError as e:
+            raise database_base_api_exceptions.ProgrammingAPIException(
+                e,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'backend': backend, 'indexes': index_names}, status=status.HTTP_201_CREATED)
+
+    @action(methods=['post'], detail=True)
+    def add_primary_key(self, request, pk=None):
+        table = self.get_object()
+        try:
+            table.add_primary_key_column()
+        except ProgrammingError as e:
+            raise database_base_api_exceptions.ProgrammingAPIException(
+                e,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        # Reload the table to avoid cached properties
+        table = self.get_object()
+        serializer = TableSerializer(table, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(methods=['get', 'post'], detail=True)
+    def index_advisor(self, request, pk=None):
+        table = self.get_object()
+        if request.method == 'GET':
+            return Response({'recommendations': get_index_recommendations(table)})
+        serializer = IndexRecommendationRequestSerializer(data=request.data, context={"request": request, 'table': table})
+        serializer.is_valid(raise_exception=True)
+        try:
+            index_info = create_recommended_index(table, serializer.validated_data['recommendation'])
+        except ProgrammingError as e:
+            raise database_base_api_exceptions.ProgrammingAPIException(
+                e,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(index_info, status=status.HTTP_201_CREATED)
+
     @action(methods=['post'], detail=True)
     def previews(self, request, pk=None):
         table = self.get_object()
@@ -1,15 +1,24 @@
+import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 
 from db.records.operations.group import GroupBy
+from db.records.operations.select import execute_count_relation, get_count_relation
 from mathesar.api.utils import get_table_or_404, process_annotated_records
 from mathesar.models.base import Column, Table
 from mathesar.models.query import UIQuery
+from mathesar.utils.index_advisor import record_table_workload
 from mathesar.utils.preview import get_preview_info
 
 
+# Bounds the number of count queries that can run concurrently with page queries.
+COUNT_QUERY_MAX_WORKERS = 8
+
+
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
     default_limit = 50
     max_limit = 500
@@ -77,8 +86,17 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         if self.limit is None:
             self.limit = self.default_limit
         self.offset = self.get_offset(request)
+        start = time.perf_counter()
+        search_backend = None
+        if search and isinstance(table, Table):
+            search_backend = table.get_search_backend(
+                [search_obj['column'] for search_obj in search]
+            )
         # TODO: Cache count value somewhere, since calculating it is expensive.
-        self.count = table.sa_num_records(filter=filters, search=search)
+        # The count is computed on another pooled connection while the page is fetched.
+        count_future = _count_executor.submit(
+            _get_count_function(table, filters, search, search_backend)
+        )
         self.request = request
 
         preview_metadata = None
@@ -99,8 +117,19 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
             order_by=order_by,
             group_by=group_by,
             search=search,
-            duplicate_only=duplicate_only
+            duplicate_only=duplicate_only,
+            search_backend=search_backend,
         )
+        self.count = count_future.result()
+        if isinstance(table, Table):
+            record_table_workload(
+                table,
+                time.perf_counter() - start,
+                filter=filters,
+                order_by=order_by,
+                group_by=group_by,
+                search=search,
+            )
 
         return self.process_records(records, column_name_id_bidirectional_map, group_by, preview_metadata)
 
@@ -136,6 +165,7 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
                 'preproc': group_by.preproc,
                 'prefix_length': group_by.prefix_length,
                 'extract_field': group_by.extract_field,
+                'sample_size': group_by.sample_size,
                 'ranged': group_by.ranged,
                 'groups': groups,
             }
@@ -146,3 +176,26 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         else:
             self.preview_data = None
         return processed_records
+
+
+def _get_count_function(table, filters, search, search_backend):
+    """
+    Returns a function that counts the records of a table or query, for running in another
+    thread. The count query is built here, on the request thread, since building it can reflect
+    tables into shared SQLAlchemy metadata, which isn't thread-safe; the returned function only
+    executes it, on a pooled connection of the engine.
+    """
+    if isinstance(table, Table):
+        relation, engine = table._sa_table, table._sa_engine
+    else:
+        db_query = table.db_query
+        relation, engine = db_query.transformed_relation, db_query.engine
+    count_relation = get_count_relation(
+        relation, filter=filters, search=search, search_backend=search_backend,
+    )
+    return partial(execute_count_relation, engine, count_relation)
+
+
+_count_executor = ThreadPoolExecutor(
+    max_workers=COUNT_QUERY_MAX_WORKERS, thread_name_prefix='records_count'
+)
@@ -128,6 +128,20 @@ class ColumnDefaultSerializer(MathesarErrorMessageMixin, serializers.Serializer)
     is_dynamic = serializers.BooleanField(read_only=True)
 
 
+class TableColumnSerializer(SimpleColumnSerializer):
+    """
+    Serializes the columns of a table, also accepting nullability and default changes when the
+    table's columns are updated in bulk.
+    """
+    class Meta(SimpleColumnSerializer.Meta):
+        fields = SimpleColumnSerializer.Meta.fields + ('nullable', 'default')
+
+    nullable = serializers.BooleanField(required=False, write_only=True)
+    default = ColumnDefaultSerializer(
+        source='column_default_dict', required=False, allow_null=True, write_only=True
+    )
+
+
 class ColumnSerializer(SimpleColumnSerializer):
     class Meta(SimpleColumnSerializer.Meta):
         fields = SimpleColumnSerializer.Meta.fields + (
@@ -4,15 +4,17 @@ from rest_framework import serializers
 from mathesar.api.display_options import DISPLAY_OPTIONS_BY_UI_TYPE
 from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
 from mathesar.models.base import Database
+from mathesar.state import get_reflection_timestamps
 
 
 class DatabaseSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
     supported_types_url = serializers.SerializerMethodField()
+    reflected_at = serializers.SerializerMethodField()
 
     class Meta:
         model = Database
-        fields = ['id', 'name', 'deleted', 'supported_types_url']
-        read_only_fields = ['id', 'name', 'deleted', 'supported_types_url']
+        fields = ['id', 'name', 'deleted', 'supported_types_url', 'reflected_at']
+        read_only_fields = ['id', 'name', 'deleted', 'supported_types_url', 'reflected_at']
 
     def get_supported_types_url(self, obj):
         if isinstance(obj, Database):
@@ -22,6 +24,11 @@ class DatabaseSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer)
         else:
             return None
 
+    def get_reflected_at(self, obj):
+        # When this process last reflected the database, if it has.
+        reflected_at = get_reflection_timestamps().get(obj.name)
+        return serializers.DateTimeField().to_representation(reflected_at) if reflected_at else None
+
 
 class TypeSerializer(MathesarErrorMessageMixin, serializers.Serializer):
     identifier = serializers.CharField()
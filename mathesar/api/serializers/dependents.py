@@ -16,6 +16,22 @@ DATABASE_OBJECT_TYPES = [
     'function'
 ]
 
+# Maps the types of dependent objects that are Mathesar objects to their models.
+DEPENDENT_OBJECT_MODELS = {
+    'table': Table,
+    'table column': Table,
+    'table constraint': Constraint,
+    'schema': Schema,
+}
+
+# Oids are only unique within a database, so objects are looked up in the database of the object
+# whose dependents are listed, passed as the 'database' serializer context.
+DEPENDENT_OBJECT_DATABASE_LOOKUPS = {
+    Table: 'schema__database',
+    Constraint: 'table__schema__database',
+    Schema: 'database',
+}
+
 
 class DependentMathesarObjectSerializer(serializers.Serializer):
     id = serializers.CharField()
@@ -25,20 +41,21 @@ class DependentMathesarObjectSerializer(serializers.Serializer):
     def _get_object_type(self, instance):
         return instance.get('type', None)
 
-    # TODO: get ids of supported objects on a previous step in batches
     def to_representation(self, instance):
         object_oid = instance.get('objid', None)
         object_type = self._get_object_type(instance)
         object_id = 0
 
-        if object_type == 'table' or object_type == 'table column':
-            object_id = Table.objects.get(oid=object_oid).id
-            if object_type == 'table column':
-                instance['attnum'] = instance.get('objsubid', None)
-        elif object_type == 'table constraint':
-            object_id = Constraint.objects.get(oid=object_oid).id
-        elif object_type == 'schema':
-            object_id = Schema.objects.get(oid=object_oid).id
+        if object_type == 'table column':
+            instance['attnum'] = instance.get('objsubid', None)
+
+        # Ids are resolved in bulk by DependentListSerializer
+        if 'id' in instance:
+            return super().to_representation(instance)
+
+        if object_type in DEPENDENT_OBJECT_MODELS:
+            model = DEPENDENT_OBJECT_MODELS[object_type]
+            object_id = _get_database_queryset(model, self.context).get(oid=object_oid).id
 
         instance['id'] = object_id
         return super().to_representation(instance)
@@ -70,11 +87,51 @@ class BaseDependentObjectSerializer(
         return data.get('type', None)
 
 
+class DependentListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        _set_dependent_object_ids(data, self.context)
+        return super().to_representation(data)
+
+
 class DependentSerializer(serializers.Serializer):
     obj = BaseDependentObjectSerializer()
     parent_obj = BaseDependentObjectSerializer()
     level = serializers.IntegerField()
 
+    class Meta:
+        list_serializer_class = DependentListSerializer
+
 
 class DependentFilterSerializer(serializers.Serializer):
     exclude = serializers.MultipleChoiceField(DATABASE_OBJECT_TYPES, required=False)
+
+
+def _set_dependent_object_ids(dependents, context):
+    """
+    Sets the Django ids of all Mathesar objects in the given dependency pairs, with one query per
+    object model rather than one per object.
+    """
+    dependent_objects = [
+        dependent_object
+        for dependent in dependents
+        for dependent_object in (dependent['obj'], dependent['parent_obj'])
+        if dependent_object.get('type') in DEPENDENT_OBJECT_MODELS
+    ]
+    oids_by_model = {}
+    for dependent_object in dependent_objects:
+        model = DEPENDENT_OBJECT_MODELS[dependent_object['type']]
+        oids_by_model.setdefault(model, set()).add(dependent_object['objid'])
+    ids_by_model = {
+        model: dict(_get_database_queryset(model, context).filter(oid__in=oids).values_list('oid', 'id'))
+        for model, oids in oids_by_model.items()
+    }
+    for dependent_object in dependent_objects:
+        model = DEPENDENT_OBJECT_MODELS[dependent_object['type']]
+        object_id = ids_by_model[model].get(dependent_object['objid'])
+        # Objects missing from the model are left to DependentMathesarObjectSerializer
+        if object_id is not None:
+            dependent_object['id'] = object_id
+
+
+def _get_database_queryset(model, context):
+    return model.objects.filter(**{DEPENDENT_OBJECT_DATABASE_LOOKUPS[model]: context['database']})
@@ -4,6 +4,7 @@ from rest_framework import serializers, status
 from rest_framework.exceptions import ValidationError
 from sqlalchemy.exc import ProgrammingError
 
+from db.records.operations.relevance import SearchBackend
 from db.types.operations.convert import get_db_type_enum_from_id
 from db.tables.operations.create import DuplicateTable
 from db.columns.exceptions import InvalidTypeError
@@ -20,14 +21,18 @@ from mathesar.api.exceptions.database_exceptions.base_exceptions import Programm
 from mathesar.api.exceptions.validation_exceptions import base_exceptions as base_validation_exceptions
 from mathesar.api.exceptions.generic_exceptions import base_exceptions as base_api_exceptions
 from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
-from mathesar.api.serializers.columns import SimpleColumnSerializer
+from mathesar.api.serializers.columns import SimpleColumnSerializer, TableColumnSerializer
 from mathesar.api.serializers.table_settings import TableSettingsSerializer
 from mathesar.models.base import Column, Schema, Table, DataFile
-from mathesar.utils.tables import gen_table_name, create_table_from_datafile, create_empty_table
+from mathesar.utils.index_advisor import is_recommendation_available
+from mathesar.utils.tables import (
+    apply_table_column_types, gen_table_name, create_table_from_datafile, create_empty_table,
+    get_table_column_types,
+)
 
 
 class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
-    columns = SimpleColumnSerializer(many=True, required=False)
+    columns = TableColumnSerializer(many=True, required=False)
     settings = TableSettingsSerializer(read_only=True)
     records_url = serializers.SerializerMethodField()
     constraints_url = serializers.SerializerMethodField()
@@ -36,6 +41,7 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
     type_suggestions_url = serializers.SerializerMethodField()
     previews_url = serializers.SerializerMethodField()
     dependents_url = serializers.SerializerMethodField()
+    default_ordering = serializers.SerializerMethodField()
     name = serializers.CharField(required=False, allow_blank=True, default='')
     import_target = serializers.PrimaryKeyRelatedField(
         required=False, allow_null=True, queryset=Table.current_objects.all()
@@ -46,6 +52,9 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
     description = serializers.CharField(
         required=False, allow_blank=True, default=None, allow_null=True
     )
+    # Whether to convert the columns of a table imported from a data file to their suggested
+    # types right away, in a single table rewrite.
+    apply_type_suggestions = serializers.BooleanField(required=False, default=False, write_only=True)
     schema = PermittedPkRelatedField(
         access_policy=SchemaAccessPolicy,
         queryset=Schema.current_objects.all()
@@ -58,7 +67,7 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
             'import_verified', 'columns', 'records_url', 'constraints_url',
             'columns_url', 'joinable_tables_url', 'type_suggestions_url',
             'previews_url', 'data_files', 'has_dependents', 'dependents_url',
-            'settings', 'description',
+            'settings', 'description', 'default_ordering', 'apply_type_suggestions',
         ]
 
     def get_records_url(self, obj):
@@ -109,6 +118,12 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
         else:
             return None
 
+    def get_default_ordering(self, obj):
+        if isinstance(obj, Table):
+            return obj.default_ordering
+        else:
+            return None
+
     def get_dependents_url(self, obj):
         if isinstance(obj, Table):
             request = self.context['request']
@@ -137,6 +152,8 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
                     table.import_target = import_target
                     table.is_temp = True
                     table.save()
+                elif validated_data.get('apply_type_suggestions'):
+                    self._apply_type_suggestions(table)
             else:
                 table = create_empty_table(name, schema, comment=description)
         except DuplicateTable as e:
@@ -150,6 +167,21 @@ class TableSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
             raise ProgrammingAPIException(e)
         return table
 
+    def _apply_type_suggestions(self, table):
+        try:
+            apply_table_column_types(table, get_table_column_types(table))
+        except InvalidTypeError as e:
+            # The conversion is rolled back as a whole, but the table was created in its own
+            # transaction, so drop it rather than leave a half-imported table behind.
+            table.delete_sa_table()
+            raise InvalidTypeCastAPIException(
+                e,
+                message=f'{e.column_name} cannot be casted to {e.new_type}.'
+                if e.column_name and e.new_type
+                else 'This type casting is invalid.',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
     def update(self, instance, validated_data):
         if self.partial:
             # Save the fields that are stored in the model.
@@ -216,6 +248,25 @@ class TablePreviewSerializer(MathesarErrorMessageMixin, serializers.Serializer):
         return columns
 
 
+class ApplyTypeSuggestionsRequestSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    # Column names mapped to db type ids, as type_suggestions returns them. The table's current
+    # type suggestions are applied if left out.
+    columns = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_columns(self, columns):
+        table = self.context['table']
+        column_names = {column.name for column in table.sa_columns}
+        for column_name, db_type_id in columns.items():
+            if column_name not in column_names:
+                message = f'Column "{column_name}" does not belong to table {table.id}.'
+                raise base_validation_exceptions.MathesarValidationException(
+                    ValidationError, message=message, field='columns'
+                )
+            if get_db_type_enum_from_id(db_type_id) is None:
+                raise UnknownDatabaseTypeIdentifier(db_type_id=db_type_id, field='columns')
+        return columns
+
+
 class MoveTableRequestSerializer(MathesarErrorMessageMixin, serializers.Serializer):
     move_columns = serializers.PrimaryKeyRelatedField(queryset=Column.current_objects.all(), many=True)
     target_table = PermittedPkRelatedField(access_policy=TableAccessPolicy, queryset=Table.current_objects.all())
@@ -227,6 +278,37 @@ class SplitTableRequestSerializer(MathesarErrorMessageMixin, serializers.Seriali
     relationship_fk_column_name = serializers.CharField(allow_blank=False, allow_null=True, default=None)
 
 
+class SearchIndexRequestSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    columns = serializers.PrimaryKeyRelatedField(queryset=Column.current_objects.all(), many=True)
+    backend = serializers.ChoiceField(
+        choices=[SearchBackend.TRIGRAM.value, SearchBackend.FULL_TEXT.value],
+        default=SearchBackend.TRIGRAM.value,
+    )
+
+    def validate_columns(self, columns):
+        table = self.context['table']
+        for column in columns:
+            if column.table_id != table.id:
+                message = f"Column {column.id} does not belong to table {table.id}."
+                raise base_validation_exceptions.MathesarValidationException(
+                    ValidationError, message=message, field='columns'
+                )
+        return columns
+
+
+class IndexRecommendationRequestSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    recommendation = serializers.CharField()
+
+    def validate_recommendation(self, recommendation):
+        table = self.context['table']
+        if not is_recommendation_available(table, recommendation):
+            message = f"No index is recommended under key {recommendation} for table {table.id}."
+            raise base_validation_exceptions.MathesarValidationException(
+                ValidationError, message=message, field='recommendation'
+            )
+        return recommendation
+
+
 class SplitTableResponseSerializer(MathesarErrorMessageMixin, serializers.Serializer):
     extracted_table = serializers.PrimaryKeyRelatedField(queryset=Table.current_objects.all())
     remainder_table = serializers.PrimaryKeyRelatedField(queryset=Table.current_objects.all())
@@ -1,29 +1,39 @@
 from db.functions import hints
 
+from db.functions.known_db_functions import known_db_functions
 from db.functions.operations.check_support import get_supported_db_functions
 from mathesar.database.types import get_ui_types_mapped_to_hintsets
 from mathesar.database.types import ui_types_that_satisfy_hintset
 
 
 def get_available_filters(engine):
+    """
+    Returns descriptions of the filters supported by the database. A filter's description only
+    depends on its DB function, so descriptions are built once per process, and filters are
+    picked per database from the (cached) supported DB functions.
+    """
     available_db_functions = get_supported_db_functions(engine)
-    db_functions_castable_to_filter = tuple(
-        db_function
-        for db_function in available_db_functions
-        if _is_db_function_subclass_castable_to_filter(db_function)
-    )
-    ui_type_hints = get_ui_types_mapped_to_hintsets()
+    filters_by_db_function = _get_filters_by_db_function()
     filters = tuple(
-        _filter_from_db_function(
-            ui_type_hints,
-            db_function_castable_to_filter,
-        )
-        for db_function_castable_to_filter
-        in db_functions_castable_to_filter
+        filters_by_db_function[db_function]
+        for db_function in available_db_functions
+        if db_function in filters_by_db_function
     )
     return filters
 
 
+def _get_filters_by_db_function():
+    global _filters_by_db_function
+    if _filters_by_db_function is None:
+        ui_type_hints = get_ui_types_mapped_to_hintsets()
+        _filters_by_db_function = {
+            db_function: _filter_from_db_function(ui_type_hints, db_function)
+            for db_function in known_db_functions
+            if _is_db_function_subclass_castable_to_filter(db_function)
+        }
+    return _filters_by_db_function
+
+
 def _is_db_function_subclass_castable_to_filter(db_function_subclass):
     # Provisionary implementation; ideally would examine parameter and output
     # related hints.
@@ -121,3 +131,7 @@ def _get_parameter_ui_types(ui_type_hints, db_function_subclass, parameter_index
             + " at least one Mathesar type (it didn't)."
         )
     return parameter_ui_types
+
+
+# Maps DB function subclasses castable to filters to their filter descriptions; built lazily.
+_filters_by_db_function = None
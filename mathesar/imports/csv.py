@@ -164,7 +164,7 @@ def create_db_table_from_data_file(data_file, name, schema, comment=None):
             quote=dialect.quotechar,
             encoding=encoding
         )
-    reset_reflection()
+    reset_reflection(db_name=schema.database.name)
     return table
 
 
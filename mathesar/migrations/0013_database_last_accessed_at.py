@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2023-01-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0012_auto_20221212_2148'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='database',
+            name='last_accessed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
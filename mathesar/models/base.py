@@ -3,14 +3,13 @@ from functools import reduce
 from bidict import bidict
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import JSONField
 from django.contrib.postgres.fields import ArrayField
 
 from db.columns import utils as column_utils
-from db.columns.operations.create import create_column, duplicate_column
+from db.columns.operations.create import add_primary_key_column, create_column, duplicate_column
 from db.columns.operations.alter import alter_column
 from db.columns.operations.drop import drop_column
 from db.columns.operations.select import (
@@ -23,24 +22,28 @@ from db.constraints.operations.select import (
     get_constraint_oid_by_name_and_table_oid, get_constraint_record_from_oid
 )
 from db.constraints import utils as constraint_utils
-from db.dependents.dependents_utils import get_dependents_graph, has_dependents
+from db.dependents.dependents_utils import get_dependents_graph, get_objects_with_dependents, has_dependents
+from db.indexes.operations.create import create_search_indexes
+from db.indexes.operations.select import get_search_backend
 from db.metadata import get_empty_metadata
 from db.records.operations.delete import delete_record
 from db.records.operations.insert import insert_record_or_records
 from db.records.operations.select import get_column_cast_records, get_count, get_record
 from db.records.operations.select import get_records_with_default_order as db_get_records_with_default_order
+from db.records.operations.relevance import is_string_like_column
+from db.records.operations.sort import get_default_ordering
 from db.records.operations.update import update_record
 from db.schemas.operations.drop import drop_schema
 from db.schemas.operations.select import get_schema_description
 from db.schemas import utils as schema_utils
 from db.tables import utils as table_utils
+from db.tables.operations.bulk_reflect import reflect_tables_in_bulk
 from db.tables.operations.drop import drop_table
 from db.tables.operations.move_columns import move_columns_between_related_tables
 from db.tables.operations.select import (
     get_oid_from_table,
     reflect_table_from_oid,
     get_table_description,
-    reflect_tables_from_oids
 )
 from db.tables.operations.split import extract_columns_from_table
 from db.records.operations.insert import insert_from_select
@@ -52,7 +55,8 @@ from mathesar.utils.prefetch import PrefetchManager, Prefetcher
 from mathesar.database.base import create_mathesar_engine
 from mathesar.database.types import UIType, get_ui_type_from_db_type
 from mathesar.state import make_sure_initial_reflection_happened, get_cached_metadata, reset_reflection
-from mathesar.state.cached_property import cached_property
+from mathesar.state import dj_cache
+from mathesar.state.cached_property import cached_property, key_cached_property
 from mathesar.api.exceptions.database_exceptions.base_exceptions import ProgrammingAPIException
 
 
@@ -117,6 +121,8 @@ class Database(ReflectionManagerMixin, BaseModel):
     objects = DatabaseObjectManager()
     name = models.CharField(max_length=128, unique=True)
     deleted = models.BooleanField(blank=True, default=False)
+    # Only tracked in Live Demo mode, where idle databases get dropped.
+    last_accessed_at = models.DateTimeField(blank=True, null=True)
 
     @property
     def _sa_engine(self):
@@ -159,14 +165,14 @@ class Schema(DatabaseObject):
 
     @property
     def name(self):
-        cache_key = f"{self.database.name}_schema_name_{self.oid}"
+        db_name = self.database.name
         try:
-            schema_name = cache.get(cache_key)
+            schema_name = dj_cache.get(db_name, dj_cache.SCHEMA_NAME, self.oid)
             if schema_name is None:
                 schema_name = schema_utils.get_schema_name_from_oid(
                     self.oid, self._sa_engine
                 )
-                cache.set(cache_key, schema_name, NAME_CACHE_INTERVAL)
+                dj_cache.set(db_name, dj_cache.SCHEMA_NAME, self.oid, schema_name, NAME_CACHE_INTERVAL)
             return schema_name
         # We catch this error, since it lets us decouple the cadence of
         # overall DB reflection from the cadence of cache expiration for
@@ -204,17 +210,16 @@ class Schema(DatabaseObject):
 
     def update_sa_schema(self, update_params):
         result = model_utils.update_sa_schema(self, update_params)
-        reset_reflection()
+        reset_reflection(db_name=self.database.name)
         return result
 
     def delete_sa_schema(self):
         result = drop_schema(self.name, self._sa_engine, cascade=True)
-        reset_reflection()
+        reset_reflection(db_name=self.database.name)
         return result
 
     def clear_name_cache(self):
-        cache_key = f"{self.database.name}_schema_name_{self.oid}"
-        cache.delete(cache_key)
+        dj_cache.delete(self.database.name, dj_cache.SCHEMA_NAME, self.oid)
 
 
 class ColumnNamePrefetcher(Prefetcher):
@@ -269,8 +274,54 @@ class ColumnPrefetcher(Prefetcher):
         pass
 
 
+class HasDependentsPrefetcher(Prefetcher):
+    """
+    Answers has_dependents for a list of tables or columns with a single pg_depend query per
+    database, rather than one query per object.
+    """
+    def filter(self, referenced_objects, objs):
+        # Keys and values of the prefetcher's data mapping, so they're in the same order.
+        objects_by_database = {}
+        engines_by_database = {}
+        for referenced_object, obj in zip(referenced_objects, objs):
+            database_id = self.get_database_id(obj)
+            objects_by_database.setdefault(database_id, []).append(referenced_object)
+            engines_by_database.setdefault(database_id, obj._sa_engine)
+        result = {}
+        for database_id, database_objects in objects_by_database.items():
+            objects_with_dependents = get_objects_with_dependents(
+                database_objects, engines_by_database[database_id], metadata=get_cached_metadata()
+            )
+            for referenced_object in database_objects:
+                result[referenced_object] = referenced_object in objects_with_dependents
+        return result
+
+    def reverse_mapper(self, obj):
+        # We return maps, so a reverse mapper is not needed
+        pass
+
+    def decorator(self, obj, has_dependents):
+        obj._has_dependents = has_dependents
+
+
+class TableHasDependentsPrefetcher(HasDependentsPrefetcher):
+    def mapper(self, table):
+        return (table.oid, None)
+
+    def get_database_id(self, table):
+        return table.schema.database_id
+
+
+class ColumnHasDependentsPrefetcher(HasDependentsPrefetcher):
+    def mapper(self, column):
+        return (column.table.oid, column.attnum)
+
+    def get_database_id(self, column):
+        return column.table.schema.database_id
+
+
 _sa_table_prefetcher = Prefetcher(
-    filter=lambda oids, tables: reflect_tables_from_oids(
+    filter=lambda oids, tables: reflect_tables_in_bulk(
         oids, list(tables)[0]._sa_engine, metadata=get_cached_metadata()
     ) if len(tables) > 0 else [],
     mapper=lambda table: table.oid,
@@ -293,6 +344,7 @@ class Table(DatabaseObject, Relation):
         # TODO Move the Prefetcher into a separate class and replace lambdas with proper function
         _sa_table=_sa_table_prefetcher,
         columns=ColumnPrefetcher,
+        has_dependents=TableHasDependentsPrefetcher,
     )
     schema = models.ForeignKey('Schema', on_delete=models.CASCADE,
                                related_name='tables')
@@ -319,17 +371,13 @@ class Table(DatabaseObject, Relation):
         super().save(*args, **kwargs)
 
     # TODO referenced from outside so much that it probably shouldn't be private
-    # TODO use below decorator in place of cached_property to prevent redundant reflection from
-    # redundant model instances.
-    #
-    # @key_cached_property(
-    #     key_fn=lambda table: (
-    #             'sa_table',
-    #             table.schema.database.name,
-    #             table.oid,
-    #         )
-    # )
-    @cached_property
+    @key_cached_property(
+        key_fn=lambda table: (
+            'sa_table',
+            table.schema.database.name,
+            table.oid,
+        )
+    )
     def _sa_table(self):
         # We're caching since we want different Django Table instances to return the same SA
         # Table, when they're referencing the same Postgres table.
@@ -363,6 +411,25 @@ class Table(DatabaseObject, Relation):
         pk_column = get_primary_key_column(self._sa_table)
         return pk_column.name
 
+    @property
+    def default_ordering(self):
+        """
+        Describes how records are ordered when no ordering is requested, or as a tie-breaker: by
+        the primary key, by non-nullable unique columns, or, if neither exists, by all columns.
+        """
+        strategy, sa_columns = get_default_ordering(self._sa_table)
+        # Served from the `columns` prefetch cache when listing tables. Columns that haven't been
+        # reflected into Django yet are left out.
+        column_names_to_ids = {column.name: column.id for column in self.columns.all()}
+        return {
+            'strategy': strategy,
+            'columns': [
+                column_names_to_ids[sa_column.name]
+                for sa_column in sa_columns
+                if sa_column.name in column_names_to_ids
+            ],
+        }
+
     @property
     def sa_columns(self):
         return self._enriched_column_sa_table.columns
@@ -385,6 +452,9 @@ class Table(DatabaseObject, Relation):
 
     @property
     def has_dependents(self):
+        # Set by TableHasDependentsPrefetcher
+        if '_has_dependents' in self.__dict__:
+            return self._has_dependents
         return has_dependents(
             self.oid,
             self.schema._sa_engine
@@ -418,7 +488,12 @@ class Table(DatabaseObject, Relation):
             self.oid,
             column_data,
         )
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
+        return result
+
+    def add_primary_key_column(self):
+        result = add_primary_key_column(self.schema._sa_engine, self.oid)
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def alter_column(self, column_attnum, column_data):
@@ -428,7 +503,7 @@ class Table(DatabaseObject, Relation):
             column_attnum,
             column_data,
         )
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def drop_column(self, column_attnum):
@@ -437,7 +512,7 @@ class Table(DatabaseObject, Relation):
             column_attnum,
             self.schema._sa_engine,
         )
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
 
     def duplicate_column(self, column_attnum, copy_data, copy_constraints, name=None):
         result = duplicate_column(
@@ -447,8 +522,9 @@ class Table(DatabaseObject, Relation):
             new_column_name=name,
             copy_data=copy_data,
             copy_constraints=copy_constraints,
+            batch_size=settings.MATHESAR_ONLINE_ALTER_BATCH_SIZE or None,
         )
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def get_preview(self, column_definitions):
@@ -464,7 +540,7 @@ class Table(DatabaseObject, Relation):
             engine=self.schema._sa_engine,
         )
 
-    def sa_num_records(self, filter=None, search=None):
+    def sa_num_records(self, filter=None, search=None, search_backend=None):
         if search is None:
             search = []
         return get_count(
@@ -472,16 +548,45 @@ class Table(DatabaseObject, Relation):
             engine=self.schema._sa_engine,
             filter=filter,
             search=search,
+            search_backend=search_backend,
+        )
+
+    def get_search_backend(self, column_names):
+        """
+        Returns the search backend to use for searching the given columns, depending on which
+        search indexes exist on them.
+        """
+        string_like_column_names = [
+            column_name
+            for column_name in column_names
+            if is_string_like_column(self._sa_table.columns[column_name])
+        ]
+        column_attnums = get_column_attnum_from_names_as_map(
+            self.oid,
+            string_like_column_names,
+            self._sa_engine,
+            metadata=get_cached_metadata(),
+        ).values()
+        return get_search_backend(
+            self.oid, column_attnums, self._sa_engine, metadata=get_cached_metadata()
+        )
+
+    def create_search_indexes(self, columns, backend):
+        return create_search_indexes(
+            self.oid,
+            [column.attnum for column in columns],
+            self._sa_engine,
+            backend=backend,
         )
 
     def update_sa_table(self, update_params):
         result = model_utils.update_sa_table(self, update_params)
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def delete_sa_table(self):
         result = drop_table(self.name, self.schema.name, self.schema._sa_engine, cascade=True)
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def get_record(self, id_value):
@@ -497,6 +602,7 @@ class Table(DatabaseObject, Relation):
         group_by=None,
         search=None,
         duplicate_only=None,
+        search_backend=None,
     ):
         if order_by is None:
             order_by = []
@@ -512,6 +618,7 @@ class Table(DatabaseObject, Relation):
             group_by=group_by,
             search=search,
             duplicate_only=duplicate_only,
+            search_backend=search_backend,
         )
 
     def create_record_or_records(self, record_data):
@@ -546,7 +653,7 @@ class Table(DatabaseObject, Relation):
             )
         constraint_oid = get_constraint_oid_by_name_and_table_oid(name, self.oid, engine)
         result = Constraint.current_objects.create(oid=constraint_oid, table=self)
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return result
 
     def get_column_name_id_bidirectional_map(self):
@@ -591,7 +698,8 @@ class Table(DatabaseObject, Relation):
             target_table_oid=target_table_oid,
             column_attnums_to_move=columns_attnum_to_move,
             schema=self.schema.name,
-            engine=self._sa_engine
+            engine=self._sa_engine,
+            batch_size=settings.MATHESAR_ONLINE_ALTER_BATCH_SIZE or None,
         )
         engine = self._sa_engine
 
@@ -609,7 +717,7 @@ class Table(DatabaseObject, Relation):
         self.save()
         remainder_column_names = column_names_id_map.keys() - column_names_to_move
         self.update_column_reference(remainder_column_names, column_names_id_map)
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return extracted_sa_table, remainder_sa_table
 
     def split_table(
@@ -631,7 +739,8 @@ class Table(DatabaseObject, Relation):
             extracted_table_name,
             self.schema.name,
             self._sa_engine,
-            relationship_fk_column_name
+            relationship_fk_column_name,
+            batch_size=settings.MATHESAR_ONLINE_ALTER_BATCH_SIZE or None,
         )
         engine = self._sa_engine
 
@@ -645,7 +754,7 @@ class Table(DatabaseObject, Relation):
         extracted_table.update_column_reference(extracted_column_names, column_names_id_map)
         remainder_table = Table.current_objects.get(oid=remainder_table_oid)
         remainder_table.update_column_reference(remainder_column_names, column_names_id_map)
-        reset_reflection()
+        reset_reflection(db_name=self.schema.database.name)
         return extracted_table, remainder_table, remainder_fk
 
     def update_column_reference(self, column_names, column_name_id_map):
@@ -717,7 +826,8 @@ class Column(ReflectionManagerMixin, BaseModel):
                 raise e
     current_objects = models.Manager()
     objects = DatabaseObjectManager(
-        name=ColumnNamePrefetcher
+        name=ColumnNamePrefetcher,
+        has_dependents=ColumnHasDependentsPrefetcher,
     )
 
     @property
@@ -729,19 +839,14 @@ class Column(ReflectionManagerMixin, BaseModel):
     def _sa_column(self):
         return self.table.sa_columns[self.name]
 
-    # TODO use below decorator in place of cached_property to prevent redundant reflection from
-    # redundant model instances.
-    #
-    # @key_cached_property(
-    #     key_fn=lambda column: (
-    #             "column name",
-    #             column.table.schema.database.name,
-    #             column.table.schema.name,
-    #             column.table.oid,
-    #             column.attnum,
-    #         )
-    # )
-    @cached_property
+    @key_cached_property(
+        key_fn=lambda column: (
+            "column name",
+            column.table.schema.database.name,
+            column.table.oid,
+            column.attnum,
+        )
+    )
     def name(self):
         name = get_column_name_from_attnum(
             self.table.oid,
@@ -770,6 +875,9 @@ class Column(ReflectionManagerMixin, BaseModel):
 
     @property
     def has_dependents(self):
+        # Set by ColumnHasDependentsPrefetcher
+        if '_has_dependents' in self.__dict__:
+            return self._has_dependents
         return has_dependents(
             self.table.oid,
             self._sa_engine,
@@ -847,7 +955,7 @@ class Constraint(DatabaseObject):
             self.name
         )
         self.delete()
-        reset_reflection()
+        reset_reflection(db_name=self.table.schema.database.name)
 
 
 class DataFile(BaseModel):
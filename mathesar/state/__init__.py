@@ -1,2 +1,5 @@
-from mathesar.state.base import make_sure_initial_reflection_happened, reset_reflection  # noqa: F401
+from mathesar.state.base import (  # noqa: F401
+    make_sure_initial_reflection_happened, reset_reflection, get_reflection_timestamps
+)
 from mathesar.state.metadata import get_cached_metadata  # noqa: F401
+from mathesar.state.catalog import get_cached_catalog, refresh_cached_catalog  # noqa: F401
@@ -1,34 +1,147 @@
-from mathesar.state.django import reflect_db_objects, clear_dj_cache
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django_userforeignkey.request import get_current_request
+
+from db.records.operations.group import clear_sampled_bounds_cache
+from mathesar.state.catalog import clear_catalog_cache
+from mathesar.state.django import (
+    reflect_db_objects, clear_dj_cache, get_known_database_names, sync_databases_status,
+)
 from mathesar.state.metadata import reset_cached_metadata, get_cached_metadata
 from mathesar.state.cached_property import clear_cached_property_cache
 
+logger = logging.getLogger(__name__)
+
 
 def make_sure_initial_reflection_happened():
-    if not _has_initial_reflection_happened():
-        reset_reflection()
+    """
+    Reflects the databases the current request is about (given by its `database` query
+    parameter) unless they've been reflected already, or every database if the request doesn't
+    name any. Names that don't belong to a Database are ignored, so that requests can't trigger
+    reflection at will.
+    """
+    db_names = _get_requested_database_names()
+    if db_names is None:
+        if not _has_initial_reflection_happened():
+            reset_reflection()
+    else:
+        with _reflection_lock:
+            unreflected_db_names = [
+                db_name for db_name in db_names if db_name not in _reflection_timestamps
+            ]
+        if unreflected_db_names:
+            for db_name in get_known_database_names(unreflected_db_names):
+                reset_reflection(db_name=db_name)
 
 
-def reset_reflection():
+def reset_reflection(db_name=None):
     """
     Resets our reflection of what's on Postgres databases. Reset meaning that information is
     either deleted (to be refreshed on demand) or is preemptively refreshed.
 
     We have following forms of state (aka reflection), and all are reset by this routine:
-        - Django cache (django.core.cache),
+        - reflection-dependent Django cache entries (mathesar.state.dj_cache),
         - Django models (mathesar.models namespace),
-        - SQLAlchemy MetaData.
+        - SQLAlchemy MetaData,
+        - catalog snapshots (mathesar.state.catalog),
+        - sampled grouping boundaries (db.records.operations.group).
+
+    When `db_name` is given, only the state of that database is reset, which is enough after
+    mutating it. Otherwise the state of all databases is reset. The SQLAlchemy MetaData is always
+    reset as a whole, since it's shared by all databases and its tables are only keyed by schema
+    and table name.
 
     Note, this causes immediate calls to Postgres.
     """
-    clear_dj_cache()
-    clear_cached_property_cache()
-    set_initial_reflection_happened()
+    clear_dj_cache(db_name=db_name)
+    clear_cached_property_cache(db_name=db_name)
+    clear_sampled_bounds_cache(db_name=db_name)
+    clear_catalog_cache(db_name=db_name)
     reset_cached_metadata()
-    _trigger_django_model_reflection()
+    if db_name is None:
+        set_initial_reflection_happened()
+        _trigger_django_model_reflection()
+    else:
+        _trigger_django_model_reflection(db_name=db_name)
 
 
-def _trigger_django_model_reflection():
-    reflect_db_objects(metadata=get_cached_metadata())
+def _trigger_django_model_reflection(db_name=None):
+    reflected_at = timezone.now()
+    reflected_db_names = reflect_db_objects(metadata=get_cached_metadata(), db_name=db_name)
+    with _reflection_lock:
+        if db_name is None:
+            _reflection_timestamps.clear()
+        else:
+            # Recorded even if the database couldn't be connected to, so that it's not retried on
+            # every request; the health checks forget it once it's reachable again.
+            _reflection_timestamps[db_name] = reflected_at
+        for reflected_db_name in reflected_db_names or []:
+            _reflection_timestamps[reflected_db_name] = reflected_at
+    start_health_checks()
+
+
+def get_reflection_timestamps():
+    """
+    Returns a dict mapping the names of the databases reflected by this process to when they were
+    last reflected.
+    """
+    with _reflection_lock:
+        return dict(_reflection_timestamps)
+
+
+def start_health_checks():
+    """
+    Starts a thread that checks which databases can be connected to every
+    MATHESAR_DB_HEALTH_CHECK_INTERVAL seconds, unless one is already running in this process.
+    Databases that became reachable again are reflected on next access, while unreachable ones
+    are also noticed when reflecting them.
+    """
+    if settings.TEST:
+        return
+    with _health_check_lock:
+        global _health_check_thread
+        if _health_check_thread is not None and _health_check_thread.is_alive():
+            return
+        _health_check_thread = threading.Thread(target=_run_health_checks, daemon=True)
+        _health_check_thread.start()
+
+
+def _run_health_checks():
+    while True:
+        time.sleep(settings.MATHESAR_DB_HEALTH_CHECK_INTERVAL)
+        _check_databases_health()
+
+
+def _check_databases_health():
+    try:
+        changed_db_names = sync_databases_status()
+        if changed_db_names:
+            with _reflection_lock:
+                for db_name in changed_db_names:
+                    _reflection_timestamps.pop(db_name, None)
+            # So that unscoped requests reflect the changed databases too.
+            global _initial_reflection_happened
+            _initial_reflection_happened = False
+    except Exception:
+        logger.exception("Checking database health failed")
+    finally:
+        # The thread's Django connection would otherwise stay open.
+        connection.close()
+
+
+def _get_requested_database_names():
+    request = get_current_request()
+    if request is None:
+        return None
+    database_param = request.GET.get('database')
+    if not database_param:
+        return None
+    return database_param.split(',')
 
 
 def set_initial_reflection_happened(has_it_happened=True):
@@ -38,10 +151,15 @@ def set_initial_reflection_happened(has_it_happened=True):
     at least one reflection has happened. That, together with us triggering re-reflection after
     each mutation, should keep state up-to-date.
 
+    Marking reflection as not having happened also forgets which databases were reflected.
+
     Only public for testing fixture purposes. Should not otherwise be called outside this file.
     """
     global _initial_reflection_happened
     _initial_reflection_happened = has_it_happened
+    if not has_it_happened:
+        with _reflection_lock:
+            _reflection_timestamps.clear()
 
 
 def _has_initial_reflection_happened():
@@ -50,3 +168,8 @@ def _has_initial_reflection_happened():
 
 
 _initial_reflection_happened = False
+# Maps database names to when this process last reflected them.
+_reflection_timestamps = {}
+_reflection_lock = threading.Lock()
+_health_check_lock = threading.Lock()
+_health_check_thread = None
@@ -1,9 +1,17 @@
+import sys
+import threading
 import uuid
 import logging
+from collections import OrderedDict
 
 # A globally unique object that's used to signal a cache-miss.
 NO_VALUE = object()
 
+# The central cache evicts its least recently used entries once it holds more entries, or more
+# (approximate) bytes, than this.
+CENTRAL_CACHE_MAX_ENTRIES = 10000
+CENTRAL_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,17 +29,128 @@ def key_cached_property(key_fn):
     Like cached_property, but takes a key_fn, which is expected to be a function that takes the
     instance on which this property is accessed and returns a key that this property should use
     when indexing in the central cache.
+
+    Instances for which key_fn returns the same key share the cached value, so the key should
+    identify what the value is derived from (e.g. a database name and an oid) rather than the
+    instance. Keys that are tuples with a database name as their second element, like
+    ('sa_table', database name, oid), are cleared along with that database's other state.
     """
     return lambda fn: _cached_property(fn, key_fn=key_fn)
 
 
-def clear_cached_property_cache():
+def clear_cached_property_cache(db_name=None):
     """
-    Clear caches of all cached properties.
+    Clear caches of all cached properties, or, if a database name is given, only the entries
+    whose keys name that database (see key_cached_property).
     """
     logger.debug("clear_cached_property_cache")
-    global _central_ache
-    _central_cache = {}  # noqa: F841
+    _central_cache.clear(db_name=db_name)
+
+
+def get_cached_property_cache_stats():
+    """
+    Returns the central cache's hit, miss and eviction counts since the process started, and its
+    current number of entries and approximate size in bytes.
+    """
+    return _central_cache.get_stats()
+
+
+class _BoundedCache:
+    """
+    An LRU cache bounded by number of entries and approximate size in bytes. Keys are combined
+    with generation numbers, a global one and one for the database the key names, that clearing
+    increments, so that values computed before a clear but set after it are never read.
+    """
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._generation = 0
+        self._db_generations = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_versioned_key(self, key):
+        return (self._generation, self._db_generations.get(_get_db_name(key), 0), key)
+
+    def get(self, versioned_key):
+        with self._lock:
+            entry = self._entries.get(versioned_key)
+            if entry is None:
+                self._misses += 1
+                return NO_VALUE
+            self._hits += 1
+            self._entries.move_to_end(versioned_key)
+            return entry[0]
+
+    def set(self, versioned_key, value):
+        if versioned_key[:2] != self.get_versioned_key(versioned_key[2])[:2]:
+            return
+        size = _get_approximate_size(value)
+        with self._lock:
+            self._pop(versioned_key)
+            self._entries[versioned_key] = (value, size)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete(self, versioned_key):
+        with self._lock:
+            self._pop(versioned_key)
+
+    def clear(self, db_name=None):
+        with self._lock:
+            if db_name is None:
+                self._generation += 1
+                self._entries.clear()
+                self._size = 0
+                return
+            self._db_generations[db_name] = self._db_generations.get(db_name, 0) + 1
+            for versioned_key in list(self._entries):
+                if _get_db_name(versioned_key[2]) == db_name:
+                    self._pop(versioned_key)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
+
+    def _pop(self, versioned_key):
+        entry = self._entries.pop(versioned_key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+def _get_db_name(key):
+    if isinstance(key, tuple) and len(key) > 1:
+        return key[1]
+
+
+def _get_approximate_size(value, depth=2):
+    """
+    sys.getsizeof of the value plus, for containers, of their items, down to a limited depth.
+    """
+    size = sys.getsizeof(value, 0)
+    if depth > 0:
+        if isinstance(value, dict):
+            size += sum(
+                _get_approximate_size(k, depth - 1) + _get_approximate_size(v, depth - 1)
+                for k, v in value.items()
+            )
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(_get_approximate_size(item, depth - 1) for item in value)
+    return size
 
 
 class _cached_property:
@@ -53,23 +172,25 @@ class _cached_property:
             )
 
     def __get__(self, instance, _):
-        key = self._get_ip_key(instance=instance)
-        cached_value = _get_from_central_cache(key=key)
+        # Versioned before computing the value, so that a value computed across a cache clear
+        # isn't stored.
+        key = _central_cache.get_versioned_key(self._get_ip_key(instance=instance))
+        cached_value = _central_cache.get(key)
         if cached_value is not NO_VALUE:
             return cached_value
         else:
             assert self.original_get_fn is not None
             new_value = self.original_get_fn(instance)
-            _set_on_central_cache(key=key, value=new_value)
+            _central_cache.set(key, new_value)
             return new_value
 
     def __set__(self, instance, value):
-        key = self._get_ip_key(instance)
-        _set_on_central_cache(key=key, value=value)
+        key = _central_cache.get_versioned_key(self._get_ip_key(instance))
+        _central_cache.set(key, value)
 
     def __delete__(self, instance):
-        key = self._get_ip_key(instance)
-        _delete_from_central_cache(key)
+        key = _central_cache.get_versioned_key(self._get_ip_key(instance))
+        _central_cache.delete(key)
 
     def _get_ip_key(self, instance):
         """
@@ -146,19 +267,4 @@ class _cached_property:
         return f'_property_key__{self.attribute_name}'
 
 
-def _get_from_central_cache(key):
-    global _central_cache
-    return _central_cache.get(key, NO_VALUE)
-
-
-def _set_on_central_cache(key, value):
-    global _central_cache
-    _central_cache[key] = value
-
-
-def _delete_from_central_cache(key):
-    global _central_cache
-    _central_cache[key] = NO_VALUE
-
-
-_central_cache = {}
+_central_cache = _BoundedCache(CENTRAL_CACHE_MAX_ENTRIES, CENTRAL_CACHE_MAX_BYTES)
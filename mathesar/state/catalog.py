@@ -0,0 +1,39 @@
+from sqlalchemy.engine import make_url
+
+from db.catalog import get_catalog_snapshot
+
+
+def get_cached_catalog(engine):
+    """
+    Returns a snapshot of the engine's database catalog, loading it if this process has none since
+    the last reflection reset. The snapshot is local to this process, so it can be stale if another
+    process changed the database since. Object names, which end up in caches shared by all
+    processes, are looked up in the database instead.
+    """
+    catalog = _catalog_cache.get(str(engine.url))
+    if catalog is None:
+        catalog = refresh_cached_catalog(engine)
+    return catalog
+
+
+def refresh_cached_catalog(engine):
+    catalog = get_catalog_snapshot(engine)
+    _catalog_cache[str(engine.url)] = catalog
+    return catalog
+
+
+def clear_catalog_cache(db_name=None):
+    """
+    Forgets the snapshots of the database with the given name, or of every database if no name is
+    given.
+    """
+    if db_name is None:
+        _catalog_cache.clear()
+        return
+    for url in list(_catalog_cache):
+        if make_url(url).database == db_name:
+            _catalog_cache.pop(url, None)
+
+
+# Maps engine URLs to CatalogSnapshots.
+_catalog_cache = {}
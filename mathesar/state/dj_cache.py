@@ -0,0 +1,76 @@
+"""
+Django cache entries that depend on reflection, namespaced by database and object kind. Each
+namespace level (everything, a database, a kind of object in a database) has a generation counter
+that's part of the keys under it, so bumping a counter invalidates all those entries in O(1); they
+are left to expire rather than deleted. Other cache entries, like the frontend manifest, are
+unaffected.
+"""
+import time
+
+from django.core.cache import cache
+
+KEY_PREFIX = 'mathesar_reflection'
+# How long entries are kept, unless the entry's namespace is invalidated first.
+DEFAULT_TIMEOUT = 60 * 5
+
+SCHEMA_NAME = 'schema_name'
+
+
+def get(db_name, kind, key):
+    return cache.get(get_namespaced_key(db_name, kind, key))
+
+
+def set(db_name, kind, key, value, timeout=DEFAULT_TIMEOUT):
+    cache.set(get_namespaced_key(db_name, kind, key), value, timeout)
+
+
+def delete(db_name, kind, key):
+    cache.delete(get_namespaced_key(db_name, kind, key))
+
+
+def invalidate(db_name=None, kind=None):
+    """
+    Invalidates the entries of a kind of object in a database, of a whole database, or of every
+    database if no database name is given.
+    """
+    global_key, database_key, kind_key = _get_generation_keys(db_name, kind)
+    if db_name is None:
+        generation_key = global_key
+    elif kind is None:
+        generation_key = database_key
+    else:
+        generation_key = kind_key
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        # The counter expired or was evicted; any new value will do.
+        _reset_generation(generation_key)
+
+
+def get_namespaced_key(db_name, kind, key):
+    generations = '.'.join(str(generation) for generation in _get_generations(db_name, kind))
+    return f'{KEY_PREFIX}:{db_name}:{kind}:{generations}:{key}'
+
+
+def _get_generations(db_name, kind):
+    generation_keys = _get_generation_keys(db_name, kind)
+    generations = cache.get_many(generation_keys)
+    for generation_key in generation_keys:
+        if generation_key not in generations:
+            generations[generation_key] = _reset_generation(generation_key)
+    return [generations[generation_key] for generation_key in generation_keys]
+
+
+def _get_generation_keys(db_name, kind):
+    return [
+        f'{KEY_PREFIX}:generation',
+        f'{KEY_PREFIX}:generation:{db_name}',
+        f'{KEY_PREFIX}:generation:{db_name}:{kind}',
+    ]
+
+
+def _reset_generation(generation_key):
+    # A counter that's missing must not restart from a value it had before, or entries written
+    # under that value would become visible again. Timestamps don't repeat.
+    cache.add(generation_key, time.time_ns(), timeout=None)
+    return cache.get(generation_key)
@@ -3,27 +3,29 @@ from collections import defaultdict
 from functools import reduce
 
 import operator
-from django.core.cache import cache as dj_cache
 from django.db.models import Prefetch, Q
 from sqlalchemy.exc import OperationalError
 
-from db.columns.operations.select import get_column_attnums_from_tables
 from db.constraints.operations.select import get_constraints_with_oids
-from db.schemas.operations.select import get_mathesar_schemas_with_oids
-from db.tables.operations.select import get_table_oids_from_schemas
 # We import the entire models.base module to avoid a circular import error
 from mathesar.models import base as models
 from mathesar.api.serializers.shared_serializers import DisplayOptionsMappingSerializer, \
     DISPLAY_OPTIONS_SERIALIZER_MAPPING_KEY
 from mathesar.database.base import create_mathesar_engine
+from mathesar.state import dj_cache
+from mathesar.state.catalog import refresh_cached_catalog
 
 
 logger = logging.getLogger(__name__)
 
 
-def clear_dj_cache():
+def clear_dj_cache(db_name=None):
+    """
+    Invalidates the reflection-dependent Django cache entries of the given database, or of every
+    database if no name is given.
+    """
     logger.debug('clear_dj_cache')
-    dj_cache.clear()
+    dj_cache.invalidate(db_name=db_name)
 
 
 # NOTE: All querysets used for reflection should use the .current_objects manager
@@ -31,70 +33,124 @@ def clear_dj_cache():
 # queryset is created, and will recurse if used in these functions.
 
 
-def reflect_db_objects(metadata):
-    sync_databases_status()
+def reflect_db_objects(metadata, db_name=None):
+    """
+    Reflects the objects of the database with the given name, or of every database that isn't
+    marked as deleted if no name is given. Reflection reads catalog snapshots rather than
+    `metadata`, which is only accepted for compatibility. A database that can't be connected to
+    is marked as deleted and its objects are removed; deleted databases are otherwise only
+    revived by sync_databases_status.
+
+    Returns the names of the databases that were reflected.
+    """
     databases = models.Database.current_objects.all()
+    if db_name is not None:
+        databases = databases.filter(name=db_name)
+    reflected_db_names = []
     for database in databases:
-        if database.deleted is False:
-            reflect_schemas_from_database(database)
-            schemas = models.Schema.current_objects.filter(database=database).prefetch_related(
-                Prefetch('database', queryset=databases)
-            )
-            reflect_tables_from_schemas(schemas, metadata=metadata)
-            tables = models.Table.current_objects.filter(schema__in=schemas).prefetch_related(
-                Prefetch('schema', queryset=schemas)
-            )
-            reflect_columns_from_tables(tables, metadata=metadata)
-            reflect_constraints_from_database(database)
-        else:
+        if database.deleted and db_name is None:
             models.Schema.current_objects.filter(database=database).delete()
+        elif reflect_database(database):
+            reflected_db_names.append(database.name)
+    return reflected_db_names
+
+
+def reflect_database(database):
+    """
+    Reflects the schemas, tables, columns and constraints of a single database from one catalog
+    snapshot, which is then kept for name lookups. Returns whether the database could be reflected.
+
+    Only failing to connect marks the database as deleted. Errors while reflecting a database
+    that could be connected to propagate, leaving its previously reflected objects in place.
+    """
+    if not _can_connect(database):
+        logger.debug(f'Could not connect to database {database.name}, marking it as deleted')
+        _set_database_deleted(database, True)
+        models.Schema.current_objects.filter(database=database).delete()
+        return False
+    _set_database_deleted(database, False)
+    catalog = refresh_cached_catalog(database._sa_engine)
+    reflect_schemas_from_database(database, catalog=catalog)
+    schemas = models.Schema.current_objects.filter(database=database).prefetch_related(
+        Prefetch('database', queryset=models.Database.current_objects.filter(id=database.id))
+    )
+    reflect_tables_from_schemas(schemas, catalog=catalog)
+    tables = models.Table.current_objects.filter(schema__in=schemas).prefetch_related(
+        Prefetch('schema', queryset=schemas)
+    )
+    reflect_columns_from_tables(tables, catalog=catalog)
+    reflect_constraints_from_database(database, catalog=catalog)
+    return True
+
+
+def get_known_database_names(db_names):
+    """
+    Returns those of the given names that belong to a Database, in the given order.
+    """
+    known_db_names = set(
+        models.Database.current_objects.filter(name__in=db_names).values_list('name', flat=True)
+    )
+    return [db_name for db_name in db_names if db_name in known_db_names]
 
 
 def sync_databases_status():
-    """Update status and check health for current Database Model instances."""
+    """
+    Update status and check health for current Database Model instances.
+
+    Returns the names of the databases whose status changed.
+    """
+    changed_db_names = []
     for db in models.Database.current_objects.all():
-        try:
-            db._sa_engine.connect()
+        deleted = not _can_connect(db)
+        if not deleted:
             db._sa_engine.dispose()
-            db.deleted = False
-        except (OperationalError, KeyError):
-            db.deleted = True
-        finally:
-            db.save()
+        if _set_database_deleted(db, deleted):
+            changed_db_names.append(db.name)
+    return changed_db_names
 
 
-# TODO pass in a cached engine instead of creating a new one
-def reflect_schemas_from_database(database):
-    engine = create_mathesar_engine(database.name)
-    db_schema_oids = {
-        schema['oid'] for schema in get_mathesar_schemas_with_oids(engine)
-    }
+def _can_connect(database):
+    try:
+        database._sa_engine.connect().close()
+    except (OperationalError, KeyError):
+        return False
+    return True
+
+
+def _set_database_deleted(database, deleted):
+    if database.deleted == deleted:
+        return False
+    database.deleted = deleted
+    database.save()
+    return True
+
+
+def reflect_schemas_from_database(database, catalog=None):
+    catalog = catalog or refresh_cached_catalog(database._sa_engine)
+    db_schema_oids = set(catalog.schemas)
 
     schemas = []
     for oid in db_schema_oids:
         schema = models.Schema(oid=oid, database=database)
         schemas.append(schema)
     models.Schema.current_objects.bulk_create(schemas, ignore_conflicts=True)
-    for schema in models.Schema.current_objects.all().select_related('database'):
-        if schema.database == database and schema.oid not in db_schema_oids:
+    for schema in models.Schema.current_objects.filter(database=database):
+        if schema.oid not in db_schema_oids:
             # Deleting Schemas are a rare occasion, not worth deleting in bulk
             schema.delete()
-    engine.dispose()
 
 
-def reflect_tables_from_schemas(schemas, metadata):
+def reflect_tables_from_schemas(schemas, catalog=None):
     if len(schemas) < 1:
         return
-    engine = schemas[0]._sa_engine
-    schema_oids = [schema.oid for schema in schemas]
+    catalog = catalog or refresh_cached_catalog(schemas[0]._sa_engine)
+    schemas_by_oid = {schema.oid: schema for schema in schemas}
     db_table_oids = {
-        (table['oid'], table['schema_oid'])
-        for table in get_table_oids_from_schemas(schema_oids, engine, metadata=metadata)
+        (table.oid, table.schema_oid) for table in catalog.get_tables(schemas_by_oid)
     }
     tables = []
     for oid, schema_oid in db_table_oids:
-        schema = next(schema for schema in schemas if schema.oid == schema_oid)
-        table = models.Table(oid=oid, schema=schema)
+        table = models.Table(oid=oid, schema=schemas_by_oid[schema_oid])
         tables.append(table)
     models.Table.current_objects.bulk_create(tables, ignore_conflicts=True)
     # Calling signals manually because bulk create does not emit any signals
@@ -107,12 +163,14 @@ def reflect_tables_from_schemas(schemas, metadata):
     models.Table.current_objects.filter(id__in=deleted_tables).delete()
 
 
-def reflect_columns_from_tables(tables, metadata):
+def reflect_columns_from_tables(tables, catalog=None):
     if len(tables) < 1:
         return
-    engine = tables[0]._sa_engine
+    catalog = catalog or refresh_cached_catalog(tables[0]._sa_engine)
     table_oids = [table.oid for table in tables]
-    attnum_tuples = get_column_attnums_from_tables(table_oids, engine, metadata=metadata)
+    attnum_tuples = [
+        (column.attnum, column.table_oid) for column in catalog.get_columns(table_oids)
+    ]
 
     _create_reflected_columns(attnum_tuples, tables)
 
@@ -164,18 +222,14 @@ def _delete_stale_columns(attnum_tuples, tables):
     models.Column.objects.filter(stale_columns_query).delete()
 
 
-# TODO pass in a cached engine instead of creating a new one
-def reflect_constraints_from_database(database):
-    engine = create_mathesar_engine(database.name)
-    db_constraints = get_constraints_with_oids(engine)
+def reflect_constraints_from_database(database, catalog=None):
+    catalog = catalog or refresh_cached_catalog(database._sa_engine)
     map_of_table_oid_to_constraint_oids = defaultdict(list)
-    for db_constraint in db_constraints:
-        table_oid = db_constraint['conrelid']
-        constraint_oid = db_constraint['oid']
-        map_of_table_oid_to_constraint_oids[table_oid].append(constraint_oid)
+    for constraint in catalog.constraints.values():
+        map_of_table_oid_to_constraint_oids[constraint.table_oid].append(constraint.oid)
 
     table_oids = map_of_table_oid_to_constraint_oids.keys()
-    tables = models.Table.current_objects.filter(oid__in=table_oids)
+    tables = models.Table.current_objects.filter(schema__database=database, oid__in=table_oids)
     constraint_objs_to_create = []
     for table in tables:
         constraint_oids = map_of_table_oid_to_constraint_oids.get(table.oid, [])
@@ -184,14 +238,9 @@ def reflect_constraints_from_database(database):
             constraint_objs_to_create.append(constraint_obj)
     models.Constraint.current_objects.bulk_create(constraint_objs_to_create, ignore_conflicts=True)
 
-    stale_constraint_ids = []
-    for constraint in models.Constraint.current_objects.all():
-        if constraint.oid not in [db_constraint['oid'] for db_constraint in db_constraints]:
-            stale_constraint_ids.append(constraint.id)
     models.Constraint.current_objects.filter(
-        table__schema__database=database, id__in=stale_constraint_ids
-    ).delete()
-    engine.dispose()
+        table__schema__database=database
+    ).exclude(oid__in=list(catalog.constraints)).delete()
 
 
 # TODO pass in a cached engine instead of creating a new one
@@ -95,6 +95,16 @@ def test_column_list(column_test_table, client):
     check_columns_response(response_data['results'], expect_results)
 
 
+def test_column_list_prefetches_has_dependents(column_test_table, client, monkeypatch):
+    def _has_dependents(*args, **kwargs):
+        raise AssertionError('has_dependents should be prefetched for column lists')
+    monkeypatch.setattr('mathesar.models.base.has_dependents', _has_dependents)
+    response = client.get(f"/api/db/v0/tables/{column_test_table.id}/columns/")
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [column['has_dependents'] for column in results[:2]] == [True, False]
+
+
 list_client_with_different_roles = [
     ('superuser_client_factory', 8, 8),
     ('db_manager_client_factory', 8, 8),
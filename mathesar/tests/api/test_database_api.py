@@ -73,6 +73,7 @@ def check_database(database, response_database):
     assert 'supported_types_url' in response_database
     assert '/api/ui/v0/databases/' in response_database['supported_types_url']
     assert response_database['supported_types_url'].endswith('/types/')
+    assert 'reflected_at' in response_database
 
 
 def test_database_list(client, db_dj_model):
@@ -82,6 +83,7 @@ def test_database_list(client, db_dj_model):
     assert response_data['count'] == 1
     assert len(response_data['results']) == 1
     check_database(db_dj_model, response_data['results'][0])
+    assert response_data['results'][0]['reflected_at'] is not None
 
 
 def test_database_list_permissions(FUN_create_dj_db, get_uid, client, client_bob, client_alice, user_bob, user_alice):
@@ -1,3 +1,6 @@
+from mathesar.models.base import Constraint, Database, Schema, Table
+
+
 def _get_object_dependent_ids(dependents, object_id, type):
     return [
         int(d['obj']['id'])
@@ -92,3 +95,20 @@ def test_dependents_filters(library_ma_tables, client):
             type not in dependents_types for type in exclude_types
         ]
     )
+
+
+def test_dependents_ignore_objects_of_other_databases(library_ma_tables, client):
+    items = library_ma_tables["Items"]
+    items_dependents = client.get(f'/api/db/v0/tables/{items.id}/dependents/').json()
+    # Objects of another database with the same oids, which repeat across databases.
+    other_database = Database.current_objects.create(name='mathesar_other_dependents_db')
+    other_schema = Schema.current_objects.create(oid=items.schema.oid, database=other_database)
+    for table in library_ma_tables.values():
+        other_table = Table.current_objects.create(oid=table.oid, schema=other_schema)
+        for constraint in Constraint.current_objects.filter(table=table):
+            Constraint.current_objects.create(oid=constraint.oid, table=other_table)
+
+    response = client.get(f'/api/db/v0/tables/{items.id}/dependents/')
+
+    assert response.status_code == 200
+    assert response.json() == items_dependents
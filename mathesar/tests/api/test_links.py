@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import Column, Integer, MetaData, String
+from sqlalchemy import Column, Integer, MetaData, String, text
 from sqlalchemy import Table as SATable
 
 from db.constraints.utils import ConstraintType
@@ -269,6 +269,29 @@ def test_many_to_many_link_create(column_test_table, client, create_patents_tabl
     assert response.status_code == 201
 
 
+def test_many_to_many_link_create_constraint_names(column_test_table, client, create_patents_table):
+    table_2 = create_patents_table('Table 2')
+    schema = column_test_table.schema
+    engine = schema._sa_engine
+    data = {
+        "link_type": "many-to-many",
+        "mapping_table_name": "map_table",
+        "referents": [
+            {'referent_table': column_test_table.id, 'column_name': "link_1"},
+            {'referent_table': table_2.id, 'column_name': "link_2"}
+        ],
+    }
+    response = client.post("/api/db/v0/links/", data=data)
+    assert response.status_code == 201
+    map_table_oid = get_oid_from_table("map_table", schema.name, engine)
+    with engine.begin() as conn:
+        constraint_names = conn.execute(
+            text('SELECT conname FROM pg_catalog.pg_constraint WHERE conrelid = :oid ORDER BY conname'),
+            {'oid': map_table_oid},
+        ).scalars().all()
+    assert constraint_names == ['map_table_id_pkey', 'map_table_link_1_fkey', 'map_table_link_2_fkey']
+
+
 def test_many_to_many_link_invalid_table_name(
     column_test_table,
     client,
@@ -1,4 +1,6 @@
 import json
+import threading
+
 import pytest
 from copy import deepcopy
 from unittest.mock import patch
@@ -7,8 +9,10 @@ from db.constraints.base import ForeignKeyConstraint, UniqueConstraint
 from db.functions.exceptions import UnknownDBFunctionID
 from db.records.exceptions import BadGroupFormat, GroupFieldNotFound
 from db.records.operations.group import GroupBy
+from db.records.operations.select import execute_count_relation
 from db.records.operations.sort import BadSortFormat, SortFieldNotFound
 
+from mathesar.api import pagination
 from mathesar.api.exceptions.error_codes import ErrorCodes
 from mathesar.api.utils import follows_json_number_spec
 from mathesar.functions.operations.convert import rewrite_db_function_spec_column_ids_to_names
@@ -716,6 +720,7 @@ def test_record_list_groups(
     assert grouping_dict['preproc'] == group_by.preproc
     assert grouping_dict['prefix_length'] == group_by.prefix_length
     assert grouping_dict['extract_field'] == group_by.extract_field
+    assert grouping_dict['sample_size'] == group_by.sample_size
     assert grouping_dict['ranged'] == group_by.ranged
     _test_group_equality(grouping_dict['groups'], expected_groups)
 
@@ -1337,3 +1342,20 @@ def test_record_patch_unique_violation(create_patents_table, client):
         f'/api/db/v0/tables/{table.id}/constraints/{constraint_id}/'
     ).json()
     assert actual_constraint_details['name'] == 'NASA unique record PATCH_pkey'
+
+
+def test_record_list_count_runs_concurrently(create_patents_table, client):
+    table = create_patents_table('NASA Record List Concurrent Count')
+    count_threads = []
+
+    def _execute_count_relation(*args, **kwargs):
+        count_threads.append(threading.current_thread())
+        return execute_count_relation(*args, **kwargs)
+
+    with patch.object(pagination, 'execute_count_relation', side_effect=_execute_count_relation):
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/')
+
+    assert response.status_code == 200
+    assert response.json()['count'] == 1393
+    assert len(count_threads) == 1
+    assert count_threads[0] is not threading.current_thread()
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from django.core.cache import cache
@@ -71,6 +73,7 @@ def check_table_response(response_table, table, table_name):
     assert 'created_at' in response_table
     assert 'updated_at' in response_table
     assert 'has_dependents' in response_table
+    assert 'default_ordering' in response_table
     assert 'import_verified' in response_table
     assert len(response_table['columns']) == len(table.sa_column_names)
     for column in response_table['columns']:
@@ -439,6 +442,88 @@ def test_table_type_suggestion(client, type_inference_table, _type_inference_tab
     assert response_table == expected_types
 
 
+def _get_column_types(table):
+    table = Table.objects.get(id=table.id)
+    return {column.name: column.db_type.id for column in table.sa_columns if column.name != 'id'}
+
+
+def test_table_apply_type_suggestions(client, type_inference_table, _type_inference_table_type_suggestions):
+    table = type_inference_table
+    response = client.post(f'/api/db/v0/tables/{table.id}/apply_type_suggestions/')
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data['rows_rewritten'] == 4
+    assert response_data['duration'] > 0
+    assert set(response_data['columns']) <= set(_type_inference_table_type_suggestions)
+    assert _get_column_types(table) == _type_inference_table_type_suggestions
+
+
+def test_table_apply_edited_type_suggestions(client, type_inference_table):
+    table = type_inference_table
+    original_types = _get_column_types(table)
+    post_body = {'columns': {'col_1': PostgresType.INTEGER.id, 'col_2': PostgresType.BOOLEAN.id}}
+    response = client.post(f'/api/db/v0/tables/{table.id}/apply_type_suggestions/', data=post_body)
+    assert response.status_code == 200
+    assert sorted(response.json()['columns']) == ['col_1', 'col_2']
+    assert _get_column_types(table) == {**original_types, **post_body['columns']}
+
+
+def test_table_apply_type_suggestions_invalid_cast(client, type_inference_table):
+    table = type_inference_table
+    original_types = _get_column_types(table)
+    post_body = {'columns': {'col_1': PostgresType.INTEGER.id, 'col_5': PostgresType.INTEGER.id}}
+    response = client.post(f'/api/db/v0/tables/{table.id}/apply_type_suggestions/', data=post_body)
+    assert response.status_code == 400
+    assert _get_column_types(table) == original_types
+
+
+def test_table_apply_type_suggestions_unknown_column(client, type_inference_table):
+    table = type_inference_table
+    post_body = {'columns': {'not_a_column': PostgresType.INTEGER.id}}
+    response = client.post(f'/api/db/v0/tables/{table.id}/apply_type_suggestions/', data=post_body)
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'columns'
+
+
+def test_table_create_from_datafile_applying_type_suggestions(
+        client, schema, _type_inference_table_type_suggestions
+):
+    with open('mathesar/tests/data/type_inference.csv', 'rb') as csv_file:
+        data_file = DataFile.objects.create(file=File(csv_file), created_from='file')
+    body = {
+        'schema': schema.id,
+        'data_files': [data_file.id],
+        'apply_type_suggestions': True,
+    }
+    response = client.post('/api/db/v0/tables/', body)
+    assert response.status_code == 201
+    table = Table.objects.get(id=response.json()['id'])
+    assert _get_column_types(table) == _type_inference_table_type_suggestions
+
+
+def test_table_create_from_datafile_applying_invalid_type_suggestions(client, schema, monkeypatch):
+    monkeypatch.setattr(
+        'mathesar.api.serializers.tables.get_table_column_types',
+        lambda table: {'col_5': PostgresType.INTEGER.id},
+    )
+    with open('mathesar/tests/data/type_inference.csv', 'rb') as csv_file:
+        data_file = DataFile.objects.create(file=File(csv_file), created_from='file')
+    table_name = 'type_inference_invalid_cast'
+    body = {
+        'schema': schema.id,
+        'data_files': [data_file.id],
+        'name': table_name,
+        'apply_type_suggestions': True,
+    }
+    response = client.post('/api/db/v0/tables/', body)
+    assert response.status_code == 400
+    assert response.json()[0]['code'] == ErrorCodes.InvalidTypeCast.value
+    # The table isn't left behind.
+    assert table_name not in [table.name for table in Table.current_objects.filter(schema=schema)]
+    with schema._sa_engine.connect() as conn:
+        assert not schema._sa_engine.dialect.has_table(conn, table_name, schema=schema.name)
+
+
 def _check_columns(actual_column_list, expected_column_list):
     # Columns will return an extra type_options key in actual_dict
     # so we need to check equality only for the keys in expect_dict
@@ -1306,6 +1391,36 @@ def test_table_patch_columns_diff_name_type_drop(create_data_types_table, client
     _check_columns(response_json['columns'], column_data)
 
 
+def test_table_patch_columns_type_nullable_and_default_change(create_data_types_table, client):
+    table_name = 'PATCH columns nullable default'
+    table = create_data_types_table(table_name)
+    column_data = _get_data_types_column_data(table)
+    column_data[1]['type'] = PostgresType.INTEGER.id
+    column_data[1]['nullable'] = False
+    column_data[1]['default'] = {'value': 42}
+    column_data[3]['nullable'] = False
+    column_data[3]['default'] = {'value': "Chef's choice"}
+
+    body = {
+        'columns': column_data
+    }
+    response = client.patch(f'/api/db/v0/tables/{table.id}/', body)
+
+    assert response.status_code == 200
+    _check_columns(
+        response.json()['columns'],
+        [{'name': data['name'], 'id': data['id']} for data in column_data],
+    )
+    for data, expected_type, expected_default in [
+        (column_data[1], PostgresType.INTEGER.id, 42),
+        (column_data[3], PostgresType.TEXT.id, "Chef's choice"),
+    ]:
+        column = client.get(f'/api/db/v0/tables/{table.id}/columns/{data["id"]}/').json()
+        assert column['type'] == expected_type
+        assert column['nullable'] is False
+        assert column['default']['value'] == expected_default
+
+
 def test_table_patch_columns_display_options(create_data_types_table, client):
     table_name = 'patch_cols_one'
     table = create_data_types_table(table_name)
@@ -1703,3 +1818,74 @@ def test_table_ui_dependency(client, create_patents_table, get_uid):
         ]
     }
     assert response_data == expected_response
+
+
+def test_table_search_indexes(create_patents_table, client):
+    table = create_patents_table('Patents')
+    column_id = table.get_column_name_id_bidirectional_map()['Title']
+    data = {'columns': [column_id], 'backend': 'full_text'}
+    response = client.post(f'/api/db/v0/tables/{table.id}/search_indexes/', data=data)
+    assert response.status_code == 201
+    response_data = response.json()
+    assert response_data['backend'] == 'full_text'
+    assert len(response_data['indexes']) == 1
+    assert table.get_search_backend(['Title']) == 'full_text'
+
+
+def test_table_index_advisor(create_patents_table, client):
+    table = create_patents_table('Patents')
+    column_id = table.get_column_name_id_bidirectional_map()['Title']
+    json_order_by = json.dumps([{'field': column_id, 'direction': 'asc'}])
+    for _ in range(3):
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/?order_by={json_order_by}')
+        assert response.status_code == 200
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/index_advisor/')
+    assert response.status_code == 200
+    recommendations = response.json()['recommendations']
+    assert len(recommendations) == 1
+    recommendation = recommendations[0]
+    assert recommendation['method'] == 'btree'
+    assert recommendation['columns'] == [column_id]
+    assert recommendation['usage'] == ['sort']
+    assert recommendation['count'] == 3
+
+    data = {'recommendation': recommendation['key']}
+    response = client.post(f'/api/db/v0/tables/{table.id}/index_advisor/', data=data)
+    assert response.status_code == 201
+    response_data = response.json()
+    assert response_data['before_duration_ms'] > 0 and response_data['after_duration_ms'] > 0
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/index_advisor/')
+    assert response.json()['recommendations'] == []
+
+
+def test_table_index_advisor_unknown_recommendation(create_patents_table, client):
+    table = create_patents_table('Patents')
+    data = {'recommendation': 'btree:Title'}
+    response = client.post(f'/api/db/v0/tables/{table.id}/index_advisor/', data=data)
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'recommendation'
+
+
+def test_table_add_primary_key(create_patents_table, client):
+    table = create_patents_table('Patents')
+    with table._sa_engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{table.schema.name}"."{table.name}" DROP COLUMN id'))
+    reset_reflection()
+    response = client.get(f'/api/db/v0/tables/{table.id}/')
+    assert response.json()['default_ordering']['strategy'] == 'all_columns'
+
+    response = client.post(f'/api/db/v0/tables/{table.id}/add_primary_key/')
+    assert response.status_code == 201
+    response_table = response.json()
+    default_ordering = response_table['default_ordering']
+    assert default_ordering['strategy'] == 'primary_key'
+    id_column = [column for column in response_table['columns'] if column['name'] == 'id'][0]
+    assert default_ordering['columns'] == [id_column['id']]
+
+
+def test_table_add_primary_key_existing(create_patents_table, client):
+    table = create_patents_table('Patents')
+    response = client.post(f'/api/db/v0/tables/{table.id}/add_primary_key/')
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+from mathesar.state import cached_property as cached_property_module
+from mathesar.state.cached_property import (
+    NO_VALUE, _BoundedCache, clear_cached_property_cache, key_cached_property,
+)
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = _BoundedCache(max_entries=2, max_bytes=10 ** 6)
+    keys = [cache.get_versioned_key(key) for key in ('a', 'b', 'c')]
+    cache.set(keys[0], 1)
+    cache.set(keys[1], 2)
+    assert cache.get(keys[0]) == 1
+    cache.set(keys[2], 3)
+    assert cache.get(keys[1]) is NO_VALUE
+    assert cache.get(keys[0]) == 1
+    assert cache.get(keys[2]) == 3
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (3, 1, 1, 2)
+
+
+def test_bounded_cache_evicts_by_size():
+    cache = _BoundedCache(max_entries=100, max_bytes=1000)
+    cache.set(cache.get_versioned_key('small'), 'x')
+    cache.set(cache.get_versioned_key('large'), 'x' * 2000)
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_bounded_cache_ignores_values_computed_before_clear():
+    cache = _BoundedCache(max_entries=100, max_bytes=10 ** 6)
+    key = cache.get_versioned_key('a')
+    cache.clear()
+    cache.set(key, 1)
+    assert cache.get(key) is NO_VALUE
+    assert cache.get(cache.get_versioned_key('a')) is NO_VALUE
+
+
+def test_key_cached_property_shared_between_instances_and_cleared():
+    calls = []
+
+    class Model:
+        def __init__(self, oid):
+            self.oid = oid
+
+        @key_cached_property(key_fn=lambda model: ('test_model_value', model.oid))
+        def value(self):
+            calls.append(self.oid)
+            return self.oid * 2
+
+    assert Model(1).value == 2
+    assert Model(1).value == 2
+    assert calls == [1]
+    clear_cached_property_cache()
+    assert Model(1).value == 2
+    assert calls == [1, 1]
+    assert cached_property_module.get_cached_property_cache_stats()['entries'] >= 1
+
+
+def test_bounded_cache_clears_only_given_database():
+    cache = _BoundedCache(max_entries=100, max_bytes=10 ** 6)
+    cleared_key = cache.get_versioned_key(('sa_table', 'db_1', 1))
+    kept_key = cache.get_versioned_key(('sa_table', 'db_2', 1))
+    cache.set(cleared_key, 1)
+    cache.set(kept_key, 2)
+    stale_key = cache.get_versioned_key(('sa_table', 'db_1', 2))
+    cache.clear(db_name='db_1')
+    cache.set(stale_key, 3)
+    assert cache.get(cleared_key) is NO_VALUE
+    assert cache.get(stale_key) is NO_VALUE
+    assert cache.get(kept_key) == 2
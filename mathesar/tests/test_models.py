@@ -3,6 +3,7 @@ from unittest.mock import patch
 from django.core.cache import cache
 
 from mathesar.models.base import Database, Schema, Table, schema_utils
+from mathesar.state import dj_cache
 from mathesar.utils.models import attempt_dumb_query
 
 
@@ -16,7 +17,7 @@ def test_schema_name_sets_cache(monkeypatch, test_db_model):
     cache.clear()
     schema = Schema(oid=123, database=test_db_model)
     name = schema.name
-    assert cache.get(f"{schema.database.name}_schema_name_{schema.oid}") == name
+    assert dj_cache.get(schema.database.name, dj_cache.SCHEMA_NAME, schema.oid) == name
 
 
 def test_schema_name_uses_cache(monkeypatch, test_db_model):
@@ -50,6 +51,27 @@ def test_schema_name_handles_missing(monkeypatch, test_db_model):
     assert name_ == 'MISSING'
 
 
+def test_dj_cache_invalidation_is_scoped():
+    cache.set('unrelated', 'value')
+    dj_cache.set('db_1', dj_cache.SCHEMA_NAME, 1, 'schema_1')
+    dj_cache.set('db_2', dj_cache.SCHEMA_NAME, 1, 'schema_2')
+
+    dj_cache.invalidate(db_name='db_1')
+    assert dj_cache.get('db_1', dj_cache.SCHEMA_NAME, 1) is None
+    assert dj_cache.get('db_2', dj_cache.SCHEMA_NAME, 1) == 'schema_2'
+
+    dj_cache.invalidate()
+    assert dj_cache.get('db_2', dj_cache.SCHEMA_NAME, 1) is None
+    assert cache.get('unrelated') == 'value'
+
+
+def test_dj_cache_entries_stay_invalid_after_generation_eviction():
+    dj_cache.set('db_1', dj_cache.SCHEMA_NAME, 1, 'schema_1')
+    dj_cache.invalidate(db_name='db_1')
+    cache.delete(dj_cache._get_generation_keys('db_1', dj_cache.SCHEMA_NAME)[1])
+    assert dj_cache.get('db_1', dj_cache.SCHEMA_NAME, 1) is None
+
+
 @pytest.mark.parametrize("model", [Database, Schema, Table])
 def test_model_queryset_reflects_db_objects(model):
     with patch('mathesar.state.base.reflect_db_objects') as mock_reflect:
@@ -1,8 +1,10 @@
 import pytest
+from unittest.mock import patch
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
 from mathesar.models.base import Table, Schema, Database
+from mathesar.state import get_reflection_timestamps
 from mathesar.state.django import reflect_db_objects
 
 from db.metadata import get_empty_metadata
@@ -85,3 +87,31 @@ def test_single_db_oid_unique_exception():
     with pytest.raises(ValidationError):
         Table.objects.create(oid=table_oid, schema=schema_1)
         Table.objects.create(oid=table_oid, schema=schema_2)
+
+
+def test_request_reflects_only_requested_database(client, multi_db_test_db):
+    with patch('mathesar.state.base.reflect_db_objects', wraps=reflect_db_objects) as mock_reflect:
+        response = client.get(f'/api/db/v0/schemas/?database={multi_db_test_db}')
+    assert response.status_code == 200
+    reflected_db_names = {call.kwargs['db_name'] for call in mock_reflect.call_args_list}
+    assert reflected_db_names == {multi_db_test_db}
+    assert multi_db_test_db in get_reflection_timestamps()
+
+
+def test_request_for_unknown_database_does_not_reflect(client):
+    with patch('mathesar.state.base.reset_reflection') as mock_reset:
+        client.get('/api/db/v0/schemas/?database=mathesar_unknown_db')
+    mock_reset.assert_not_called()
+
+
+def test_reflection_error_does_not_delete_database_objects(multi_db_test_db):
+    database = Database.current_objects.get(name=multi_db_test_db)
+    reflect_db_objects(metadata=get_empty_metadata(), db_name=multi_db_test_db)
+    schema_count = Schema.current_objects.filter(database=database).count()
+    assert schema_count > 0
+    with patch('mathesar.state.django.reflect_tables_from_schemas', side_effect=KeyError):
+        with pytest.raises(KeyError):
+            reflect_db_objects(metadata=get_empty_metadata(), db_name=multi_db_test_db)
+    database.refresh_from_db()
+    assert database.deleted is False
+    assert Schema.current_objects.filter(database=database).count() == schema_count
@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import OrderedDict
+
+from db.columns.operations.select import get_column_attnum_from_names_as_map
+from db.indexes.base import IndexMethod, get_index_candidates
+from db.indexes.operations.create import (
+    create_btree_index, create_expression_index, create_search_indexes, get_expression_index_name,
+)
+from db.indexes.operations.select import (
+    get_btree_index_column_attnums, get_index_names, get_trigram_indexed_column_attnums,
+)
+from db.records.operations.relevance import SearchBackend
+from mathesar.state import get_cached_metadata
+
+# Workload is tracked for at most this many tables; the least recently queried table is
+# forgotten first.
+WORKLOAD_MAX_TABLES = 1000
+# Indexes that would've helped fewer queries than this aren't recommended.
+MIN_RECOMMENDATION_USAGE_COUNT = 3
+# When creating a recommended index, a sample query is timed this many times before and after,
+# keeping the fastest run so that a cold cache doesn't skew the comparison.
+BENCHMARK_RUNS = 3
+BENCHMARK_LIMIT = 50
+
+
+class CandidateUsage:
+    """
+    Aggregates the records queries on a table that an IndexCandidate would've helped with: how
+    they used the index columns (filter, sort, group or search), how many there were and how long
+    they took. The parameters of the last such query are kept to benchmark the index with.
+    """
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.kinds = set()
+        self.count = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.sample = None
+
+    def record(self, kinds, duration, sample):
+        self.kinds.update(kinds)
+        self.count += 1
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.sample = sample
+
+    @property
+    def avg_duration(self):
+        return self.total_duration / self.count if self.count else 0.0
+
+
+def record_table_workload(table, duration, filter=None, order_by=None, group_by=None, search=None):
+    """
+    Records that a records query on the given table took `duration` seconds. The query
+    parameters are in the format accepted by Table.get_records, with column names.
+    """
+    candidates_by_kind = get_index_candidates(
+        table._sa_table,
+        filter=filter,
+        order_by=order_by,
+        group_by_columns=group_by.columns if group_by else None,
+        search=search,
+    )
+    # A query using the same columns in multiple ways is only counted once per candidate.
+    candidate_kinds = {}
+    for kind, candidates in candidates_by_kind.items():
+        for candidate in candidates:
+            candidate_kinds.setdefault(candidate, set()).add(kind)
+    if not candidate_kinds:
+        return
+    sample = {'filter': filter, 'order_by': order_by, 'group_by': group_by, 'search': search}
+    with _workload_lock:
+        table_workload = _workload.pop(table.id, {})
+        _workload[table.id] = table_workload
+        if len(_workload) > WORKLOAD_MAX_TABLES:
+            _workload.popitem(last=False)
+        for candidate, kinds in candidate_kinds.items():
+            usage = table_workload.get(candidate.key)
+            if usage is None:
+                usage = table_workload[candidate.key] = CandidateUsage(candidate)
+            usage.record(kinds, duration, sample)
+
+
+def get_table_workload(table_id):
+    """
+    Returns the CandidateUsages recorded for the given table, costliest first.
+    """
+    with _workload_lock:
+        usages = list(_workload.get(table_id, {}).values())
+    return sorted(usages, key=lambda usage: usage.total_duration, reverse=True)
+
+
+def clear_workload(table_id=None):
+    with _workload_lock:
+        if table_id is None:
+            _workload.clear()
+        else:
+            _workload.pop(table_id, None)
+
+
+def get_index_recommendations(table, min_count=MIN_RECOMMENDATION_USAGE_COUNT):
+    """
+    Returns descriptions of the indexes that would've helped the most with the recorded records
+    queries on the given table, leaving out indexes that already exist. Columns are referenced by
+    their Django ids.
+    """
+    usages = [usage for usage in get_table_workload(table.id) if usage.count >= min_count]
+    if not usages:
+        return []
+    existing_indexes = _get_existing_indexes(table)
+    column_names_to_ids = table.get_column_name_id_bidirectional_map()
+    recommendations = []
+    for usage in usages:
+        candidate = usage.candidate
+        if any(column_name not in column_names_to_ids for column_name in candidate.columns):
+            # The column was renamed or dropped since the query was recorded.
+            continue
+        if _is_candidate_covered(table, candidate, existing_indexes):
+            continue
+        recommendations.append(
+            {
+                'key': candidate.key,
+                'method': candidate.method,
+                'columns': [column_names_to_ids[column_name] for column_name in candidate.columns],
+                'expression': candidate.expression,
+                'usage': sorted(usage.kinds),
+                'count': usage.count,
+                'avg_duration_ms': usage.avg_duration * 1000,
+                'max_duration_ms': usage.max_duration * 1000,
+            }
+        )
+    return recommendations
+
+
+def create_recommended_index(table, key):
+    """
+    Concurrently creates the index recommended under the given key, timing the last recorded
+    query it would've helped with before and after creating it.
+    """
+    usage = _get_candidate_usage(table.id, key)
+    candidate = usage.candidate
+    before_duration = _time_sample_query(table, usage.sample)
+    engine = table._sa_engine
+    if candidate.method == IndexMethod.EXPRESSION.value:
+        index_name = create_expression_index(
+            table.oid, candidate.expression, engine, concurrently=True
+        )
+    else:
+        column_attnums = _get_column_attnums(table, candidate.columns)
+        if candidate.method == IndexMethod.TRIGRAM.value:
+            index_name = create_search_indexes(
+                table.oid, column_attnums, engine, backend=SearchBackend.TRIGRAM.value, concurrently=True
+            )[0]
+        else:
+            index_name = create_btree_index(table.oid, column_attnums, engine, concurrently=True)
+    after_duration = _time_sample_query(table, usage.sample)
+    return {
+        'index': index_name,
+        'before_duration_ms': before_duration * 1000,
+        'after_duration_ms': after_duration * 1000,
+    }
+
+
+def is_recommendation_available(table, key):
+    return any(
+        recommendation['key'] == key for recommendation in get_index_recommendations(table)
+    )
+
+
+def _get_candidate_usage(table_id, key):
+    with _workload_lock:
+        return _workload[table_id][key]
+
+
+def _get_existing_indexes(table):
+    engine = table._sa_engine
+    with engine.begin() as conn:
+        return {
+            IndexMethod.BTREE.value: get_btree_index_column_attnums(table.oid, engine, connection_to_use=conn),
+            IndexMethod.TRIGRAM.value: get_trigram_indexed_column_attnums(table.oid, engine, connection_to_use=conn),
+            IndexMethod.EXPRESSION.value: get_index_names(table.oid, engine, connection_to_use=conn),
+        }
+
+
+def _is_candidate_covered(table, candidate, existing_indexes):
+    if candidate.method == IndexMethod.EXPRESSION.value:
+        index_name = get_expression_index_name(table.name, candidate.expression)
+        return index_name in existing_indexes[IndexMethod.EXPRESSION.value]
+    column_attnums = _get_column_attnums(table, candidate.columns)
+    if candidate.method == IndexMethod.TRIGRAM.value:
+        return set(column_attnums).issubset(existing_indexes[IndexMethod.TRIGRAM.value])
+    # A B-tree index can be used for any leading subset of its columns.
+    return any(
+        index_attnums[:len(column_attnums)] == tuple(column_attnums)
+        for index_attnums in existing_indexes[IndexMethod.BTREE.value]
+    )
+
+
+def _get_column_attnums(table, column_names):
+    attnum_map = get_column_attnum_from_names_as_map(
+        table.oid, column_names, table._sa_engine, metadata=get_cached_metadata()
+    )
+    return [attnum_map[column_name] for column_name in column_names]
+
+
+def _time_sample_query(table, sample):
+    search = sample['search'] or []
+    durations = []
+    for _ in range(BENCHMARK_RUNS):
+        start = time.perf_counter()
+        search_backend = None
+        if search:
+            search_backend = table.get_search_backend([search_spec['column'] for search_spec in search])
+        table.sa_num_records(filter=sample['filter'], search=search, search_backend=search_backend)
+        table.get_records(
+            limit=BENCHMARK_LIMIT,
+            filter=sample['filter'],
+            order_by=sample['order_by'],
+            group_by=sample['group_by'],
+            search=search,
+            search_backend=search_backend,
+        )
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+_workload_lock = threading.Lock()
+# Maps table ids to dicts mapping IndexCandidate keys to CandidateUsages, least recently queried
+# table first.
+_workload = OrderedDict()
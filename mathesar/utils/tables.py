@@ -1,13 +1,20 @@
-from sqlalchemy import MetaData
+import logging
+import time
 
+from sqlalchemy import func, select
+
+from db.columns.operations.alter import alter_columns_in_bulk
+from db.columns.operations.select import get_column_attnum_from_names_as_map
 from db.tables.operations.create import create_mathesar_table
-from db.tables.operations.select import get_oid_from_table
+from db.tables.operations.select import get_next_table_name_suffix, get_oid_from_table
 from db.tables.operations.infer_types import infer_table_column_types
 from mathesar.database.base import create_mathesar_engine
 from mathesar.imports.csv import create_table_from_csv
 from mathesar.models.base import Table
 from mathesar.state.django import reflect_columns_from_tables
-from mathesar.state import get_cached_metadata
+from mathesar.state import get_cached_metadata, reset_reflection
+
+logger = logging.getLogger(__name__)
 
 TABLE_NAME_TEMPLATE = 'Table'
 
@@ -27,6 +34,44 @@ def get_table_column_types(table):
     return col_types
 
 
+def apply_table_column_types(table, col_types):
+    """
+    Converts the columns named in col_types, a map of column names to db type ids like the one
+    get_table_column_types returns, with a single ALTER TABLE statement, so that the table is
+    rewritten once. Reports which columns were converted, how long the conversion took, in
+    seconds, and how many rows were rewritten.
+    """
+    engine = table.schema._sa_engine
+    attnums = get_column_attnum_from_names_as_map(
+        table.oid, list(col_types), engine, metadata=get_cached_metadata()
+    )
+    column_data_list = [
+        {'attnum': attnums[column_name], 'type': db_type_id}
+        for column_name, db_type_id in col_types.items()
+    ]
+    sa_table = table._sa_table
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        retyped_column_names = alter_columns_in_bulk(
+            engine, table.oid, column_data_list, connection_to_use=conn
+        )
+        duration = time.perf_counter() - start
+        rows_rewritten = 0
+        if retyped_column_names:
+            # The table stays locked until the transaction ends, so these are the rows rewritten.
+            rows_rewritten = conn.execute(select(func.count()).select_from(sa_table)).scalar()
+    reset_reflection(db_name=table.schema.database.name)
+    logger.info(
+        f'Converted {len(retyped_column_names)} columns of table {table.id},'
+        f' rewriting {rows_rewritten} rows, in {duration:.3f} secs'
+    )
+    return {
+        'columns': retyped_column_names,
+        'duration': duration,
+        'rows_rewritten': rows_rewritten,
+    }
+
+
 def gen_table_name(schema, data_files=None):
     if data_files:
         data_file = data_files[0]
@@ -40,21 +85,25 @@ def gen_table_name(schema, data_files=None):
 
     if not base_name:
         base_name = TABLE_NAME_TEMPLATE
-        table_num = Table.objects.count()
-        name = f'{TABLE_NAME_TEMPLATE} {table_num}'
+        base_name_allowed = False
+        first_suffix = 0
     else:
-        table_num = 0
-        name = base_name
+        base_name_allowed = True
+        first_suffix = 1
 
-    metadata = MetaData(bind=schema._sa_engine, schema=schema.name)
-    metadata.reflect()
-    while '.'.join((schema.name, name)) in metadata.tables:
-        table_num += 1
-        name = f'{base_name} {table_num}'
-        if len(name) > POSTGRES_NAME_LEN_CAP:
-            base_name = base_name[:-1]
-            name = base_name + f' {table_num}'
-    return name
+    while True:
+        base_name_taken, suffix = get_next_table_name_suffix(
+            base_name, schema.name, schema._sa_engine, first_suffix=first_suffix
+        )
+        if base_name_allowed and not base_name_taken:
+            return base_name
+        name = f'{base_name} {suffix}'
+        if len(name) <= POSTGRES_NAME_LEN_CAP:
+            return name
+        # Shorten the base name to make room for the suffix, and look again, since the shorter
+        # base name has its own suffixes.
+        base_name = base_name[:POSTGRES_NAME_LEN_CAP - len(f' {suffix}')]
+        base_name_allowed = False
 
 
 def create_table_from_datafile(data_files, name, schema, comment=None):
@@ -77,5 +126,5 @@ def create_empty_table(name, schema, comment=None):
     # Using current_objects to create the table instead of objects. objects
     # triggers re-reflection, which will cause a race condition to create the table
     table, _ = Table.current_objects.get_or_create(oid=db_table_oid, schema=schema)
-    reflect_columns_from_tables([table], metadata=get_cached_metadata())
+    reflect_columns_from_tables([table])
     return table